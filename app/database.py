@@ -1,9 +1,15 @@
+import asyncio
 import os
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker  # <-- This is the correct sessionmaker for async usage
 from dotenv import load_dotenv
 import logging
 from entities.base import Base
+from utils.query_profiler import SQL_PROFILER_ENABLED, attach_profiler
+from utils.request_stats import PoolWaitTimingPool, track_engine
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,8 +20,10 @@ from entities.person_entity import Person
 from entities.image_entity import ImageEntity
 from entities.pet_entity import PetEntity
 from entities.notification_entity import NotificationEntity
+from entities.job_entity import JobEntity
 from entities.pet_image_entity import PetImageEntity
 from entities.avatar_image_entity import AvatarImageEntity
+from entities.image_variant_entity import ImageVariantEntity
 from entities.found_pet_image_entity import FoundPetImageEntity
 from entities.lost_pet_report_entity import LostPetReportEntity
 from entities.provider_phone_entity import ProviderPhoneEntity
@@ -34,15 +42,42 @@ logger = logging.getLogger(__name__)
 
 # Retrieve the async database URL from the environment variable
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional read replica; GET and HEAD requests read from it, everything else uses DATABASE_URL
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
 
-# Create the async SQLAlchemy engine with connection pooling
-async_engine = create_async_engine(
-    DATABASE_URL,
-    pool_size=20,         # Number of database connections to maintain in the pool
-    max_overflow=10,      # How many connections can be added beyond the pool size
-    pool_pre_ping=True,   # Check if connections are alive before using them
-    pool_timeout=30,      # Timeout for acquiring a connection from the pool
-)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))              # Connections kept open per engine and worker
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))        # Extra connections allowed under load
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))      # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))      # Replace connections older than this (seconds)
+# Pre-ping costs a round trip on every checkout; the background health check below replaces it by default
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false") == "true"
+# Prepared statements cached per connection by the asyncpg dialect; 0 when running behind pgbouncer transaction pooling
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500))
+DB_HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("DB_HEALTH_CHECK_INTERVAL_SECONDS", 30))
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=PoolWaitTimingPool,  # The default async pool, timing connection waits per request
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        connect_args={"prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+    )
+    # Per-request DB time, query count and rows for the request log
+    track_engine(engine.sync_engine)
+    # Opt-in statement profiler: N+1 warnings, slow queries with EXPLAIN plans, X-Debug-SQL response header
+    if SQL_PROFILER_ENABLED:
+        attach_profiler(engine.sync_engine)
+    return engine
+
+
+# Create the async SQLAlchemy engines with connection pooling
+async_engine = _create_engine(DATABASE_URL)
+replica_engine = _create_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
 
 # Create an async session factory using async_sessionmaker
 AsyncSessionLocal = async_sessionmaker(
@@ -50,13 +85,74 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,  # Disable session expiration on commit
     autoflush=False
 )
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    expire_on_commit=False,
+    autoflush=False
+) if replica_engine is not None else AsyncSessionLocal
+
+READ_ONLY_METHODS = ("GET", "HEAD")
 
 # Dependency to get a new async database session
-async def get_db() -> AsyncSession:
-    """Dependency to get a new asynchronous database session."""
+async def get_db(request: Request) -> AsyncSession:
+    """
+    Dependency to get a new asynchronous database session.
+    GET and HEAD requests get a replica session when DATABASE_REPLICA_URL is set; handlers that write while
+    serving a GET must depend on get_primary_db instead.
+    """
+    session_factory = ReplicaSessionLocal if request.method in READ_ONLY_METHODS else AsyncSessionLocal
+    async with session_factory() as session:
+        yield session
+
+# Dependency to get a session on the primary database whatever the request method
+async def get_primary_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
 
+
+async def _check_engine(engine: AsyncEngine, name: str) -> None:
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        # Drop the idle connections so requests reconnect instead of failing on dead sockets (e.g. after a failover)
+        logger.warning(f"Database health check failed for the {name} engine, resetting its pool: {str(e)}")
+        await engine.dispose()
+
+
+async def _run_health_checks(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await _check_engine(async_engine, "primary")
+        if replica_engine is not None:
+            await _check_engine(replica_engine, "replica")
+
+
+_health_check_task: Optional[asyncio.Task] = None
+
+
+def start_health_checks(interval: float = DB_HEALTH_CHECK_INTERVAL_SECONDS) -> None:
+    """Check every engine once per `interval` seconds in the background instead of pre-pinging on each checkout."""
+    global _health_check_task
+    if _health_check_task is None and interval > 0:
+        _health_check_task = asyncio.create_task(_run_health_checks(interval))
+
+
+async def stop_health_checks() -> None:
+    """Stop the background checks and close every pooled connection."""
+    global _health_check_task
+    if _health_check_task is not None:
+        _health_check_task.cancel()
+        try:
+            await _health_check_task
+        except asyncio.CancelledError:
+            pass
+        _health_check_task = None
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
 # Function to clear and recreate the database tables asynchronously
 async def clear_database(Base):
     """Function to clear and recreate the database tables asynchronously."""
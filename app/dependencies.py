@@ -1,5 +1,3 @@
-import os
-import boto3
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
@@ -7,20 +5,29 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.database import get_db
-from app.s3client import s3_client,bucket_name
+from app.job_worker import JOB_MAX_ATTEMPTS, job_worker
+from app.notification_hub import notification_hub, unread_counter
+from app.object_storage import object_storage
+from app.response_cache import response_cache
 from repositories.found_pet_report_repository import FoundPetReportRepository
 from repositories.image_repository import ImageRepository
+from repositories.image_variant_repository import ImageVariantRepository
+from repositories.job_repository import JobRepository
 from repositories.lost_pet_report_repository import LostPetReportRepository
 from repositories.medical_history_repository import MedicalHistoryRepository
+from repositories.notification_repository import NotificationRepository
 from repositories.pet_repository import PetRepository
 from repositories.provider_phone_repository import ProviderPhoneRepository
 from repositories.service_provider_location_repository import ServiceProviderLocationRepository
 from repositories.service_provider_repository import ServiceProviderRepository
 from repositories.sqlalchemy_found_pet_report_repository import SQLAlchemyFoundPetReportRepository
 from repositories.sqlalchemy_image_repository import SQLAlchemyImageRepository
+from repositories.sqlalchemy_image_variant_repository import SQLAlchemyImageVariantRepository
+from repositories.sqlalchemy_job_repository import SQLAlchemyJobRepository
 from repositories.sqlalchemy_avatar_image_repository import SQLAlchemyAvatarImageRepository
 from repositories.sqlalchemy_lost_pet_report_repository import SQLAlchemyLostPetReportRepository
 from repositories.sqlalchemy_medical_history_repository import SQLAlchemyMedicalHistoryRepository
+from repositories.sqlalchemy_notification_repository import SQLAlchemyNotificationRepository
 from repositories.sqlalchemy_person_repository import SQLAlchemyPersonRepository
 from repositories.sqlalchemy_pet_repository import SQLAlchemyPetRepository
 from repositories.sqlalchemy_provider_phone_repository import SQLAlchemyProviderPhoneRepository
@@ -37,9 +44,17 @@ from services.email_service import EmailService
 from services.email_service_implementation import EmailServiceImplementation
 from services.found_pet_report_service_implementation import FoundPetReportServiceImplementation
 from services.image_service_implementation import ImageServiceImplementation
+from services.image_variant_service import ImageVariantService
+from services.image_variant_service_implementation import ImageVariantServiceImplementation
+from services.job_service import JobService
+from services.job_service_implementation import JobServiceImplementation
+from services.object_storage_service import ObjectStorageService
 from services.avatar_image_service_implementation import AvatarImageServiceImplementation
 from services.lost_pet_report_service_implementation import LostPetReportServiceImplementation
 from services.medical_history_service_implementation import MedicalHistoryServiceImplementation
+from services.notification_service_implementation import NotificationServiceImplementation
+from services.pet_matching_service import PetMatchingService
+from services.pet_matching_service_implementation import PetMatchingServiceImplementation
 from services.person_service_implementation import PersonServiceImplementation
 from services.pet_service_implementation import PetServiceImplementation
 from services.provider_phone_service_implementation import ProviderPhoneServiceImplementation
@@ -48,12 +63,27 @@ from services.service_provider_service_implementation import ServiceProviderServ
 from services.user_provider_service_implementation import UserProviderServiceImplementation
 from services.user_service_implementation import UserServiceImplementation
 from services.working_hours_service_implementation import WorkingHoursServiceImplementation
+from utils.image_resizer import image_resizer
+from utils.notification_hub import NotificationHub
+from utils.response_cache import ResponseCache
+from utils.unread_counter import UnreadCounter
 
 
 
-# Email Service Dependency
-def get_email_service() -> EmailServiceImplementation:
-    return EmailServiceImplementation()
+# Job Service Dependencies (jobs are queued with the request's transaction, app.job_worker runs them)
+def get_job_repository() -> SQLAlchemyJobRepository:
+    return SQLAlchemyJobRepository()
+
+def get_job_service(
+    repository: JobRepository = Depends(get_job_repository),
+) -> JobServiceImplementation:
+    return JobServiceImplementation(repository, JOB_MAX_ATTEMPTS, on_enqueued=job_worker.wake)
+
+# Email Service Dependencies (emails are queued as send_email jobs on the mail queue)
+def get_email_service(
+    job_service: JobService = Depends(get_job_service),
+) -> EmailServiceImplementation:
+    return EmailServiceImplementation(job_service)
 
 # Person Repository and Service Dependencies
 def get_person_repository() -> SQLAlchemyPersonRepository:
@@ -72,21 +102,51 @@ def get_user_service(
 ) -> UserServiceImplementation:
     return UserServiceImplementation(repository, email_service)
 
+# Object Storage Dependency (one pooled client for the whole process)
+def get_object_storage() -> ObjectStorageService:
+    return object_storage
+
+# Response Cache Dependency (read endpoints look up, service writes invalidate)
+def get_response_cache() -> ResponseCache:
+    return response_cache
+
+# Notification Hub Dependency (saves and pushes notifications, holds the WebSocket connections)
+def get_notification_hub() -> NotificationHub:
+    return notification_hub
+
+# Notification Repository and Service Dependencies (the inbox read side)
+def get_notification_repository() -> SQLAlchemyNotificationRepository:
+    return SQLAlchemyNotificationRepository()
+
+def get_unread_counter() -> UnreadCounter:
+    return unread_counter
+
+def get_notification_service(
+    repository: NotificationRepository = Depends(get_notification_repository),
+    counter: UnreadCounter = Depends(get_unread_counter),
+) -> NotificationServiceImplementation:
+    return NotificationServiceImplementation(repository, counter)
+
 # Image Repository and Service Dependencies
 def get_image_repository() -> SQLAlchemyImageRepository:
     return SQLAlchemyImageRepository()
 
 def get_image_service(
     repository: ImageRepository = Depends(get_image_repository),
+    storage: ObjectStorageService = Depends(get_object_storage),
 ) -> ImageServiceImplementation:
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        region_name=os.getenv('AWS_REGION')
-    )
-    bucket_name = os.getenv('AWS_S3_BUCKET_NAME')
-    return ImageServiceImplementation(repository, s3_client, bucket_name)
+    return ImageServiceImplementation(repository, storage)
+
+# Image Variant Repository and Service Dependencies (variants are made by jobs on the images queue)
+def get_image_variant_repository() -> SQLAlchemyImageVariantRepository:
+    return SQLAlchemyImageVariantRepository()
+
+def get_image_variant_service(
+    repository: ImageVariantRepository = Depends(get_image_variant_repository),
+    storage: ObjectStorageService = Depends(get_object_storage),
+    jobs: JobService = Depends(get_job_service),
+) -> ImageVariantServiceImplementation:
+    return ImageVariantServiceImplementation(repository, storage, image_resizer, jobs)
 
 # Avatar Image Repository and Service Dependencies
 def get_avatar_image_repository() -> SQLAlchemyAvatarImageRepository:
@@ -94,25 +154,37 @@ def get_avatar_image_repository() -> SQLAlchemyAvatarImageRepository:
 
 def get_avatar_image_service(
     repository: AvatarImageRepository = Depends(get_avatar_image_repository),
+    storage: ObjectStorageService = Depends(get_object_storage),
+    variants: ImageVariantService = Depends(get_image_variant_service),
 ) -> AvatarImageServiceImplementation:
-    return AvatarImageServiceImplementation(repository, s3_client, bucket_name)
+    return AvatarImageServiceImplementation(repository, storage, variants)
 # Pet Repository and Service Dependencies
 def get_pet_repository() -> SQLAlchemyPetRepository:
     return SQLAlchemyPetRepository()
 
 def get_pet_service(
-    repository: PetRepository = Depends(get_pet_repository)
+    repository: PetRepository = Depends(get_pet_repository),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> PetServiceImplementation:
-    return PetServiceImplementation(repository)
+    return PetServiceImplementation(repository, cache)
 
 # Lost Pet Report Repository and Service Dependencies
 def get_lost_pet_report_repository() -> SQLAlchemyLostPetReportRepository:
     return SQLAlchemyLostPetReportRepository()
 
+# Pet Matching Service Dependency (matches found reports against open lost reports)
+def get_pet_matching_service(
+    repository: LostPetReportRepository = Depends(get_lost_pet_report_repository),
+) -> PetMatchingServiceImplementation:
+    return PetMatchingServiceImplementation(repository)
+
 def get_lost_pet_report_service(
     repository: LostPetReportRepository = Depends(get_lost_pet_report_repository),
+    matching_service: PetMatchingService = Depends(get_pet_matching_service),
+    cache: ResponseCache = Depends(get_response_cache),
+    jobs: JobService = Depends(get_job_service),
 ) -> LostPetReportServiceImplementation:
-    return LostPetReportServiceImplementation(repository)
+    return LostPetReportServiceImplementation(repository, matching_service, cache, jobs)
 
 # Found Pet Report Repository and Service Dependencies
 def get_found_pet_report_repository() -> SQLAlchemyFoundPetReportRepository:
@@ -120,8 +192,11 @@ def get_found_pet_report_repository() -> SQLAlchemyFoundPetReportRepository:
 
 def get_found_pet_report_service(
     repository: FoundPetReportRepository = Depends(get_found_pet_report_repository),
+    matching_service: PetMatchingService = Depends(get_pet_matching_service),
+    cache: ResponseCache = Depends(get_response_cache),
+    jobs: JobService = Depends(get_job_service),
 ) -> FoundPetReportServiceImplementation:
-    return FoundPetReportServiceImplementation(repository)
+    return FoundPetReportServiceImplementation(repository, matching_service, cache, jobs)
 
 
 # Medical History Repository and Service Dependencies
@@ -130,8 +205,9 @@ def get_medical_history_repository() -> SQLAlchemyMedicalHistoryRepository:
 
 def get_medical_history_service(
     repository: MedicalHistoryRepository = Depends(get_medical_history_repository),
+    cache: ResponseCache = Depends(get_response_cache),
 ) -> MedicalHistoryServiceImplementation:
-    return MedicalHistoryServiceImplementation(repository)
+    return MedicalHistoryServiceImplementation(repository, cache)
 
 
 # WorkingHours Repository and Service Dependencies
@@ -139,9 +215,10 @@ def get_working_hours_repository() -> SQLAlchemyWorkingHoursRepository:
     return SQLAlchemyWorkingHoursRepository()
 
 def get_working_hours_service(
-    repository: WorkingHoursRepository = Depends(get_working_hours_repository)
+    repository: WorkingHoursRepository = Depends(get_working_hours_repository),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> WorkingHoursServiceImplementation:
-    return WorkingHoursServiceImplementation(repository)
+    return WorkingHoursServiceImplementation(repository, cache)
 
 
 # ProviderPhone Repository and Service Dependencies
@@ -149,17 +226,19 @@ def get_provider_phone_repository() -> SQLAlchemyProviderPhoneRepository:
     return SQLAlchemyProviderPhoneRepository()
 
 def get_provider_phone_service(
-    repository: ProviderPhoneRepository = Depends(get_provider_phone_repository)
+    repository: ProviderPhoneRepository = Depends(get_provider_phone_repository),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> ProviderPhoneServiceImplementation:
-    return ProviderPhoneServiceImplementation(repository)
+    return ProviderPhoneServiceImplementation(repository, cache)
 # UserProvider Repository and Service Dependencies
 def get_user_provider_repository() -> SQLAlchemyUserProviderRepository:
     return SQLAlchemyUserProviderRepository()
 
 def get_user_provider_service(
-    repository: UserProviderRepository = Depends(get_user_provider_repository)
+    repository: UserProviderRepository = Depends(get_user_provider_repository),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> UserProviderServiceImplementation:
-    return UserProviderServiceImplementation(repository)
+    return UserProviderServiceImplementation(repository, cache)
 
 
 # ServiceProvider Repository and Service Dependencies
@@ -167,15 +246,17 @@ def get_service_provider_repository() -> SQLAlchemyServiceProviderRepository:
     return SQLAlchemyServiceProviderRepository()
 
 def get_service_provider_service(
-    repository: ServiceProviderRepository = Depends(get_service_provider_repository)
+    repository: ServiceProviderRepository = Depends(get_service_provider_repository),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> ServiceProviderServiceImplementation:
-    return ServiceProviderServiceImplementation(repository)
+    return ServiceProviderServiceImplementation(repository, cache)
 
 # ServiceProviderLocation Repository and Service Dependencies
 def get_service_provider_location_repository() -> SQLAlchemyServiceProviderLocationRepository:
     return SQLAlchemyServiceProviderLocationRepository()
 
 def get_service_provider_location_service(
-    repository: ServiceProviderLocationRepository = Depends(get_service_provider_location_repository)
+    repository: ServiceProviderLocationRepository = Depends(get_service_provider_location_repository),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> ServiceProviderLocationServiceImplementation:
-    return ServiceProviderLocationServiceImplementation(repository)
+    return ServiceProviderLocationServiceImplementation(repository, cache)
@@ -0,0 +1,174 @@
+# Background worker pool that runs queued jobs (jobs table, FOR UPDATE SKIP LOCKED) with per-queue concurrency
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from entities.job_entity import JobEntity
+from enums.job_kind_enum import JobKindEnum
+from enums.job_queue_enum import JobQueueEnum
+from errors.not_found_error import NotFoundError
+from errors.validation_error import ValidationError
+from repositories.job_repository import JobRepository
+from repositories.sqlalchemy_job_repository import SQLAlchemyJobRepository
+from utils.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKER_ENABLED = os.getenv("JOB_WORKER_ENABLED", "true") == "true"
+# Jobs run at once per queue and worker process, e.g. "default=2,notifications=4,images=2,mail=1"
+JOB_QUEUE_CONCURRENCY = os.getenv("JOB_QUEUE_CONCURRENCY", "default=2,notifications=4,images=2,mail=1")
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", 5))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", 10))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", 3600))
+# A claimed job that neither finished nor failed (crash, shutdown) becomes due again after this; also the time limit
+# of one attempt, so a job is never run twice at once
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 300))
+
+# Handlers get the job and a session; the session is committed together with the job's completion
+JobHandler = Callable[[JobEntity, AsyncSession], Awaitable[None]]
+
+jobs_finished = registry.register(Counter(
+    "jobs_finished_total", "Job attempts by queue and outcome: done, retry or dead.", ("queue", "outcome")))
+
+
+def _parse_concurrency(value: str) -> Dict[str, int]:
+    concurrency = {queue.value: 1 for queue in JobQueueEnum}
+    for entry in value.split(","):
+        queue, _, limit = entry.strip().partition("=")
+        if queue and limit:
+            concurrency[queue] = int(limit)
+    return concurrency
+
+
+class JobWorker:
+    """
+    One claim loop per queue keeps up to that queue's concurrency of jobs running, claiming only as many due jobs
+    as it has free slots (FOR UPDATE SKIP LOCKED, so the workers of every process share the queues).
+    A job whose handler raises is retried with exponential backoff and jitter until its max_attempts; ValidationError
+    and NotFoundError are not retried. Jobs that give up stay in the table as DEAD, with their last error.
+    Delivery is at least once: a handler must tolerate running again after a crash between its work and the commit.
+    """
+
+    def __init__(self, session_factory, repository: JobRepository, concurrency: Dict[str, int],
+                 poll_interval: float = JOB_POLL_INTERVAL_SECONDS, retry_base: float = JOB_RETRY_BASE_SECONDS,
+                 retry_max: float = JOB_RETRY_MAX_SECONDS, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.session_factory = session_factory
+        self.repository = repository
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease_seconds = lease_seconds
+        self.handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeups: Dict[str, asyncio.Event] = {queue: asyncio.Event() for queue in concurrency}
+        self._stopping = False
+
+    def register(self, kind: JobKindEnum, handler: JobHandler) -> None:
+        self.handlers[kind.value] = handler
+
+    def wake(self, queue: str) -> None:
+        """Called after a job is committed so it runs without waiting for the next poll."""
+        wakeup = self._wakeups.get(queue)
+        if wakeup is not None:
+            wakeup.set()
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._stopping = False
+            self._tasks = [asyncio.create_task(self._run(queue, limit))
+                           for queue, limit in self.concurrency.items() if limit > 0]
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+        if self._tasks:
+            done, pending = await asyncio.wait(self._tasks, timeout=self.lease_seconds)
+            for task in pending:
+                task.cancel()  # Their jobs become due again when the lease runs out
+            self._tasks = []
+
+    async def _run(self, queue: str, limit: int) -> None:
+        running = set()
+        wakeup = self._wakeups[queue]
+        while not self._stopping:
+            free = limit - len(running)
+            claimed: List[JobEntity] = []
+            if free > 0:
+                try:
+                    claimed = await self._claim(queue, free)
+                except Exception:
+                    logger.exception(f"Claiming jobs from queue '{queue}' failed")
+            for job in claimed:
+                task = asyncio.create_task(self._execute(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if len(claimed) < free or free == 0:
+                # Queue drained or every slot busy: wait for a new job, a free slot or the next poll
+                waiter = asyncio.create_task(wakeup.wait())
+                await asyncio.wait({waiter, *running}, timeout=self.poll_interval,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                wakeup.clear()
+        if running:
+            await asyncio.wait(running)  # Let jobs in progress finish before shutting down
+
+    async def _claim(self, queue: str, limit: int) -> List[JobEntity]:
+        async with self.session_factory() as db:
+            jobs = await self.repository.claim_due(
+                queue, limit, datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds), db)
+            await db.commit()
+        return jobs
+
+    def _retry_at(self, attempts: int) -> datetime:
+        delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    async def _execute(self, job: JobEntity) -> None:
+        error: Optional[str] = None
+        permanent = False
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise ValidationError(f"No handler registered for job kind '{job.kind}'")
+            async with self.session_factory() as db:
+                await asyncio.wait_for(handler(job, db), timeout=self.lease_seconds)
+                await self.repository.mark_done(job.job_id, datetime.now(timezone.utc), db)
+                await db.commit()
+            jobs_finished.inc(job.queue, "done")
+            return
+        except (ValidationError, NotFoundError) as e:
+            error, permanent = f"{type(e).__name__}: {str(e)}", True
+        except Exception as e:
+            error = f"{type(e).__name__}: {str(e)}"
+
+        attempts = job.attempts + 1
+        give_up = permanent or attempts >= job.max_attempts
+        if give_up:
+            logger.error(f"Job {job.job_id} ({job.kind}) moved to dead letters after {attempts} attempts: {error}")
+        else:
+            logger.warning(f"Job {job.job_id} ({job.kind}) failed, attempt {attempts} of {job.max_attempts}: {error}")
+        try:
+            async with self.session_factory() as db:
+                await self.repository.mark_attempt_failed(job.job_id, error, self._retry_at(attempts), give_up, db)
+                await db.commit()
+        except Exception:
+            # The lease still runs out, so the job is retried anyway
+            logger.exception(f"Failed to record the outcome of job {job.job_id}")
+        jobs_finished.inc(job.queue, "dead" if give_up else "retry")
+
+
+# Process-wide worker pool, started and stopped by the application lifespan; handlers are registered by app.jobs
+job_worker = JobWorker(
+    session_factory=AsyncSessionLocal,
+    repository=SQLAlchemyJobRepository(),
+    concurrency=_parse_concurrency(JOB_QUEUE_CONCURRENCY)
+)
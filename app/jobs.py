@@ -0,0 +1,79 @@
+# Job handlers run by app.job_worker, one per JobKindEnum
+import logging
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.dependencies import (get_image_variant_repository, get_image_variant_service, get_job_repository,
+                              get_job_service, get_object_storage)
+from app.job_worker import JobWorker
+from app.mailer import mailer
+from app.notification_hub import notification_hub
+from entities.job_entity import JobEntity
+from entities.notification_entity import NotificationEntity
+from enums.job_kind_enum import JobKindEnum
+from enums.notification_status_enum import NotificationStatusEnum
+from errors.database_error import DatabaseError
+from errors.mail_delivery_error import MailDeliveryError
+from errors.validation_error import ValidationError
+from services.image_variant_service import ImageVariantService
+
+logger = logging.getLogger(__name__)
+
+
+def _image_variant_service() -> ImageVariantService:
+    # Wired like the request handlers' service, outside of FastAPI's dependency injection
+    return get_image_variant_service(get_image_variant_repository(), get_object_storage(),
+                                     get_job_service(get_job_repository()))
+
+
+async def notify_users(job: JobEntity, db: AsyncSession) -> None:
+    notifications = []
+    for index, item in enumerate(job.payload["notifications"]):
+        notification = NotificationEntity(user_id=uuid.UUID(item["user_id"]), message=item["message"],
+                                          status=NotificationStatusEnum.UNREAD.value)
+        # Derived from the job, so a retry after a crash skips what was already saved instead of duplicating it
+        notification.notification_id = uuid.uuid5(job.job_id, str(index))
+        notifications.append(notification)
+    await notification_hub.save(notifications, db)
+
+
+async def create_image_variants(job: JobEntity, db: AsyncSession) -> None:
+    await _image_variant_service().create_variants(job.payload["source_key"], db)
+
+
+async def backfill_perceptual_hashes(job: JobEntity, db: AsyncSession) -> None:
+    after = job.payload.get("after")
+    await _image_variant_service().backfill_perceptual_hashes(job.payload["table"],
+                                                              uuid.UUID(after) if after else None, db)
+
+
+async def send_email(job: JobEntity, db: AsyncSession) -> None:
+    try:
+        await mailer.send(job.payload["recipient"], job.payload["subject"], job.payload["body"])
+    except MailDeliveryError as e:
+        if e.permanent:
+            # Rejected by the server (e.g. unknown recipient), so retrying cannot help
+            raise ValidationError(f"Mail server rejected the email to {job.payload['recipient']}: {str(e)}")
+        raise
+
+
+async def queue_perceptual_hash_backfill() -> None:
+    """Queue the one-off perceptual hash backfill at startup; a no-op once any worker has queued it."""
+    async with AsyncSessionLocal() as db:
+        try:
+            if await _image_variant_service().start_perceptual_hash_backfill(db):
+                await db.commit()
+                logger.info("Queued the perceptual hash backfill of existing pet and found pet images")
+        except DatabaseError as e:
+            await db.rollback()
+            # Usually another worker queuing it at the same moment; otherwise the next start tries again
+            logger.warning(f"Perceptual hash backfill not queued: {str(e)}")
+
+
+def register_job_handlers(worker: JobWorker) -> None:
+    worker.register(JobKindEnum.NOTIFY_USERS, notify_users)
+    worker.register(JobKindEnum.CREATE_IMAGE_VARIANTS, create_image_variants)
+    worker.register(JobKindEnum.BACKFILL_PERCEPTUAL_HASHES, backfill_perceptual_hashes)
+    worker.register(JobKindEnum.SEND_EMAIL, send_email)
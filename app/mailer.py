@@ -0,0 +1,68 @@
+# Sends the emails of send_email jobs (app.jobs) over one long-lived SMTP connection
+import asyncio
+import logging
+import os
+import time
+from email.message import EmailMessage
+from typing import Optional
+
+from services.mail_transport import MailTransport
+from services.smtp_mail_transport_implementation import SmtpMailTransportImplementation
+
+logger = logging.getLogger(__name__)
+
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_SENDER_EMAIL = os.getenv("SMTP_SENDER_EMAIL", SMTP_USERNAME)
+SMTP_SECURITY = os.getenv("SMTP_SECURITY", "starttls").lower()  # starttls, tls or none
+
+MAIL_RATE_PER_SECOND = float(os.getenv("MAIL_RATE_PER_SECOND", 10))
+
+
+class Mailer:
+    """
+    Sends one message at a time over the transport's connection, at no more than rate_per_second per process.
+    Delivery errors are raised as MailDeliveryError; retrying them is left to the job queue.
+    """
+
+    def __init__(self, transport: MailTransport, sender: Optional[str], rate_per_second: float = MAIL_RATE_PER_SECOND):
+        self.transport = transport
+        self.sender = sender
+        self.send_interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._lock = asyncio.Lock()  # One SMTP conversation at a time, whatever the mail queue's concurrency
+        self._next_send = 0.0
+
+    async def _throttle(self) -> None:
+        now = time.monotonic()
+        self._next_send = max(self._next_send, now)
+        if self._next_send > now:
+            await asyncio.sleep(self._next_send - now)
+        self._next_send += self.send_interval
+
+    async def send(self, recipient: str, subject: str, body: str) -> None:
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = recipient
+        message['Subject'] = subject
+        message.set_content(body)
+        async with self._lock:
+            await self._throttle()
+            await self.transport.send(message)
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+
+# Process-wide mailer, used by the send_email job handler and closed by the application lifespan
+mailer = Mailer(
+    transport=SmtpMailTransportImplementation(
+        hostname=SMTP_SERVER,
+        port=SMTP_PORT,
+        username=SMTP_USERNAME,
+        password=SMTP_PASSWORD,
+        security=SMTP_SECURITY
+    ),
+    sender=SMTP_SENDER_EMAIL
+)
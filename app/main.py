@@ -1,11 +1,27 @@
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 from database import clear_database_if_needed
+from app.database import start_health_checks, stop_health_checks
+from app.job_worker import JOB_WORKER_ENABLED, job_worker
+from app.jobs import queue_perceptual_hash_backfill, register_job_handlers
+from app.mailer import mailer
+from app.match_index_refresher import match_index_refresher
+from app.notification_hub import notification_hub
+from app.notification_purger import NOTIFICATION_PURGE_ENABLED, notification_purger
+from app.object_storage import OBJECT_STORAGE_BACKEND, object_storage
+from app.response_cache import response_cache
+from utils.image_resizer import image_resizer
+from utils.input_validation import warm_up_validation
+from utils.password_hasher import password_hasher
+from utils.structured_logging import configure_logging, stop_logging
 from routers.avatar_image_router import get_avatar_image_router
 from routers.found_pet_report_router import get_found_pet_report_router
+from routers.local_storage_router import get_local_storage_router
 from routers.lost_pet_report_router import get_lost_pet_report_router
 from routers.medical_history_router import get_medical_history_router
+from routers.notification_router import get_notification_router
 from routers.pet_router import get_pet_router
 from routers.provider_phone_router import get_provider_phone_router
 from routers.service_provider_location_router import get_service_provider_location_router
@@ -16,8 +32,8 @@ import logging
 
 from routers.working_hours_router import get_working_hours_router
 
-# Set up basic logging configuration
-logging.basicConfig(level=logging.INFO)
+# Structured logging through a background queue listener (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATES)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -29,9 +45,45 @@ async def lifespan(app: FastAPI):
     # Clear and create database tables if needed
     await clear_database_if_needed()
 
+    # Load the phone metadata, and the password dictionaries in a hashing worker, now rather than on the first registration
+    await warm_up_validation()
+    await password_hasher.warm_up()
+
+    # Periodic SELECT 1 per engine; resets a pool whose connections went bad
+    start_health_checks()
+
+    # Build the lost pet match indexes before serving, then rebuild them in the background
+    await match_index_refresher.start()
+
+    # The backplane subscription that feeds this worker's sockets
+    await notification_hub.start()
+
+    # Delete old read notifications in the background; disable to run the purge elsewhere
+    if NOTIFICATION_PURGE_ENABLED:
+        notification_purger.start()
+
+    # Run queued background jobs from this worker; disable to run them elsewhere
+    register_job_handlers(job_worker)
+    if JOB_WORKER_ENABLED:
+        job_worker.start()
+
+    # Hash the pet and found pet photos uploaded before photos were hashed, once for the whole deployment
+    await queue_perceptual_hash_backfill()
+
     yield  # This is where the application runs
 
     logger.info("Application shutdown - performing cleanup...")
+    await job_worker.stop()  # Before the hub, whose backplane its notification jobs publish on
+    await mailer.close()
+    await notification_hub.stop()
+    await notification_purger.stop()
+    await match_index_refresher.stop()
+    await object_storage.close()
+    await response_cache.close()
+    await stop_health_checks()
+    password_hasher.close()
+    image_resizer.close()
+    stop_logging()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -49,10 +101,21 @@ app.include_router(get_working_hours_router(), prefix="/working_hours", tags=["W
 app.include_router(get_provider_phone_router(),prefix="/provider_phones", tags=["Provider Phones"])
 app.include_router(get_user_provider_router(),prefix="/users_providers",tags=["Users Providers"])
 app.include_router(get_service_provider_location_router(),prefix="/service_provider_locations",tags=["Service Provider Locations"])
+app.include_router(get_notification_router(),prefix="/notifications",tags=["Notifications"])
+# Files of the local storage backend, at the path of LOCAL_STORAGE_BASE_URL (S3 serves its own)
+if OBJECT_STORAGE_BACKEND == "local" and object_storage.base_path:
+    app.include_router(get_local_storage_router(object_storage), prefix=object_storage.base_path, include_in_schema=False)
+
+# Per-route metrics and request logging for every router above
+from utils.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from utils.middleware import RequestInstrumentationMiddleware, instrument_routes
+instrument_routes(app)
+app.add_middleware(RequestInstrumentationMiddleware)
+
 
-# Add the middleware for logging
-from utils.middleware import log_requests
-app.middleware("http")(log_requests)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,71 @@
+# Background task that builds this worker's lost pet match indexes at startup and rebuilds them periodically
+import asyncio
+import logging
+from typing import Optional
+
+from app.database import AsyncSessionLocal
+from repositories.sqlalchemy_lost_pet_report_repository import SQLAlchemyLostPetReportRepository
+from services.pet_matching_service import PetMatchingService
+from services.pet_matching_service_implementation import MATCH_INDEX_REFRESH_SECONDS, PetMatchingServiceImplementation
+
+logger = logging.getLogger(__name__)
+
+# Until the first build succeeds, it is retried this often instead of every refresh interval
+MATCH_INDEX_RETRY_SECONDS = 10
+
+
+class MatchIndexRefresher:
+    """
+    Rebuilds the indexes behind found pet matching every interval, in its own session, so no request ever waits
+    for a rebuild or holds its transaction open during one. start() completes the first build before the
+    application serves requests.
+    """
+
+    def __init__(self, session_factory, matching_service: PetMatchingService,
+                 interval: float = MATCH_INDEX_REFRESH_SECONDS, retry_interval: float = MATCH_INDEX_RETRY_SECONDS):
+        self.session_factory = session_factory
+        self.matching_service = matching_service
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            loaded = await self.refresh()
+            self._task = asyncio.create_task(self._run(loaded))
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self, loaded: bool) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval if loaded else self.retry_interval)
+            except asyncio.TimeoutError:
+                pass
+            if not self._stopping:
+                loaded = await self.refresh() or loaded
+
+    async def refresh(self) -> bool:
+        """Rebuild the indexes, and return whether that succeeded; the previous indexes stay in use if not."""
+        try:
+            async with self.session_factory() as db:
+                await self.matching_service.rebuild_indexes(db)
+            return True
+        except Exception:
+            logger.exception("Rebuilding the pet match indexes failed")
+            return False
+
+
+# Process-wide refresher, started and stopped by the application lifespan
+match_index_refresher = MatchIndexRefresher(
+    session_factory=AsyncSessionLocal,
+    matching_service=PetMatchingServiceImplementation(SQLAlchemyLostPetReportRepository())
+)
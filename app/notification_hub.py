@@ -0,0 +1,48 @@
+# Process-wide notification hub: WebSocket connections of this worker and the pub/sub backplane
+import os
+
+from app.response_cache import RESPONSE_CACHE_MAX_ENTRIES, response_cache
+from repositories.sqlalchemy_notification_repository import SQLAlchemyNotificationRepository
+from services.local_cache_store_implementation import LocalCacheStoreImplementation
+from services.local_notification_backplane_implementation import LocalNotificationBackplaneImplementation
+from services.notification_backplane import NotificationBackplane
+from utils.metrics import Gauge, registry
+from utils.notification_hub import NotificationHub
+from utils.unread_counter import UnreadCounter
+
+# "redis" to deliver across workers (REDIS_URL), "local" when there is only one worker
+NOTIFICATION_BACKPLANE = os.getenv("NOTIFICATION_BACKPLANE", "local").lower()
+NOTIFICATION_SEND_QUEUE_SIZE = int(os.getenv("NOTIFICATION_SEND_QUEUE_SIZE", 100))
+NOTIFICATION_SEND_TIMEOUT_SECONDS = float(os.getenv("NOTIFICATION_SEND_TIMEOUT_SECONDS", 5))
+# How long an unread count is trusted before it is counted again; keep it short without a shared response cache tier,
+# since each worker then only sees the changes it made itself
+NOTIFICATION_UNREAD_COUNT_TTL_SECONDS = float(os.getenv("NOTIFICATION_UNREAD_COUNT_TTL_SECONDS", 300))
+
+
+def _create_backplane() -> NotificationBackplane:
+    if NOTIFICATION_BACKPLANE == "redis":
+        # Imported here so the redis package is only needed when the Redis backplane is used
+        from services.redis_notification_backplane_implementation import RedisNotificationBackplaneImplementation
+        return RedisNotificationBackplaneImplementation(
+            url=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            channel=os.getenv("NOTIFICATION_CHANNEL", "notifications")
+        )
+    return LocalNotificationBackplaneImplementation()
+
+
+# Counts live next to the shared response cache entries when there is a shared tier, so every worker sees one count
+unread_counter = UnreadCounter(
+    store=response_cache.shared or LocalCacheStoreImplementation(max_entries=RESPONSE_CACHE_MAX_ENTRIES),
+    ttl_seconds=NOTIFICATION_UNREAD_COUNT_TTL_SECONDS
+)
+
+notification_hub = NotificationHub(
+    repository=SQLAlchemyNotificationRepository(),
+    backplane=_create_backplane(),
+    unread_counter=unread_counter,
+    send_queue_size=NOTIFICATION_SEND_QUEUE_SIZE,
+    send_timeout=NOTIFICATION_SEND_TIMEOUT_SECONDS
+)
+
+registry.register(Gauge("notification_connections", "WebSocket notification connections open on this worker.",
+                        lambda: len(notification_hub)))
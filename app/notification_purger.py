@@ -0,0 +1,86 @@
+# Background job that deletes old read notifications in small batches so the notifications table stays small
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.database import AsyncSessionLocal
+from repositories.notification_repository import NotificationRepository
+from repositories.sqlalchemy_notification_repository import SQLAlchemyNotificationRepository
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_PURGE_ENABLED = os.getenv("NOTIFICATION_PURGE_ENABLED", "true") == "true"
+NOTIFICATION_RETENTION_DAYS = float(os.getenv("NOTIFICATION_RETENTION_DAYS", 30))
+NOTIFICATION_PURGE_BATCH_SIZE = int(os.getenv("NOTIFICATION_PURGE_BATCH_SIZE", 1000))
+NOTIFICATION_PURGE_INTERVAL_SECONDS = float(os.getenv("NOTIFICATION_PURGE_INTERVAL_SECONDS", 3600))
+# Pause between batches of one run, so the purge never holds locks or saturates I/O for long
+NOTIFICATION_PURGE_PAUSE_SECONDS = float(os.getenv("NOTIFICATION_PURGE_PAUSE_SECONDS", 0.1))
+
+
+class NotificationPurger:
+    """
+    Every interval, deletes read notifications older than retention_days, batch_size rows per transaction
+    (FOR UPDATE SKIP LOCKED, so the purgers of several workers split the work instead of waiting on each other).
+    Unread notifications are never purged, so unread counts are unaffected.
+    """
+
+    def __init__(self, session_factory, repository: NotificationRepository,
+                 retention_days: float = NOTIFICATION_RETENTION_DAYS, batch_size: int = NOTIFICATION_PURGE_BATCH_SIZE,
+                 interval: float = NOTIFICATION_PURGE_INTERVAL_SECONDS, pause: float = NOTIFICATION_PURGE_PAUSE_SECONDS):
+        self.session_factory = session_factory
+        self.repository = repository
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await self.purge()
+            except Exception:
+                logger.exception("Notification purge failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def purge(self) -> int:
+        """Delete every read notification past retention, one batch at a time, and return how many went."""
+        older_than = datetime.utcnow() - timedelta(days=self.retention_days)
+        total = 0
+        while not self._stopping:
+            async with self.session_factory() as db:
+                deleted = await self.repository.purge_read(older_than, self.batch_size, db)
+                await db.commit()
+            total += deleted
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.pause)
+        if total:
+            logger.info(f"Purged {total} read notifications older than {self.retention_days:g} days")
+        return total
+
+
+# Process-wide purger, started and stopped by the application lifespan
+notification_purger = NotificationPurger(
+    session_factory=AsyncSessionLocal,
+    repository=SQLAlchemyNotificationRepository()
+)
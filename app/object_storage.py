@@ -0,0 +1,30 @@
+# Process-wide object storage client shared by every request
+import os
+
+from services.local_object_storage_service_implementation import LocalObjectStorageServiceImplementation
+from services.object_storage_service import ObjectStorageService
+from services.s3_object_storage_service_implementation import S3ObjectStorageServiceImplementation
+
+# "s3" for AWS S3 or an S3-compatible endpoint such as MinIO (set S3_ENDPOINT_URL), "local" for the filesystem
+OBJECT_STORAGE_BACKEND = os.getenv("OBJECT_STORAGE_BACKEND", "s3").lower()
+
+
+def _create_object_storage() -> ObjectStorageService:
+    if OBJECT_STORAGE_BACKEND == "local":
+        return LocalObjectStorageServiceImplementation(
+            root_dir=os.getenv("LOCAL_STORAGE_ROOT", "./storage"),
+            base_url=os.getenv("LOCAL_STORAGE_BASE_URL", "http://localhost:8000/storage")
+        )
+    return S3ObjectStorageServiceImplementation(
+        bucket_name=os.getenv('AWS_S3_BUCKET_NAME'),
+        region_name=os.getenv('AWS_REGION'),
+        endpoint_url=os.getenv('S3_ENDPOINT_URL') or None,
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", 50)),
+        connect_timeout=float(os.getenv("S3_CONNECT_TIMEOUT_SECONDS", 5)),
+        read_timeout=float(os.getenv("S3_READ_TIMEOUT_SECONDS", 10))
+    )
+
+
+object_storage = _create_object_storage()
@@ -0,0 +1,42 @@
+# Process-wide response cache for hot read endpoints
+import os
+from typing import Optional
+
+from services.cache_store import CacheStore
+from services.local_cache_store_implementation import LocalCacheStoreImplementation
+from utils.metrics import Gauge, registry
+from utils.response_cache import ResponseCache
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true") == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2000))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+# With a shared tier, how long a worker trusts its own copy; bounds staleness after another worker's write
+RESPONSE_CACHE_LOCAL_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_LOCAL_TTL_SECONDS", 5))
+# "none" for the in-process tier only, "redis" to share entries between workers (REDIS_URL), "local" for a stand-in
+RESPONSE_CACHE_SHARED_BACKEND = os.getenv("RESPONSE_CACHE_SHARED_BACKEND", "none").lower()
+
+
+def _create_shared_store() -> Optional[CacheStore]:
+    if RESPONSE_CACHE_SHARED_BACKEND == "redis":
+        # Imported here so the redis package is only needed when the shared tier is used
+        from services.redis_cache_store_implementation import RedisCacheStoreImplementation
+        return RedisCacheStoreImplementation(
+            url=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),
+            socket_timeout=float(os.getenv("REDIS_TIMEOUT_SECONDS", 0.5))
+        )
+    if RESPONSE_CACHE_SHARED_BACKEND == "local":
+        return LocalCacheStoreImplementation(max_entries=RESPONSE_CACHE_MAX_ENTRIES)
+    return None
+
+
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS,
+    local_ttl_seconds=RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+    shared=_create_shared_store(),
+    enabled=RESPONSE_CACHE_ENABLED
+)
+
+registry.register(Gauge("response_cache_entries", "Responses held in this worker's in-process cache tier.",
+                        lambda: len(response_cache)))
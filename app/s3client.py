@@ -1,13 +0,0 @@
-# Initialize the S3 client once
-import os
-
-import boto3
-
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-    region_name=os.getenv('AWS_REGION')
-)
-
-bucket_name = os.getenv('AWS_S3_BUCKET_NAME')
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Benchmark for POST /medical_history/bulk: importing a clinic's visit history for a set of pets.
+
+Inserts --rows medical history records twice: once through add_all() + flush() (the old path) and once through
+utils.bulk_insert (multi-row INSERT ... RETURNING in chunks). --bad-rows of them reference a pet that does not
+exist, to show the cost of isolating failing rows. Everything runs in one transaction that is rolled back.
+Needs a PostGIS database reachable through DATABASE_URL. Run from the project root:
+    python -m benchmarks.bulk_insert_benchmark --rows 10000 --bad-rows 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base
+from entities.medical_history_entity import MedicalHistoryEntity
+from entities.pet_entity import PetEntity
+from entities.user_entity import UserEntity
+from enums.role_enum import RoleEnum
+from utils.bulk_insert import bulk_insert
+from utils.insert_returning import insert_returning
+
+
+def visits(pet_ids, rows: int, rng: random.Random):
+    started = datetime(2015, 1, 1)
+    return [MedicalHistoryEntity(pet_id=rng.choice(pet_ids), visit_date=started + timedelta(hours=rng.randrange(80_000)),
+                                 diagnosis=rng.choice(["Checkup", "Vaccination", "Otitis", "Dental cleaning"]),
+                                 treatment="Bench treatment", notes=None, veterinarian_name="Dr. Bench")
+            for _ in range(rows)]
+
+
+async def add_all_flush(records, db: AsyncSession):
+    db.add_all(records)
+    await db.flush()
+    return records
+
+
+async def run(args) -> None:
+    load_dotenv()
+    engine = create_async_engine(os.getenv("DATABASE_URL"))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            db = AsyncSession(bind=conn, expire_on_commit=False, autoflush=False)
+            try:
+                user = await insert_returning(UserEntity(
+                    email=f"bulk-bench-{time.time_ns()}@example.com", first_name="Bench", last_name="User",
+                    hashed_password="x", role=RoleEnum.USER, phone_number="0000000000"), db)
+                pets = [await insert_returning(PetEntity(user_id=user.user_id, name=f"bench pet {index}", species="Dog",
+                                                         breed="Mixed", date_of_birth=date(2020, 1, 1),
+                                                         main_color="Brown", pet_details={}), db)
+                        for index in range(args.pets)]
+                pet_ids = [pet.pet_id for pet in pets]
+                print(f"{args.rows} medical history rows over {args.pets} pets")
+
+                started = time.perf_counter()
+                await add_all_flush(visits(pet_ids, args.rows, random.Random(42)), db)
+                print(f"  add_all+flush  {time.perf_counter() - started:7.2f}s  (one bad row would fail the whole batch)")
+
+                records = visits(pet_ids, args.rows, random.Random(42))
+                for record in random.Random(7).sample(records, args.bad_rows):
+                    record.pet_id = uuid.uuid4()
+                started = time.perf_counter()
+                result = await bulk_insert(records, db)
+                print(f"  bulk_insert    {time.perf_counter() - started:7.2f}s  "
+                      f"{len(result.created)} created, {len(result.errors)} rejected")
+            finally:
+                await db.close()
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--pets", type=int, default=200)
+    parser.add_argument("--bad-rows", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
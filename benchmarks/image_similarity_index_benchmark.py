@@ -0,0 +1,116 @@
+"""
+Benchmark for the lost pet photo similarity index.
+
+Loads N synthetic photo hashes, in clusters of near duplicates (several photos of one pet) spread over the
+continental US, and times Hamming-distance searches around found pet photos against a linear scan, checking that
+both find the same lost reports.
+Run from the project root:  python -m benchmarks.image_similarity_index_benchmark --size 1000000
+"""
+import argparse
+import random
+import resource
+import statistics
+import time
+import uuid
+
+from utils import geohash
+from utils.image_similarity_index import ImageSimilarityIndex, LostPetPhoto
+
+
+def _random_point(rng: random.Random):
+    return rng.uniform(25.0, 49.0), rng.uniform(-124.0, -67.0)
+
+
+def _flip(value: int, bits: int, rng: random.Random) -> int:
+    for bit in rng.sample(range(64), bits):
+        value ^= 1 << bit
+    return value
+
+
+def build_photos(size: int, photos_per_pet: int, rng: random.Random):
+    photos = []
+    while len(photos) < size:
+        base = rng.getrandbits(64)
+        pet_id, report_id = uuid.uuid4(), uuid.uuid4()
+        latitude, longitude = _random_point(rng)
+        for _ in range(min(photos_per_pet, size - len(photos))):
+            photos.append(LostPetPhoto(uuid.uuid4(), pet_id, report_id, latitude, longitude,
+                                       _flip(base, rng.randint(0, 6), rng)))
+    return photos
+
+
+def linear_scan(photos, query: int, max_distance: int, latitude=None, longitude=None, radius_km=None):
+    found = set()
+    for photo in photos:
+        if (photo.perceptual_hash ^ query).bit_count() > max_distance:
+            continue
+        if radius_km is not None and geohash.haversine_km(latitude, longitude, photo.latitude,
+                                                          photo.longitude) > radius_km:
+            continue
+        found.add(photo.report_id)
+    return found
+
+
+def _summary(timings):
+    timings = sorted(timings)
+    return (f"mean {statistics.mean(timings):.0f}us  p50 {timings[len(timings) // 2]:.0f}us  "
+            f"p99 {timings[int(len(timings) * 0.99)]:.0f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--photos-per-pet", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--scans", type=int, default=20, help="queries also answered by a linear scan")
+    parser.add_argument("--distances", type=int, nargs="+", default=[6, 10, 12])
+    parser.add_argument("--radius-km", type=float, default=50.0)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    photos = build_photos(args.size, args.photos_per_pet, rng)
+    index = ImageSimilarityIndex()
+    memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    index.replace_all(photos)
+    print(f"built index of {len(index)} photos in {time.perf_counter() - started:.1f}s, "
+          f"max RSS grew by {(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory_before) / 1024:.0f} MB")
+
+    # Found pet photos: a lost pet's photo taken again (a few bits off), or a pet nobody reported (random)
+    queries = []
+    for _ in range(args.queries):
+        if rng.random() < 0.5:
+            photo = rng.choice(photos)
+            queries.append((_flip(photo.perceptual_hash, rng.randint(0, 8), rng), photo.latitude, photo.longitude))
+        else:
+            queries.append((rng.getrandbits(64), *_random_point(rng)))
+
+    for max_distance in args.distances:
+        for geo in (False, True):
+            radius_km = args.radius_km if geo else None
+            timings, hits = [], 0
+            for query, latitude, longitude in queries:
+                started = time.perf_counter()
+                matches = index.search([query], max_distance, limit=10, latitude=latitude, longitude=longitude,
+                                       radius_km=radius_km)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+                hits += bool(matches)
+
+            scan_timings = []
+            for query, latitude, longitude in queries[:args.scans]:
+                started = time.perf_counter()
+                expected = linear_scan(photos, query, max_distance, latitude, longitude, radius_km)
+                scan_timings.append((time.perf_counter() - started) * 1_000_000)
+                found = {match.report_id for match in index.search([query], max_distance, limit=len(photos),
+                                                                   latitude=latitude, longitude=longitude,
+                                                                   radius_km=radius_km)}
+                assert found == expected, f"index and scan disagree for {query:016x} at distance {max_distance}"
+
+            label = f"distance <= {max_distance}" + (f", within {radius_km:g} km" if geo else "")
+            print(f"{label}: {len(queries)} searches {_summary(timings)}  with matches {hits / len(queries):.0%}; "
+                  f"linear scan mean {statistics.mean(scan_timings) / 1000:.0f}ms "
+                  f"({statistics.mean(scan_timings) / statistics.mean(timings):.0f}x slower, same results)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for the inserts behind POST /pets/ and POST /lost_pet_reports/.
+
+Inserts --inserts rows per endpoint twice: once the old way (db.add, flush, refresh: an INSERT followed by a SELECT)
+and once through the repositories' INSERT ... RETURNING. Counts the statements sent per insert and times them.
+Everything runs in one transaction that is rolled back, so the database is left as it was. The commit each endpoint
+issues is the same in both cases and is not measured. The gap grows with the network latency to the database.
+Needs a PostGIS database reachable through DATABASE_URL. Run from the project root:
+    python -m benchmarks.insert_round_trip_benchmark --inserts 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import date
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base
+from entities.lost_pet_report_entity import LostPetReportEntity
+from entities.pet_entity import PetEntity
+from entities.user_entity import UserEntity
+from enums.role_enum import RoleEnum
+from utils.insert_returning import insert_returning
+from utils.location import Location
+
+
+async def flush_refresh(entity, db: AsyncSession):
+    db.add(entity)
+    await db.flush()
+    await db.refresh(entity)
+    return entity
+
+
+def new_pet(user_id, index: int) -> PetEntity:
+    return PetEntity(user_id=user_id, name=f"bench pet {index}", species="Dog", breed="Mixed",
+                     date_of_birth=date(2020, 1, 1), main_color="Brown", pet_details={"bench": True})
+
+
+def new_lost_report(pet: PetEntity, rng: random.Random) -> LostPetReportEntity:
+    location = Location(latitude=rng.uniform(25.0, 49.0), longitude=rng.uniform(-124.0, -67.0))
+    return LostPetReportEntity(pet_id=pet.pet_id, user_id=pet.user_id, geo_location=location,
+                               description="bench report", status="LOST")
+
+
+async def time_inserts(db: AsyncSession, create, entities, statements: list):
+    timings = []
+    counted = len(statements)
+    for entity in entities:
+        started = time.perf_counter()
+        await create(entity, db)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    per_insert = (len(statements) - counted) / len(timings)
+    return per_insert, statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+def report(endpoint: str, name: str, result) -> None:
+    per_insert, mean, p50, p99 = result
+    print(f"  {endpoint:<22} {name:<14} {per_insert:.1f} statements/insert  "
+          f"mean {mean:.3f}ms  p50 {p50:.3f}ms  p99 {p99:.3f}ms")
+
+
+async def run(args) -> None:
+    load_dotenv()
+    engine = create_async_engine(os.getenv("DATABASE_URL"))
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *_: statements.append(None))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            db = AsyncSession(bind=conn, expire_on_commit=False, autoflush=False)
+            try:
+                user = await insert_returning(UserEntity(
+                    email=f"insert-bench-{time.time_ns()}@example.com", first_name="Bench", last_name="User",
+                    hashed_password="x", role=RoleEnum.USER, phone_number="0000000000"), db)
+                print(f"{args.inserts} inserts per endpoint and strategy")
+
+                strategies = {"flush+refresh": flush_refresh, "returning": insert_returning}
+                rng = random.Random(42)
+                for name, create in strategies.items():
+                    pets = [new_pet(user.user_id, index) for index in range(args.inserts)]
+                    report("POST /pets/", name, await time_inserts(db, create, pets, statements))
+
+                for name, create in strategies.items():
+                    # A pet can have one lost report; give each report a fresh pet, inserted outside the measurement
+                    pets = [await insert_returning(new_pet(user.user_id, index), db) for index in range(args.inserts)]
+                    reports = [new_lost_report(pet, rng) for pet in pets]
+                    report("POST /lost_pet_reports/", name, await time_inserts(db, create, reports, statements))
+            finally:
+                await db.close()
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inserts", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark for "closest N" geography queries against PostGIS.
+
+Fills a scratch table with N random points over the continental US, builds the same GiST index the entities declare
+and compares ORDER BY ST_Distance(...) LIMIT k (full sort) with ORDER BY geo_location <-> point LIMIT k (index walk).
+Needs a PostGIS database reachable through DATABASE_URL. Run from the project root:
+    python -m benchmarks.knn_query_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+TABLE = "bench_knn_points"
+
+QUERIES = {
+    "st_distance": f"""
+        SELECT id FROM {TABLE}
+        ORDER BY ST_Distance(geo_location, ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography)
+        LIMIT :limit
+    """,
+    "knn": f"""
+        SELECT id FROM {TABLE}
+        ORDER BY geo_location <-> ST_SetSRID(ST_MakePoint(:lon, :lat), 4326)::geography
+        LIMIT :limit
+    """,
+}
+
+
+def _random_point(rng: random.Random):
+    return rng.uniform(-124.0, -67.0), rng.uniform(25.0, 49.0)
+
+
+async def populate(conn, size: int) -> None:
+    await conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    await conn.execute(text(f"CREATE TABLE {TABLE} (id serial PRIMARY KEY, geo_location geography(POINT, 4326))"))
+    await conn.execute(text(f"""
+        INSERT INTO {TABLE} (geo_location)
+        SELECT ST_SetSRID(ST_MakePoint(-124 + random() * 57, 25 + random() * 24), 4326)::geography
+        FROM generate_series(1, :size)
+    """), {"size": size})
+    await conn.execute(text(f"CREATE INDEX idx_{TABLE}_geo_location ON {TABLE} USING gist (geo_location)"))
+    await conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+async def time_query(conn, sql: str, queries: int, limit: int, rng: random.Random):
+    statement = text(sql)
+    timings = []
+    for _ in range(queries):
+        longitude, latitude = _random_point(rng)
+        started = time.perf_counter()
+        await conn.execute(statement, {"lon": longitude, "lat": latitude, "limit": limit})
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+async def run(args) -> None:
+    load_dotenv()
+    engine = create_async_engine(os.getenv("DATABASE_URL"))
+    try:
+        for size in args.sizes:
+            async with engine.begin() as conn:
+                started = time.perf_counter()
+                await populate(conn, size)
+                print(f"loaded {size} points in {time.perf_counter() - started:.1f}s")
+
+                for name, sql in QUERIES.items():
+                    rng = random.Random(42)
+                    mean, p50, p99 = await time_query(conn, sql, args.queries, args.limit, rng)
+                    print(f"  {name:<12} {args.queries} queries: mean {mean:.2f}ms  p50 {p50:.2f}ms  p99 {p99:.2f}ms")
+
+                await conn.execute(text(f"DROP TABLE {TABLE}"))
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
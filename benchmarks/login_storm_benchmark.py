@@ -0,0 +1,74 @@
+"""
+Benchmark for password verification under a login storm.
+
+Fires --logins concurrent bcrypt verifications while a probe coroutine stands in for an unrelated endpoint,
+waking every --probe-interval ms and recording how late it was served. The storm runs once with verification
+inline on the event loop (the old behaviour) and once through the shared PasswordHasher process pool.
+Run from the project root:  python -m benchmarks.login_storm_benchmark --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from utils.password_hasher import PasswordHasher, crypt_context_settings
+
+
+async def probe(interval: float, stop: asyncio.Event, latencies: list) -> None:
+    while not stop.is_set():
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+
+
+async def storm(verify, logins: int, password: str, hashed_password: str, interval: float):
+    stop = asyncio.Event()
+    latencies = []
+    prober = asyncio.create_task(probe(interval, stop, latencies))
+    await asyncio.sleep(interval * 5)  # Baseline before the storm
+    started = time.perf_counter()
+    await asyncio.gather(*(verify(password, hashed_password) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await prober
+    latencies.sort()
+    return elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99)], latencies[-1]
+
+
+def report(name: str, logins: int, result) -> None:
+    elapsed, p50, p99, worst = result
+    print(f"  {name:<8} {logins / elapsed:7.1f} logins/s   probe delay p50 {p50:7.2f}ms  "
+          f"p99 {p99:8.2f}ms  max {worst:8.2f}ms")
+
+
+async def run(args) -> None:
+    context = CryptContext(**crypt_context_settings())
+    password = "correct horse battery staple"
+    hashed_password = context.hash(password)
+    interval = args.probe_interval / 1000
+
+    async def verify_inline(plain: str, hashed: str) -> bool:
+        return context.verify(plain, hashed)
+
+    hasher = PasswordHasher(workers=args.workers, max_pending=args.logins, queue_timeout=3600)
+    await hasher.hash(password)  # Start the workers outside the measurement
+    try:
+        print(f"{args.logins} concurrent logins, {args.workers} hashing workers")
+        report("inline", args.logins, await storm(verify_inline, args.logins, password, hashed_password, interval))
+        report("pool", args.logins, await storm(hasher.verify, args.logins, password, hashed_password, interval))
+    finally:
+        hasher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=PasswordHasher().workers)
+    parser.add_argument("--probe-interval", type=float, default=10.0, help="milliseconds")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
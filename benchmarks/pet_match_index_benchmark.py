@@ -0,0 +1,74 @@
+"""
+Benchmark for the lost/found pet candidate index.
+
+Loads N synthetic open lost reports spread over the continental US and times single found-pet matches.
+Run from the project root:  python -m benchmarks.pet_match_index_benchmark --size 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from utils.pet_match_index import LostPetCandidate, PetMatchIndex
+
+SPECIES = ["dog", "cat", "rabbit", "parrot"]
+BREEDS = ["labrador", "poodle", "beagle", "siamese", "persian", None]
+COLORS = ["black", "white", "brown", "golden", "grey", None]
+
+
+def _random_point(rng: random.Random):
+    return rng.uniform(25.0, 49.0), rng.uniform(-124.0, -67.0)
+
+
+def build_candidates(size: int, now: datetime, rng: random.Random):
+    for _ in range(size):
+        latitude, longitude = _random_point(rng)
+        yield LostPetCandidate(
+            report_id=uuid.uuid4(),
+            pet_id=uuid.uuid4(),
+            latitude=latitude,
+            longitude=longitude,
+            report_date=now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+            species=rng.choice(SPECIES),
+            breed=rng.choice(BREEDS),
+            main_color=rng.choice(COLORS)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--radius-km", type=float, default=10.0)
+    parser.add_argument("--max-age-days", type=int, default=60)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    index = PetMatchIndex()
+
+    started = time.perf_counter()
+    index.replace_all(build_candidates(args.size, now, rng))
+    print(f"built index of {len(index)} reports in {time.perf_counter() - started:.1f}s")
+
+    timings = []
+    hits = 0
+    for _ in range(args.queries):
+        latitude, longitude = _random_point(rng)
+        started = time.perf_counter()
+        matches = index.match(latitude, longitude, now, rng.choice(SPECIES), rng.choice(BREEDS),
+                              rng.choice(COLORS), args.radius_km, args.max_age_days, limit=10)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+        hits += len(matches)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"{args.queries} matches: mean {statistics.mean(timings):.0f}us  p50 {p50:.0f}us  p99 {p99:.0f}us  "
+          f"avg candidates returned {hits / args.queries:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
+from boundaries.image_variant_boundary import ImageVariantBoundary
 
 class AvatarImageBoundary(BaseModel):
     s3_file_path: str  # The full S3 path (Primary Key)
@@ -7,6 +9,8 @@ class AvatarImageBoundary(BaseModel):
     url: str  # The S3 URL for the avatar image
     user_id: str  # The email or ID of the user
     created_at: datetime  # The timestamp when the image was created
+    display_url: Optional[str] = None  # Smallest variant that fits the requested width, else the original
+    variants: List[ImageVariantBoundary] = []  # Resized WebP copies, smallest first; empty until they are made
 
     class Config:
         from_attributes = True  # Pydantic v2 attribute for ORM compatibility
@@ -0,0 +1,15 @@
+from typing import Generic, List, TypeVar
+
+from pydantic import BaseModel
+
+from boundaries.bulk_item_error_boundary import BulkItemErrorBoundary
+
+T = TypeVar("T")
+
+
+class BulkCreateResponseBoundary(BaseModel, Generic[T]):
+    created: List[T]  # Inserted items, in request order
+    errors: List[BulkItemErrorBoundary]  # Items that were not inserted, and why
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class BulkItemErrorBoundary(BaseModel):
+    index: int  # Position of the rejected item in the request
+    detail: str
+
+    class Config:
+        from_attributes = True
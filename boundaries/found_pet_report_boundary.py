@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import Field, BaseModel
+from boundaries.pet_match_boundary import PetMatchBoundary
 from utils.location import Location  # Location will have latitude, longitude fields
 
 class FoundPetReportBoundary(BaseModel):
@@ -15,6 +16,11 @@ class FoundPetReportBoundary(BaseModel):
         description="Geo-location in the format {latitude: float, longitude: float}"
     )
     description: Optional[str] = None
+    species: Optional[str] = None
+    breed: Optional[str] = None
+    main_color: Optional[str] = None
+    version: int = 1
+    match_candidates: List[PetMatchBoundary] = Field(default_factory=list)  # Only filled in on creation
 
     class Config:
         from_attributes = True
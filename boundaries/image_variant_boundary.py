@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ImageVariantBoundary(BaseModel):
+    name: str  # e.g. "max_256": longest side of at most 256 pixels
+    url: str
+    content_type: str
+    width: int
+    height: int
+    size_bytes: int
+
+    class Config:
+        from_attributes = True  # Pydantic v2 attribute for ORM compatibility
@@ -19,6 +19,7 @@ class LostPetReportBoundary(BaseModel):
     )
     description: Optional[str] = None
     status: Optional[str] = None
+    version: int = 1
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,9 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class MarkNotificationsReadBoundary(BaseModel):
+    # Omit to mark every unread notification as read
+    notification_ids: Optional[List[UUID]] = Field(None, max_length=1000)
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class MarkNotificationsReadResponseBoundary(BaseModel):
+    marked: int  # Notifications that were unread and now are read
+    unread: int
@@ -12,6 +12,7 @@ class MedicalHistoryBoundary(BaseModel):
     treatment: Optional[str] = None
     notes: Optional[str] = None
     veterinarian_name: Optional[str] = None
+    version: int = 1
 
     class Config:
         from_attributes = True
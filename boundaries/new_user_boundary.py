@@ -3,10 +3,9 @@ import re
 from fastapi import HTTPException
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
-from zxcvbn import zxcvbn
-import phonenumbers
 
 from enums.role_enum import RoleEnum
+from utils.input_validation import normalize_phone_number
 
 
 class NewUserBoundary(BaseModel):
@@ -33,24 +32,12 @@ class NewUserBoundary(BaseModel):
 
     @field_validator('phone_number')
     def validate_phone_number(cls, v: str, info: FieldValidationInfo):
-        try:
-            phone = phonenumbers.parse(v)
-            if not phonenumbers.is_valid_number(phone):
-                raise HTTPException(status_code=400, detail='Invalid phone number format')
-            return phonenumbers.format_number(phone, phonenumbers.PhoneNumberFormat.E164)  # Return E.164 format
-        except phonenumbers.NumberParseException:
+        phone_number = normalize_phone_number(v)  # E.164 format
+        if phone_number is None:
             raise HTTPException(status_code=400, detail='Invalid phone number format')
+        return phone_number
 
-    @field_validator('password')
-    def validate_password(cls, v: str):
-        result = zxcvbn(v)
-        score = result['score']
-        if score < 3:
-            suggestions = result['feedback']['suggestions']
-            feedback_message = "Password is too weak."
-            feedback_message += " ".join(suggestions)
-            raise HTTPException(status_code=400, detail=feedback_message)
-        return v
+    # Password strength is scored off the event loop by UserService, on the password hashing pool
 
     class Config:
         from_attributes = True
@@ -0,0 +1,15 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class NotificationBoundary(BaseModel):
+    notification_id: UUID
+    user_id: UUID
+    message: str
+    date: datetime
+    status: str
+
+    class Config:
+        from_attributes = True
@@ -13,6 +13,7 @@ class PetBoundary(BaseModel):
     date_of_birth: Optional[date] = None
     main_color: Optional[str] = None
     pet_details: Optional[Dict[str, str]] = Field(default_factory=dict)
+    version: int = 1
 
     class Config:
         from_attributes = True
@@ -0,0 +1,15 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class PetMatchBoundary(BaseModel):
+    report_id: UUID  # Lost pet report that matched
+    pet_id: UUID
+    score: float
+    distance_km: float
+    report_date: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,20 +1,18 @@
 from pydantic import BaseModel, FieldValidationInfo, field_validator, Field
-import phonenumbers
 from fastapi import HTTPException
 
+from utils.input_validation import normalize_phone_number
+
 class ProviderPhoneBoundary(BaseModel):
     phone_number: str = Field(..., example="+442083661177")
 
     # Phone number validator using phonenumbers library
     @field_validator('phone_number')
     def validate_phone_number(cls, v: str, info: FieldValidationInfo):
-        try:
-            phone = phonenumbers.parse(v)
-            if not phonenumbers.is_valid_number(phone):
-                raise HTTPException(status_code=400, detail='Invalid phone number format')
-            return phonenumbers.format_number(phone, phonenumbers.PhoneNumberFormat.E164)  # Return E.164 format
-        except phonenumbers.NumberParseException:
+        phone_number = normalize_phone_number(v)  # E.164 format, cached
+        if phone_number is None:
             raise HTTPException(status_code=400, detail='Invalid phone number format')
+        return phone_number
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -14,6 +14,9 @@ class RequestedFoundPetReportBoundary(BaseModel):
         description="Geo-location in the format {latitude: float, longitude: float}"
     )
     description: Optional[str] = None
+    species: Optional[str] = Field(None, example="Dog")
+    breed: Optional[str] = None
+    main_color: Optional[str] = None
 
     class Config:
         from_attributes = True
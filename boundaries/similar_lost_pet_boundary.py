@@ -0,0 +1,15 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SimilarLostPetBoundary(BaseModel):
+    report_id: UUID  # Open lost pet report of the pet
+    pet_id: UUID
+    image_id: UUID  # The pet's photo closest to the found pet's photos
+    hamming_distance: int  # Differing bits of the 64-bit perceptual hashes; 0 is the same picture
+    distance_km: Optional[float]  # From the found report, when it has a location
+
+    class Config:
+        from_attributes = True
@@ -1,10 +1,10 @@
 import re
-import phonenumbers
 from fastapi import HTTPException
 from pydantic import BaseModel, Field, field_validator
-from zxcvbn import zxcvbn
 from typing import Optional
 
+from utils.input_validation import normalize_phone_number
+
 class UpdateUserBoundary(BaseModel):
     old_password: str
     new_password: Optional[str] = None
@@ -29,26 +29,13 @@ class UpdateUserBoundary(BaseModel):
     @field_validator('phone_number')
     def validate_phone_number(cls, v: Optional[str]):
         if v:
-            try:
-                phone = phonenumbers.parse(v)
-                if not phonenumbers.is_valid_number(phone):
-                    raise HTTPException(status_code=400, detail='Invalid phone number format')
-                return phonenumbers.format_number(phone, phonenumbers.PhoneNumberFormat.E164)
-            except phonenumbers.NumberParseException:
+            phone_number = normalize_phone_number(v)
+            if phone_number is None:
                 raise HTTPException(status_code=400, detail='Invalid phone number format')
+            return phone_number
         return v
 
-    @field_validator('new_password')
-    def validate_password(cls, v: Optional[str]):
-        if v:
-            result = zxcvbn(v)
-            score = result['score']
-            if score < 3:
-                suggestions = result['feedback']['suggestions']
-                feedback_message = "Password is too weak. "
-                feedback_message += " ".join(suggestions)
-                raise HTTPException(status_code=400, detail=feedback_message)
-        return v
+    # New password strength is scored off the event loop by UserService, on the password hashing pool
 
     class Config:
         from_attributes = True
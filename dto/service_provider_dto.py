@@ -12,6 +12,8 @@ class ServiceProviderDTO(BaseModel):
     name: str
     service_type: str
     email: str
+    membership: str
+    version: int = 1
     phones: List[ProviderPhoneBoundary]
     working_hours: List[WorkingHoursBoundary]
     locations: List[ServiceProviderLocationBoundary]  # Added locations field
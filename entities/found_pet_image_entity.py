@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, String, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -10,9 +10,11 @@ class FoundPetImageEntity(Base):
 
     image_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     report_id = Column(UUID(as_uuid=True), ForeignKey("found_pet_reports.report_id"), nullable=False)
-    file_path = Column(String, nullable=False)  # Assuming this is the file path for S3 or similar storage
+    file_path = Column(String, nullable=False, index=True)  # Assuming this is the file path for S3 or similar storage
     url = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 64-bit dHash (signed, as BIGINT is), set by the image variants job; compared with lost pet photos
+    perceptual_hash = Column(BigInteger, nullable=True)
 
     # Relationship to FoundPetReportEntity
     report = relationship("FoundPetReportEntity", back_populates="found_pet_images")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from geoalchemy2 import Geography, WKTElement
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -14,19 +14,36 @@ class FoundPetReportEntity(Base):
     report_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
     report_date = Column(DateTime, nullable=False, default=datetime.utcnow)
-    geo_location = Column(Geography(geometry_type='POINT', srid=4326), nullable=True)
+    geo_location = Column(Geography(geometry_type='POINT', srid=4326, spatial_index=False), nullable=True)
     description = Column(String, nullable=True)
+    # What the finder could tell about the pet, used to score lost pet matches
+    species = Column(String, nullable=True)
+    breed = Column(String, nullable=True)
+    main_color = Column(String, nullable=True)
+    # Incremented by every update; the optimistic concurrency token behind ETag / If-Match
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     found_pet_images = relationship("FoundPetImageEntity", back_populates="report")
     user = relationship("UserEntity", back_populates="found_pet_reports")
 
-    def __init__(self, user_id: uuid.UUID, geo_location: Location = None, description: str = None):
+    __table_args__ = (
+        # GiST index backing ST_DWithin filters and <-> nearest-neighbour ordering
+        Index('idx_found_pet_reports_geo_location', 'geo_location', postgresql_using='gist'),
+        # Backs the newest-first (report_date, report_id) keyset used by cursor pagination
+        Index('idx_found_pet_reports_report_date_id', 'report_date', 'report_id'),
+    )
+
+    def __init__(self, user_id: uuid.UUID, geo_location: Location = None, description: str = None,
+                 species: str = None, breed: str = None, main_color: str = None):
         self.user_id = user_id
         self.report_date = datetime.utcnow()
         if geo_location:
             self.geo_location = WKTElement(f'POINT({geo_location.longitude} {geo_location.latitude})', srid=4326)
         self.description = description
+        self.species = species
+        self.breed = breed
+        self.main_color = main_color
 
     def __eq__(self, other):
         return isinstance(other, FoundPetReportEntity) and self.report_id == other.report_id
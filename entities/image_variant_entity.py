@@ -0,0 +1,48 @@
+from sqlalchemy import Column, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from entities.base import Base
+import uuid
+
+
+class ImageVariantEntity(Base):
+    """
+    A resized, re-encoded copy of an uploaded image. Variants hang off the object key of the original, so pet,
+    avatar and found-pet images share the table.
+    """
+    __tablename__ = "image_variants"
+
+    variant_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source_key = Column(String, nullable=False)  # Object key of the original upload
+    name = Column(String, nullable=False)  # e.g. "max_256": longest side of at most 256 pixels
+    object_key = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # One row per variant of an original, so a rerun of the variant job inserts nothing twice; also serves the
+        # lookup of a page of images' variants by source_key
+        UniqueConstraint('source_key', 'name', name='uq_image_variants_source_name'),
+    )
+
+    def __init__(self, source_key: str, name: str, object_key: str, url: str, content_type: str, width: int,
+                 height: int, size_bytes: int):
+        self.source_key = source_key
+        self.name = name
+        self.object_key = object_key
+        self.url = url
+        self.content_type = content_type
+        self.width = width
+        self.height = height
+        self.size_bytes = size_bytes
+        self.created_at = datetime.utcnow()
+
+    def __eq__(self, other):
+        return isinstance(other, ImageVariantEntity) and self.variant_id == other.variant_id
+
+    def __str__(self):
+        return f"ImageVariantEntity(variant_id='{self.variant_id}', source_key='{self.source_key}', name='{self.name}', width={self.width}, height={self.height}, url='{self.url}')"
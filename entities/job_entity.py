@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, Enum as SQLAEnum, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from datetime import datetime, timezone
+from entities.base import Base
+from enums.job_status_enum import JobStatusEnum
+import uuid
+
+
+class JobEntity(Base):
+    """A unit of background work waiting in (or already through) one of the queues run by app.job_worker."""
+    __tablename__ = "jobs"
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    queue = Column(String, nullable=False)
+    kind = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(SQLAEnum(JobStatusEnum), nullable=False, default=JobStatusEnum.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # Earliest time a worker may (re)run the job; also pushed forward while a worker holds it
+    run_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc),
+                    server_default=func.now())
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc),
+                        server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Only pending jobs are ever polled, per queue, so the partial index stays as small as the backlog
+        Index('idx_jobs_due', 'queue', 'run_at', postgresql_where=(status == JobStatusEnum.PENDING)),
+    )
+
+    def __str__(self):
+        return f"JobEntity(job_id='{self.job_id}', queue='{self.queue}', kind='{self.kind}', status='{self.status}', attempts={self.attempts})"
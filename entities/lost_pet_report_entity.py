@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from geoalchemy2 import Geography, WKTElement
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -15,14 +15,23 @@ class LostPetReportEntity(Base):
     pet_id = Column(UUID(as_uuid=True), ForeignKey("pets.pet_id"), unique=True, nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id"), nullable=False)
     report_date = Column(DateTime, nullable=False, default=datetime.utcnow)
-    geo_location = Column(Geography(geometry_type='POINT', srid=4326), nullable=True)
+    geo_location = Column(Geography(geometry_type='POINT', srid=4326, spatial_index=False), nullable=True)
     description = Column(String, nullable=True)
     status = Column(String, nullable=False)
+    # Incremented by every update; the optimistic concurrency token behind ETag / If-Match
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     user = relationship("UserEntity", back_populates="lost_pet_reports")
     pet = relationship("PetEntity", back_populates="lost_pet_reports")
 
+    __table_args__ = (
+        # GiST index backing ST_DWithin filters and <-> nearest-neighbour ordering
+        Index('idx_lost_pet_reports_geo_location', 'geo_location', postgresql_using='gist'),
+        # Backs the newest-first (report_date, report_id) keyset used by cursor pagination
+        Index('idx_lost_pet_reports_report_date_id', 'report_date', 'report_id'),
+    )
+
     def __init__(self, pet_id: uuid.UUID, user_id: uuid.UUID, geo_location: Location = None, description: str = None, status: str = None):
         self.pet_id = pet_id
         self.user_id = user_id
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -16,6 +16,8 @@ class MedicalHistoryEntity(Base):
     treatment = Column(String, nullable=True)
     notes = Column(String, nullable=True)
     veterinarian_name = Column(String, nullable=True)
+    # Incremented by every update; the optimistic concurrency token behind ETag / If-Match
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     pet = relationship("PetEntity", back_populates="medical_histories")
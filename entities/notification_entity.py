@@ -1,8 +1,9 @@
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from entities.base import Base
+from enums.notification_status_enum import NotificationStatusEnum
 import uuid
 
 
@@ -18,6 +19,14 @@ class NotificationEntity(Base):
     # Relationships
     user = relationship("UserEntity", back_populates="notifications")
 
+    __table_args__ = (
+        # Inbox pages and unread counts: one user's notifications of a status, newest first
+        Index('idx_notifications_user_status_date', 'user_id', 'status', 'date'),
+        # The purge job only looks at read notifications by age
+        Index('idx_notifications_read_date', 'date',
+              postgresql_where=(status == NotificationStatusEnum.READ.value)),
+    )
+
     def __init__(self, user_id: uuid.UUID, message: str, status: str):
         self.user_id = user_id
         self.message = message
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, ForeignKey, JSON
+from sqlalchemy import Column, String, Date, ForeignKey, Integer, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import date
@@ -16,6 +16,8 @@ class PetEntity(Base):
     date_of_birth = Column(Date, nullable=True)
     main_color = Column(String, nullable=True)
     pet_details = Column(JSON, nullable=True)
+    # Incremented by every update; the optimistic concurrency token behind ETag / If-Match
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     user = relationship("UserEntity", back_populates="pets")
@@ -24,6 +26,9 @@ class PetEntity(Base):
     lost_pet_reports = relationship("LostPetReportEntity", back_populates="pet", cascade="all, delete-orphan", uselist=False)
     service_requests = relationship("ServiceRequestEntity", back_populates="pet", cascade="all, delete-orphan")
 
+    # Backs the (name, pet_id) keyset used by cursor pagination
+    __table_args__ = (Index('idx_pets_name_id', 'name', 'pet_id'),)
+
     def __init__(self, user_id: uuid.UUID, name: str, species: str, breed: str = None, date_of_birth: date = None,
                  main_color: str = None, pet_details: dict = None):
         # pet_id is auto-generated, no need to pass it as a parameter
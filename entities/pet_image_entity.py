@@ -1,6 +1,6 @@
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from entities.base import Base
@@ -11,9 +11,11 @@ class PetImageEntity(Base):
     # UUID primary key for the image
     image_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, index=True)
     pet_id = Column(UUID(as_uuid=True), ForeignKey("pets.pet_id"), nullable=False)
-    file_path = Column(String, nullable=False)  # Not primary key anymore
+    file_path = Column(String, nullable=False, index=True)  # Not primary key anymore; the object key of the upload
     url = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 64-bit dHash (signed, as BIGINT is), set by the image variants job; compared with found pet photos
+    perceptual_hash = Column(BigInteger, nullable=True)
 
     # Relationship to Pet
     pet = relationship("PetEntity", back_populates="pet_images")
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Enum as SQLAEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, SmallInteger, Index, Enum as SQLAEnum
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 from entities.base import Base
 from enums.membership_enum import MembershipEnum
@@ -14,6 +14,10 @@ class ServiceProviderEntity(Base):
     service_type = Column(String, nullable=False)
     email = Column(String, nullable=True)
     membership = Column(SQLAEnum(MembershipEnum), nullable=False)
+    # Weekly fifteen-minute slots the provider is open in (see utils.weekly_schedule), derived from working_hours
+    open_slots = Column(ARRAY(SmallInteger), nullable=False, default=list, server_default='{}')
+    # Incremented by every update; the optimistic concurrency token behind ETag / If-Match
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     users = relationship("UserProviderAssociationEntity", back_populates="provider", cascade="all, delete-orphan")
@@ -23,6 +27,9 @@ class ServiceProviderEntity(Base):
     locations = relationship("ServiceProviderLocationEntity", back_populates="provider", cascade="all, delete-orphan")
     images = relationship("ServiceProviderImageEntity", back_populates="provider", cascade="all, delete-orphan")
 
+    # GIN index answering "open in slot s" (@>) and "open in any of these slots" (&&) lookups
+    __table_args__ = (Index('idx_service_providers_open_slots', 'open_slots', postgresql_using='gin'),)
+
     def __eq__(self, other):
         return isinstance(other, ServiceProviderEntity) and self.provider_id == other.provider_id
 
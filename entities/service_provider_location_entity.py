@@ -1,5 +1,5 @@
 from geoalchemy2 import WKTElement
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geography
@@ -14,11 +14,18 @@ class ServiceProviderLocationEntity(Base):
     location_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     provider_id = Column(UUID(as_uuid=True), ForeignKey("service_providers.provider_id"), nullable=False)
     full_address = Column(String, nullable=False)
-    geo_location = Column(Geography(geometry_type='POINT', srid=4326), nullable=False)  # PostGIS location
+    geo_location = Column(Geography(geometry_type='POINT', srid=4326, spatial_index=False), nullable=False)  # PostGIS location
 
     # Relationship to ServiceProviderEntity
     provider = relationship("ServiceProviderEntity", back_populates="locations")
 
+    __table_args__ = (
+        # GiST index backing ST_DWithin filters and <-> nearest-neighbour ordering
+        Index('idx_service_provider_locations_geo_location', 'geo_location', postgresql_using='gist'),
+        # Backs the per-provider EXISTS / closest-location subqueries in provider searches
+        Index('idx_service_provider_locations_provider_id', 'provider_id'),
+    )
+
     def __init__(self, provider_id: uuid.UUID, full_address: str, geo_location: Location):
         self.provider_id = provider_id
         self.full_address = full_address
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"  # One JSON object per line
+    CSV = "csv"  # Nested objects such as geo_location are flattened into geo_location.latitude, ...
@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class JobKindEnum(str, Enum):
+    # Handlers are registered in app.jobs
+    NOTIFY_USERS = "notify_users"  # payload: {"notifications": [{"user_id": ..., "message": ...}, ...]}
+    CREATE_IMAGE_VARIANTS = "create_image_variants"  # payload: {"source_key": object key of the uploaded original}
+    # payload: {"table": "pet_images" or "found_pet_images", "after": image_id the previous batch ended at, or null}
+    BACKFILL_PERCEPTUAL_HASHES = "backfill_perceptual_hashes"
+    SEND_EMAIL = "send_email"  # payload: {"recipient": ..., "subject": ..., "body": ...}
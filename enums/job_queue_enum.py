@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class JobQueueEnum(str, Enum):
+    # Each queue has its own concurrency limit (JOB_QUEUE_CONCURRENCY), so a backlog in one does not starve the others
+    DEFAULT = "default"
+    NOTIFICATIONS = "notifications"
+    IMAGES = "images"
+    MAIL = "mail"
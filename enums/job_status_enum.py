@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class JobStatusEnum(str, Enum):
+    PENDING = "PENDING"  # Waiting for its first or next attempt, or being run under a lease
+    DONE = "DONE"
+    DEAD = "DEAD"  # Failed permanently or ran out of attempts; kept for inspection
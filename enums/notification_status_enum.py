@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class NotificationStatusEnum(str, Enum):
+    UNREAD = "UNREAD"
+    READ = "READ"
@@ -0,0 +1,7 @@
+class MailDeliveryError(Exception):
+    """Custom exception for emails the mail server did not accept."""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        # Permanent failures (5xx replies such as an unknown recipient) are not retried
+        self.permanent = permanent
@@ -0,0 +1,3 @@
+class PreconditionFailedError(Exception):
+    """Custom exception for a conditional write whose expected version no longer matches the stored row."""
+    pass
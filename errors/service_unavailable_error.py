@@ -0,0 +1,3 @@
+class ServiceUnavailableError(Exception):
+    """Custom exception for work rejected because the service is temporarily overloaded."""
+    pass
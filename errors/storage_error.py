@@ -0,0 +1,3 @@
+class StorageError(Exception):
+    """Custom exception for object storage failures."""
+    pass
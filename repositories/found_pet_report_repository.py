@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from uuid import UUID
@@ -12,7 +12,9 @@ class FoundPetReportRepository(ABC):
         pass
 
     @abstractmethod
-    async def update(self, report: FoundPetReportEntity, db: AsyncSession) -> FoundPetReportEntity:
+    async def update(self, report_id: UUID, values: Dict[str, Any], expected_version: Optional[int], db: AsyncSession) -> Optional[FoundPetReportEntity]:
+        """Set the columns and increment the version in one statement, only while the version equals expected_version
+        when given. Returns None if no report has that ID and version."""
         pass
 
     @abstractmethod
@@ -20,12 +22,25 @@ class FoundPetReportRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all(self, skip: int, limit: int, db: AsyncSession) -> List[FoundPetReportEntity]:
+    async def get_all(self, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[FoundPetReportEntity]:
         pass
 
     @abstractmethod
     async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                      user_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float],
-                                     radius_km: Optional[float], skip: int, limit: int,
-                                     db: AsyncSession) -> List[FoundPetReportEntity]:
+                                     radius_km: Optional[float], nearest: bool, skip: int, limit: int,
+                                     db: AsyncSession, after: Optional[Tuple] = None) -> List[FoundPetReportEntity]:
+        pass
+
+    @abstractmethod
+    async def stream_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                        user_id: Optional[UUID], longitude: Optional[float],
+                                        latitude: Optional[float], radius_km: Optional[float],
+                                        db: AsyncSession) -> AsyncIterator[FoundPetReportEntity]:
+        """Every report matching the filters, newest first, read through a server-side cursor as the caller iterates."""
+        pass
+
+    @abstractmethod
+    async def get_image_hashes(self, report_id: UUID, db: AsyncSession) -> List[int]:
+        """The unsigned perceptual hashes of the report's photos that have been hashed so far."""
         pass
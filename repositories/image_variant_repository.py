@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from typing import List, Optional, Sequence, Tuple
+from entities.image_variant_entity import ImageVariantEntity
+from utils.bulk_insert import BulkInsertResult
+
+
+class ImageVariantRepository(ABC):
+    @abstractmethod
+    async def add_all(self, variants: Sequence[ImageVariantEntity], db: AsyncSession) -> BulkInsertResult:
+        """
+        Saves the variants of an image with one multi-row insert, skipping variants that were already saved.
+        :param variants: The ImageVariantEntity objects to save.
+        :param db: Async database session.
+        :return: The saved variants, and the position and reason of each one that was skipped.
+        """
+        pass
+
+    @abstractmethod
+    async def set_perceptual_hash(self, source_key: str, perceptual_hash: int, db: AsyncSession) -> int:
+        """
+        Records the perceptual hash of an original on the pet or found-pet image rows that point at it.
+        :param source_key: Object key of the original.
+        :param perceptual_hash: The 64-bit hash as a signed integer.
+        :param db: Async database session.
+        :return: How many image rows were updated (0 for other images, such as avatars).
+        """
+        pass
+
+    @abstractmethod
+    async def get_unhashed_images(self, table: str, after: Optional[uuid.UUID], limit: int,
+                                  db: AsyncSession) -> List[Tuple[uuid.UUID, str]]:
+        """
+        Pages through the pet or found-pet image rows that have no perceptual hash yet, in image_id order.
+        :param table: "pet_images" or "found_pet_images".
+        :param after: image_id the previous page ended at, or None for the first page.
+        :param limit: Maximum number of rows.
+        :param db: Async database session.
+        :return: The image_id and object key of each row.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_source_keys(self, source_keys: Sequence[str], db: AsyncSession) -> List[ImageVariantEntity]:
+        """
+        Loads the variants of several originals in one query, e.g. for a page of images.
+        :param source_keys: Object keys of the originals.
+        :param db: Async database session.
+        :return: Their variants, smallest first.
+        """
+        pass
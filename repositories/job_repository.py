@@ -0,0 +1,58 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import uuid
+from entities.job_entity import JobEntity
+
+
+class JobRepository(ABC):
+    @abstractmethod
+    async def enqueue(self, job: JobEntity, db: AsyncSession) -> JobEntity:
+        """
+        Adds a job to its queue, in the caller's transaction.
+        :param job: The JobEntity to run.
+        :param db: Async database session.
+        :return: The queued JobEntity.
+        """
+        pass
+
+    @abstractmethod
+    async def exists(self, job_id: uuid.UUID, db: AsyncSession) -> bool:
+        """
+        Checks whether a job was ever queued under an id.
+        :param job_id: ID of the job.
+        :param db: Async database session.
+        :return: True if the job exists, whatever its status.
+        """
+        pass
+
+    @abstractmethod
+    async def claim_due(self, queue: str, limit: int, lease_until: datetime, db: AsyncSession) -> List[JobEntity]:
+        """
+        Locks up to `limit` pending jobs of a queue whose run time has come, skipping rows other workers hold,
+        and pushes their run time to `lease_until` so they are not claimed again while running.
+        :param queue: Name of the queue.
+        :param limit: Maximum number of jobs to claim.
+        :param lease_until: Time at which unfinished claimed jobs become due again.
+        :param db: Async database session.
+        :return: The claimed jobs, oldest first.
+        """
+        pass
+
+    @abstractmethod
+    async def mark_done(self, job_id: uuid.UUID, finished_at: datetime, db: AsyncSession) -> None:
+        pass
+
+    @abstractmethod
+    async def mark_attempt_failed(self, job_id: uuid.UUID, error: str, run_at: datetime, give_up: bool,
+                                  db: AsyncSession) -> None:
+        """
+        Records a failed attempt, either rescheduling the job or moving it to the dead letters.
+        :param job_id: ID of the job.
+        :param error: What the handler raised.
+        :param run_at: When to retry.
+        :param give_up: Whether to stop retrying.
+        :param db: Async database session.
+        """
+        pass
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Sequence, Tuple
 from datetime import datetime
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.lost_pet_report_entity import LostPetReportEntity
+from utils.image_similarity_index import LostPetPhoto
+from utils.pet_match_index import LostPetCandidate
 
 class LostPetReportRepository(ABC):
     @abstractmethod
@@ -11,7 +13,9 @@ class LostPetReportRepository(ABC):
         pass
 
     @abstractmethod
-    async def update(self, report: LostPetReportEntity, db: AsyncSession) -> LostPetReportEntity:
+    async def update(self, report_id: UUID, values: Dict[str, Any], expected_version: Optional[int], db: AsyncSession) -> Optional[LostPetReportEntity]:
+        """Set the columns and increment the version in one statement, only while the version equals expected_version
+        when given. Returns None if no report has that ID and version."""
         pass
 
     @abstractmethod
@@ -19,9 +23,37 @@ class LostPetReportRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all(self, skip: int, limit: int, db: AsyncSession) -> List[LostPetReportEntity]:
+    async def get_all(self, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[LostPetReportEntity]:
         pass
 
     @abstractmethod
-    async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str], user_id: Optional[UUID], pet_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float], skip: int, limit: int, db: AsyncSession) -> List[LostPetReportEntity]:
+    async def stream_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str], user_id: Optional[UUID], pet_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float], db: AsyncSession) -> AsyncIterator[LostPetReportEntity]:
+        """Every report matching the filters, newest first, read through a server-side cursor as the caller iterates."""
+        pass
+
+    @abstractmethod
+    async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str], user_id: Optional[UUID], pet_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float], nearest: bool, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[LostPetReportEntity]:
+        pass
+
+    @abstractmethod
+    def stream_open_match_candidates(self, closed_statuses: Sequence[str], batch_size: int,
+                                     db: AsyncSession) -> AsyncIterator[List[LostPetCandidate]]:
+        """
+        Stream every located lost report whose status is not closed, joined with its pet's attributes, batch_size
+        rows at a time from a server-side cursor.
+        """
+        pass
+
+    @abstractmethod
+    async def get_match_candidate(self, report_id: UUID, closed_statuses: Sequence[str], db: AsyncSession) -> Optional[LostPetCandidate]:
+        """Load a single report as a match candidate, or None if it is closed or has no location."""
+        pass
+
+    @abstractmethod
+    def stream_open_lost_pet_photos(self, closed_statuses: Sequence[str], batch_size: int,
+                                    db: AsyncSession) -> AsyncIterator[List[LostPetPhoto]]:
+        """
+        Stream every hashed photo of a pet with a located lost report whose status is not closed, batch_size rows
+        at a time from a server-side cursor, so the whole result is never held in memory at once.
+        """
         pass
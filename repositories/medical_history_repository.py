@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.medical_history_entity import MedicalHistoryEntity
-from typing import List, Optional
+from utils.bulk_insert import BulkInsertResult
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
 import uuid
 
@@ -13,11 +14,14 @@ class MedicalHistoryRepository(ABC):
         pass
 
     @abstractmethod
-    async def update(self, medical_history: MedicalHistoryEntity, db: AsyncSession) -> MedicalHistoryEntity:
+    async def update(self, record_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                     db: AsyncSession) -> Optional[MedicalHistoryEntity]:
+        """Set the columns and increment the version in one statement, only while the version equals expected_version
+        when given. Returns None if no record has that ID and version."""
         pass
 
     @abstractmethod
-    async def create_all(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> List[MedicalHistoryEntity]:
+    async def create_all(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
@@ -29,3 +33,10 @@ class MedicalHistoryRepository(ABC):
                                  diagnosis: Optional[str], veterinarian_name: Optional[str],
                                  pet_id: Optional[uuid.UUID], db: AsyncSession) -> List[MedicalHistoryEntity]:
         pass
+
+    @abstractmethod
+    async def stream_by_criteria(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                 diagnosis: Optional[str], veterinarian_name: Optional[str],
+                                 pet_id: Optional[uuid.UUID], db: AsyncSession) -> AsyncIterator[MedicalHistoryEntity]:
+        """The same records as filter_by_criteria, read through a server-side cursor as the caller iterates."""
+        pass
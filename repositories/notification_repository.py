@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
+import uuid
+from entities.notification_entity import NotificationEntity
+from utils.bulk_insert import BulkInsertResult
+
+
+class NotificationRepository(ABC):
+    @abstractmethod
+    async def add_all(self, notifications: Sequence[NotificationEntity], db: AsyncSession) -> BulkInsertResult:
+        """
+        Saves a batch of notifications with multi-row inserts.
+        :param notifications: The NotificationEntity objects to save.
+        :param db: Async database session.
+        :return: The saved notifications, and the position and reason of each one that could not be saved.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_user(self, user_id: uuid.UUID, status: Optional[str], limit: int, db: AsyncSession,
+                          after: Optional[Tuple] = None) -> List[NotificationEntity]:
+        """
+        Loads a page of a user's notifications, newest first.
+        :param user_id: Owner of the notifications.
+        :param status: Only notifications with this status, or all of them if None.
+        :param limit: Page size.
+        :param db: Async database session.
+        :param after: (date, notification_id) of the last notification of the previous page.
+        :return: The page of NotificationEntity objects.
+        """
+        pass
+
+    @abstractmethod
+    async def count_unread(self, user_id: uuid.UUID, db: AsyncSession) -> int:
+        pass
+
+    @abstractmethod
+    async def mark_read(self, user_id: uuid.UUID, notification_ids: Optional[Sequence[uuid.UUID]],
+                        db: AsyncSession) -> int:
+        """
+        Marks unread notifications of a user as read in one UPDATE.
+        :param user_id: Owner of the notifications; ids of other users' notifications are ignored.
+        :param notification_ids: The notifications to mark, or None for all of the user's unread notifications.
+        :param db: Async database session.
+        :return: How many notifications changed from unread to read.
+        """
+        pass
+
+    @abstractmethod
+    async def purge_read(self, older_than: datetime, limit: int, db: AsyncSession) -> int:
+        """
+        Deletes up to `limit` read notifications dated before `older_than`, skipping rows other purgers hold.
+        :return: How many notifications were deleted.
+        """
+        pass
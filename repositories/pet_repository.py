@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.pet_entity import PetEntity
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 
 
@@ -22,13 +22,16 @@ class PetRepository(ABC):
         pass
 
     @abstractmethod
-    async def update(self, pet: PetEntity, db: AsyncSession) -> PetEntity:
+    async def update(self, pet_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                     db: AsyncSession) -> Optional[PetEntity]:
         """
-        Updates an existing pet's information in the database.
+        Updates a pet's columns and increments its version in a single statement.
 
-        :param pet: The PetEntity object representing the pet to be updated.
+        :param pet_id: The UUID of the pet to update.
+        :param values: The column values to set.
+        :param expected_version: Only update if the stored version still equals this; None updates unconditionally.
         :param db: AsyncSession object for interacting with the database.
-        :return: The updated PetEntity.
+        :return: The updated PetEntity, or None if no pet has that ID and version.
         """
         pass
 
@@ -44,19 +47,20 @@ class PetRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all(self, skip: int, limit: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_all(self, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[PetEntity]:
         """
         Retrieves all pets from the database, with pagination.
 
         :param skip: The number of records to skip (used for pagination).
         :param limit: The number of records to retrieve (used for pagination).
         :param db: AsyncSession object for interacting with the database.
+        :param after: (name, pet_id) of the last pet of the previous page; replaces skip when given.
         :return: A list of PetEntity objects.
         """
         pass
 
     @abstractmethod
-    async def get_by_user_id(self, user_id: uuid.UUID, skip: int, limit: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_by_user_id(self, user_id: uuid.UUID, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[PetEntity]:
         """
         Retrieves all pets for a specific user from the database, with pagination.
 
@@ -64,6 +68,7 @@ class PetRepository(ABC):
         :param skip: The number of records to skip (used for pagination).
         :param limit: The number of records to retrieve (used for pagination).
         :param db: AsyncSession object for interacting with the database.
+        :param after: (name, pet_id) of the last pet of the previous page; replaces skip when given.
         :return: A list of PetEntity objects owned by the user.
         """
         pass
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
 from entities.provider_phone_entity import ProviderPhoneEntity
+from utils.bulk_insert import BulkInsertResult
 
 class ProviderPhoneRepository(ABC):
 
@@ -11,7 +12,7 @@ class ProviderPhoneRepository(ABC):
         pass
 
     @abstractmethod
-    async def add_phones_bulk(self, phones: List[ProviderPhoneEntity], db: AsyncSession) -> List[ProviderPhoneEntity]:
+    async def add_phones_bulk(self, phones: List[ProviderPhoneEntity], db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.service_provider_location_entity import ServiceProviderLocationEntity
-from typing import List
+from utils.bulk_insert import BulkInsertResult
+from typing import List, Optional
 import uuid
 
 
@@ -12,7 +13,7 @@ class ServiceProviderLocationRepository(ABC):
         pass
 
     @abstractmethod
-    async def add_locations_bulk(self, locations: List[ServiceProviderLocationEntity], db: AsyncSession) -> List[ServiceProviderLocationEntity]:
+    async def add_locations_bulk(self, locations: List[ServiceProviderLocationEntity], db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
@@ -26,3 +27,7 @@ class ServiceProviderLocationRepository(ABC):
     @abstractmethod
     async def get_all_locations(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[ServiceProviderLocationEntity]:
         pass
+
+    @abstractmethod
+    async def get_nearest_locations(self, longitude: float, latitude: float, radius_km: Optional[float], db: AsyncSession, limit: int = 10) -> List[ServiceProviderLocationEntity]:
+        pass
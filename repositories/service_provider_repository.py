@@ -1,7 +1,7 @@
 import uuid
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from entities.service_provider_entity import ServiceProviderEntity
 from entities.user_provider_association_entity import UserProviderAssociationEntity
 from entities.provider_phone_entity import ProviderPhoneEntity
@@ -36,7 +36,10 @@ class ServiceProviderRepository(ABC):
         pass
 
     @abstractmethod
-    async def update_service_provider(self, provider: ServiceProviderEntity, db: AsyncSession) -> ServiceProviderEntity:
+    async def update_service_provider(self, provider_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                                      db: AsyncSession) -> Optional[ServiceProviderEntity]:
+        """Set the columns and increment the version in one statement, only while the version equals expected_version
+        when given. Returns None if no provider has that ID and version."""
         pass
 
     @abstractmethod
@@ -57,12 +60,14 @@ class ServiceProviderRepository(ABC):
         longitude: Optional[float],
         latitude: Optional[float],
         radius_km: Optional[float],
+        nearest: bool,
         page: int,
         size: int,
-        db: AsyncSession
+        db: AsyncSession,
+        after: Optional[Tuple] = None
     ) -> List[ServiceProviderDTO]:
         pass
 
     @abstractmethod
-    async def get_open_service_providers(self, day_of_week: DayOfWeekEnum, desired_time: time, page: int, size: int, db: AsyncSession) -> List[OpenServiceProviderDTO]:
+    async def get_open_service_providers(self, day_of_week: DayOfWeekEnum, desired_time: time, page: int, size: int, db: AsyncSession, within_hours: Optional[float] = None) -> List[OpenServiceProviderDTO]:
         pass
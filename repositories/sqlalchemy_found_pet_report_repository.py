@@ -1,31 +1,37 @@
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, update
+from entities.found_pet_image_entity import FoundPetImageEntity
 from entities.found_pet_report_entity import FoundPetReportEntity
 from repositories.found_pet_report_repository import FoundPetReportRepository
-from typing import Optional, List
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
 from datetime import datetime
 from geoalchemy2 import functions as geo_funcs
+from utils.geo_query import geography_point, knn_distance
+from utils.export_stream import EXPORT_BATCH_SIZE
+from utils.insert_returning import insert_returning
+from utils.perceptual_hash import to_unsigned
 
 
 class SQLAlchemyFoundPetReportRepository(FoundPetReportRepository):
 
     async def create(self, report: FoundPetReportEntity, db: AsyncSession) -> FoundPetReportEntity:
-        db.add(report)
-        await db.flush()
-        await db.refresh(report)
-        return report
+        return await insert_returning(report, db)
 
-    async def update(self, report: FoundPetReportEntity, db: AsyncSession) -> FoundPetReportEntity:
-        # Handle geo-location update if applicable
-        if report.geo_location:
-            longitude, latitude = report.geo_location
-            report.geo_location = geo_funcs.ST_SetSRID(geo_funcs.ST_MakePoint(longitude, latitude), 4326)
-
-        await db.flush()
-        await db.refresh(report)
-        return report
+    async def update(self, report_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                     db: AsyncSession) -> Optional[FoundPetReportEntity]:
+        location = values.get("geo_location")
+        if location is not None:
+            values = {**values, "geo_location": geography_point(location.longitude, location.latitude)}
+        query = update(FoundPetReportEntity).where(FoundPetReportEntity.report_id == report_id)
+        if expected_version is not None:
+            query = query.where(FoundPetReportEntity.version == expected_version)
+        # One round trip: the version check, the write and reading back the new row
+        result = await db.execute(
+            query.values(**values, version=FoundPetReportEntity.version + 1).returning(FoundPetReportEntity)
+        )
+        return result.scalar_one_or_none()
 
     async def get_by_id(self, report_id: uuid.UUID, db: AsyncSession) -> Optional[FoundPetReportEntity]:
         result = await db.execute(
@@ -33,17 +39,38 @@ class SQLAlchemyFoundPetReportRepository(FoundPetReportRepository):
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int, limit: int, db: AsyncSession) -> List[FoundPetReportEntity]:
-        result = await db.execute(
-            select(FoundPetReportEntity).order_by(FoundPetReportEntity.report_date.desc())
-            .offset(skip).limit(limit)
-        )
+    async def get_all(self, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[FoundPetReportEntity]:
+        result = await db.execute(self._paginate(select(FoundPetReportEntity), skip, limit, after))
         return result.scalars().all()
 
     async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                      user_id: Optional[uuid.UUID], longitude: Optional[float], latitude: Optional[float],
-                                     radius_km: Optional[float], skip: int, limit: int, db: AsyncSession) -> List[
-        FoundPetReportEntity]:
+                                     radius_km: Optional[float], nearest: bool, skip: int, limit: int,
+                                     db: AsyncSession, after: Optional[Tuple] = None) -> List[FoundPetReportEntity]:
+        query = self._filter_query(start_date, end_date, user_id, longitude, latitude, radius_km)
+        if longitude is not None and latitude is not None:
+            point = geography_point(longitude, latitude)
+            if nearest:
+                # Closest-first via a GiST index walk
+                query = query.order_by(knn_distance(FoundPetReportEntity.geo_location, point))
+            elif radius_km is not None:
+                query = query.order_by(geo_funcs.ST_Distance(FoundPetReportEntity.geo_location, point))
+
+        result = await db.execute(self._paginate(query, skip, limit, after))
+        return result.scalars().all()
+
+    async def stream_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                        user_id: Optional[uuid.UUID], longitude: Optional[float],
+                                        latitude: Optional[float], radius_km: Optional[float],
+                                        db: AsyncSession) -> AsyncIterator[FoundPetReportEntity]:
+        query = self._filter_query(start_date, end_date, user_id, longitude, latitude, radius_km)
+        query = query.order_by(FoundPetReportEntity.report_date.desc(), FoundPetReportEntity.report_id.desc())
+        # Server-side cursor: rows arrive EXPORT_BATCH_SIZE at a time instead of all at once
+        return await db.stream_scalars(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    @staticmethod
+    def _filter_query(start_date: Optional[datetime], end_date: Optional[datetime], user_id: Optional[uuid.UUID],
+                      longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float]):
         query = select(FoundPetReportEntity)
 
         # Date range filtering
@@ -60,9 +87,22 @@ class SQLAlchemyFoundPetReportRepository(FoundPetReportRepository):
 
         # Geo-location filtering
         if longitude is not None and latitude is not None and radius_km is not None:
-            point = geo_funcs.ST_SetSRID(geo_funcs.ST_MakePoint(longitude, latitude), 4326)
+            point = geography_point(longitude, latitude)
             query = query.where(geo_funcs.ST_DWithin(FoundPetReportEntity.geo_location, point, radius_km * 1000))
-            query = query.order_by(geo_funcs.ST_Distance(FoundPetReportEntity.geo_location, point))
+        return query
 
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all()
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after: Optional[Tuple]):
+        # Newest first; report_id breaks ties so every report has a unique position for keyset pagination
+        query = query.order_by(FoundPetReportEntity.report_date.desc(), FoundPetReportEntity.report_id.desc())
+        if after is not None:
+            return query.where(tuple_(FoundPetReportEntity.report_date, FoundPetReportEntity.report_id) < tuple_(*after)).limit(limit)
+        return query.offset(skip).limit(limit)
+
+    async def get_image_hashes(self, report_id: uuid.UUID, db: AsyncSession) -> List[int]:
+        result = await db.execute(
+            select(FoundPetImageEntity.perceptual_hash)
+            .where(FoundPetImageEntity.report_id == report_id)
+            .where(FoundPetImageEntity.perceptual_hash.isnot(None))
+        )
+        return [to_unsigned(value) for value in result.scalars().all()]
@@ -0,0 +1,49 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from typing import List, Optional, Sequence, Tuple
+from entities.found_pet_image_entity import FoundPetImageEntity
+from entities.image_variant_entity import ImageVariantEntity
+from entities.pet_image_entity import PetImageEntity
+from repositories.image_variant_repository import ImageVariantRepository
+from utils.bulk_insert import BulkInsertResult, bulk_insert
+
+
+_HASHED_IMAGE_ENTITIES = {entity.__tablename__: entity for entity in (PetImageEntity, FoundPetImageEntity)}
+
+
+class SQLAlchemyImageVariantRepository(ImageVariantRepository):
+
+    async def add_all(self, variants: Sequence[ImageVariantEntity], db: AsyncSession) -> BulkInsertResult:
+        return await bulk_insert(variants, db, conflict_constraint="uq_image_variants_source_name",
+                                 conflict_detail="Already saved.")  # Commit handled by the caller
+
+    async def set_perceptual_hash(self, source_key: str, perceptual_hash: int, db: AsyncSession) -> int:
+        updated = 0
+        for entity in (PetImageEntity, FoundPetImageEntity):
+            result = await db.execute(
+                update(entity).where(entity.file_path == source_key).values(perceptual_hash=perceptual_hash)
+            )
+            updated += result.rowcount
+        return updated  # Commit handled by the caller
+
+    async def get_unhashed_images(self, table: str, after: Optional[uuid.UUID], limit: int,
+                                  db: AsyncSession) -> List[Tuple[uuid.UUID, str]]:
+        entity = _HASHED_IMAGE_ENTITIES[table]
+        # Keyset pagination on the primary key, so every page is an index range scan however far the backfill is
+        query = select(entity.image_id, entity.file_path).where(entity.perceptual_hash.is_(None))
+        if after is not None:
+            query = query.where(entity.image_id > after)
+        result = await db.execute(query.order_by(entity.image_id).limit(limit))
+        return [(image_id, file_path) for image_id, file_path in result]
+
+    async def get_by_source_keys(self, source_keys: Sequence[str], db: AsyncSession) -> List[ImageVariantEntity]:
+        if not source_keys:
+            return []
+        # Served by the (source_key, name) unique index
+        result = await db.execute(
+            select(ImageVariantEntity)
+            .where(ImageVariantEntity.source_key.in_(source_keys))
+            .order_by(ImageVariantEntity.source_key, ImageVariantEntity.width)
+        )
+        return result.scalars().all()
@@ -0,0 +1,60 @@
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import uuid
+from entities.job_entity import JobEntity
+from enums.job_status_enum import JobStatusEnum
+from repositories.job_repository import JobRepository
+from utils.insert_returning import insert_returning
+
+
+class SQLAlchemyJobRepository(JobRepository):
+
+    async def enqueue(self, job: JobEntity, db: AsyncSession) -> JobEntity:
+        return await insert_returning(job, db)  # Commit handled by the caller, together with the work that queued it
+
+    async def exists(self, job_id: uuid.UUID, db: AsyncSession) -> bool:
+        result = await db.execute(select(JobEntity.job_id).where(JobEntity.job_id == job_id))
+        return result.scalar_one_or_none() is not None
+
+    async def claim_due(self, queue: str, limit: int, lease_until: datetime, db: AsyncSession) -> List[JobEntity]:
+        due = (
+            select(JobEntity.job_id)
+            .where(JobEntity.status == JobStatusEnum.PENDING)
+            .where(JobEntity.queue == queue)
+            .where(JobEntity.run_at <= func.now())
+            .order_by(JobEntity.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(JobEntity)
+            .where(JobEntity.job_id.in_(due.scalar_subquery()))
+            .values(run_at=lease_until)
+            .returning(JobEntity)
+            .execution_options(synchronize_session=False)
+        )
+        return sorted(result.scalars().all(), key=lambda job: job.created_at)
+
+    async def mark_done(self, job_id: uuid.UUID, finished_at: datetime, db: AsyncSession) -> None:
+        await db.execute(
+            update(JobEntity)
+            .where(JobEntity.job_id == job_id)
+            .values(status=JobStatusEnum.DONE, finished_at=finished_at, attempts=JobEntity.attempts + 1,
+                    last_error=None)
+        )
+
+    async def mark_attempt_failed(self, job_id: uuid.UUID, error: str, run_at: datetime, give_up: bool,
+                                  db: AsyncSession) -> None:
+        await db.execute(
+            update(JobEntity)
+            .where(JobEntity.job_id == job_id)
+            .values(
+                status=JobStatusEnum.DEAD if give_up else JobStatusEnum.PENDING,
+                attempts=JobEntity.attempts + 1,
+                run_at=run_at,
+                last_error=error[:1000],
+                finished_at=func.now() if give_up else None
+            )
+        )
@@ -1,44 +1,78 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select
+from sqlalchemy import cast, func, select, tuple_, update
+from geoalchemy2 import Geometry
 from entities.lost_pet_report_entity import LostPetReportEntity
+from entities.pet_entity import PetEntity
+from entities.pet_image_entity import PetImageEntity
 from repositories.lost_pet_report_repository import LostPetReportRepository
-from typing import Optional, List
+from utils.geo_query import geography_point, knn_distance
+from utils.image_similarity_index import LostPetPhoto
+from utils.pet_match_index import LostPetCandidate
+from utils.perceptual_hash import to_unsigned
+from typing import Any, AsyncIterator, Dict, Optional, List, Sequence, Tuple
 from datetime import datetime
 import uuid
+from utils.export_stream import EXPORT_BATCH_SIZE
+from utils.insert_returning import insert_returning
 
 
 class SQLAlchemyLostPetReportRepository(LostPetReportRepository):
 
     async def create(self, report: LostPetReportEntity, db: AsyncSession) -> LostPetReportEntity:
-        db.add(report)
-        await db.flush()
-        await db.refresh(report)
-        return report
-
-    async def update(self, report: LostPetReportEntity, db: AsyncSession) -> LostPetReportEntity:
-        if report.geo_location:
-            longitude, latitude = report.geo_location
-            geo_point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
-            report.geo_location = geo_point
-        await db.flush()
-        await db.refresh(report)
-        return report
+        return await insert_returning(report, db)
+
+    async def update(self, report_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                     db: AsyncSession) -> Optional[LostPetReportEntity]:
+        location = values.get("geo_location")
+        if location is not None:
+            values = {**values, "geo_location": geography_point(location.longitude, location.latitude)}
+        query = update(LostPetReportEntity).where(LostPetReportEntity.report_id == report_id)
+        if expected_version is not None:
+            query = query.where(LostPetReportEntity.version == expected_version)
+        # One round trip: the version check, the write and reading back the new row
+        result = await db.execute(
+            query.values(**values, version=LostPetReportEntity.version + 1).returning(LostPetReportEntity)
+        )
+        return result.scalar_one_or_none()
 
     async def get_by_id(self, report_id: uuid.UUID, db: AsyncSession) -> Optional[LostPetReportEntity]:
         result = await db.execute(select(LostPetReportEntity).filter_by(report_id=report_id))
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int, limit: int, db: AsyncSession) -> List[LostPetReportEntity]:
-        result = await db.execute(
-            select(LostPetReportEntity).order_by(LostPetReportEntity.report_date.desc())
-            .offset(skip).limit(limit)
-        )
+    async def get_all(self, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[LostPetReportEntity]:
+        result = await db.execute(self._paginate(select(LostPetReportEntity), skip, limit, after))
         return result.scalars().all()
 
     async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                      status: Optional[str], user_id: Optional[uuid.UUID], pet_id: Optional[uuid.UUID],
                                      longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float],
-                                     skip: int, limit: int, db: AsyncSession) -> List[LostPetReportEntity]:
+                                     nearest: bool, skip: int, limit: int, db: AsyncSession,
+                                     after: Optional[Tuple] = None) -> List[LostPetReportEntity]:
+        query = self._filter_query(start_date, end_date, status, user_id, pet_id, longitude, latitude, radius_km)
+        if longitude is not None and latitude is not None:
+            point = geography_point(longitude, latitude)
+            if nearest:
+                # Closest-first via a GiST index walk
+                query = query.order_by(knn_distance(LostPetReportEntity.geo_location, point))
+            elif radius_km is not None:
+                query = query.order_by(func.ST_Distance(LostPetReportEntity.geo_location, point))
+
+        result = await db.execute(self._paginate(query, skip, limit, after))
+        return result.scalars().all()
+
+    async def stream_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                        status: Optional[str], user_id: Optional[uuid.UUID], pet_id: Optional[uuid.UUID],
+                                        longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float],
+                                        db: AsyncSession) -> AsyncIterator[LostPetReportEntity]:
+        query = self._filter_query(start_date, end_date, status, user_id, pet_id, longitude, latitude, radius_km)
+        query = query.order_by(LostPetReportEntity.report_date.desc(), LostPetReportEntity.report_id.desc())
+        # Server-side cursor: rows arrive EXPORT_BATCH_SIZE at a time instead of all at once
+        return await db.stream_scalars(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    @staticmethod
+    def _filter_query(start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str],
+                      user_id: Optional[uuid.UUID], pet_id: Optional[uuid.UUID], longitude: Optional[float],
+                      latitude: Optional[float], radius_km: Optional[float]):
         query = select(LostPetReportEntity)
 
         # Apply filters
@@ -59,9 +93,70 @@ class SQLAlchemyLostPetReportRepository(LostPetReportRepository):
             query = query.where(LostPetReportEntity.pet_id == pet_id)
 
         if longitude is not None and latitude is not None and radius_km is not None:
-            point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+            point = geography_point(longitude, latitude)
             query = query.where(func.ST_DWithin(LostPetReportEntity.geo_location, point, radius_km * 1000))
-            query = query.order_by(func.ST_Distance(LostPetReportEntity.geo_location, point))
+        return query
 
-        result = await db.execute(query.offset(skip).limit(limit))
-        return result.scalars().all()
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after: Optional[Tuple]):
+        # Newest first; report_id breaks ties so every report has a unique position for keyset pagination
+        query = query.order_by(LostPetReportEntity.report_date.desc(), LostPetReportEntity.report_id.desc())
+        if after is not None:
+            return query.where(tuple_(LostPetReportEntity.report_date, LostPetReportEntity.report_id) < tuple_(*after)).limit(limit)
+        return query.offset(skip).limit(limit)
+
+    def _match_candidate_query(self, closed_statuses: Sequence[str]):
+        geometry = cast(LostPetReportEntity.geo_location, Geometry)
+        return (
+            select(
+                LostPetReportEntity.report_id,
+                LostPetReportEntity.pet_id,
+                func.ST_Y(geometry),
+                func.ST_X(geometry),
+                LostPetReportEntity.report_date,
+                PetEntity.species,
+                PetEntity.breed,
+                PetEntity.main_color,
+                LostPetReportEntity.user_id
+            )
+            .join(PetEntity, PetEntity.pet_id == LostPetReportEntity.pet_id)
+            .where(LostPetReportEntity.geo_location.isnot(None))
+            .where(func.lower(LostPetReportEntity.status).notin_(closed_statuses))
+        )
+
+    async def stream_open_match_candidates(self, closed_statuses: Sequence[str], batch_size: int,
+                                           db: AsyncSession) -> AsyncIterator[List[LostPetCandidate]]:
+        result = await db.stream(self._match_candidate_query(closed_statuses).execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield [LostPetCandidate(*row) for row in rows]
+
+    async def get_match_candidate(self, report_id: uuid.UUID, closed_statuses: Sequence[str],
+                                  db: AsyncSession) -> Optional[LostPetCandidate]:
+        result = await db.execute(
+            self._match_candidate_query(closed_statuses).where(LostPetReportEntity.report_id == report_id)
+        )
+        row = result.one_or_none()
+        return LostPetCandidate(*row) if row else None
+
+    async def stream_open_lost_pet_photos(self, closed_statuses: Sequence[str], batch_size: int,
+                                          db: AsyncSession) -> AsyncIterator[List[LostPetPhoto]]:
+        geometry = cast(LostPetReportEntity.geo_location, Geometry)
+        result = await db.stream(
+            select(
+                PetImageEntity.image_id,
+                PetImageEntity.pet_id,
+                LostPetReportEntity.report_id,
+                func.ST_Y(geometry),
+                func.ST_X(geometry),
+                PetImageEntity.perceptual_hash,
+                LostPetReportEntity.user_id
+            )
+            .join(LostPetReportEntity, LostPetReportEntity.pet_id == PetImageEntity.pet_id)
+            .where(PetImageEntity.perceptual_hash.isnot(None))
+            .where(LostPetReportEntity.geo_location.isnot(None))
+            .where(func.lower(LostPetReportEntity.status).notin_(closed_statuses))
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield [LostPetPhoto(image_id, pet_id, report_id, latitude, longitude, to_unsigned(perceptual_hash), user_id)
+                   for image_id, pet_id, report_id, latitude, longitude, perceptual_hash, user_id in rows]
@@ -3,27 +3,31 @@ import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.medical_history_entity import MedicalHistoryEntity
 from repositories.medical_history_repository import MedicalHistoryRepository
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime
-from sqlalchemy import select, nullslast
+from sqlalchemy import select, nullslast, update
+from utils.insert_returning import insert_returning
+from utils.bulk_insert import BulkInsertResult, bulk_insert
+from utils.export_stream import EXPORT_BATCH_SIZE
 
 
 class SQLAlchemyMedicalHistoryRepository(MedicalHistoryRepository):
     async def create(self, medical_history: MedicalHistoryEntity, db: AsyncSession) -> MedicalHistoryEntity:
-        db.add(medical_history)
-        await db.flush()  # No commit here, handled by the service
-        await db.refresh(medical_history)
-        return medical_history
+        return await insert_returning(medical_history, db)
 
-    async def update(self, medical_history: MedicalHistoryEntity, db: AsyncSession) -> MedicalHistoryEntity:
-        await db.flush()  # No commit here, handled by the service
-        await db.refresh(medical_history)
-        return medical_history
+    async def update(self, record_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                     db: AsyncSession) -> Optional[MedicalHistoryEntity]:
+        query = update(MedicalHistoryEntity).where(MedicalHistoryEntity.record_id == record_id)
+        if expected_version is not None:
+            query = query.where(MedicalHistoryEntity.version == expected_version)
+        # One round trip: the version check, the write and reading back the new row; no commit here
+        result = await db.execute(
+            query.values(**values, version=MedicalHistoryEntity.version + 1).returning(MedicalHistoryEntity)
+        )
+        return result.scalar_one_or_none()
 
-    async def create_all(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> List[MedicalHistoryEntity]:
-        db.add_all(medical_histories)
-        await db.flush()  # No commit here, handled by the service
-        return medical_histories
+    async def create_all(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> BulkInsertResult:
+        return await bulk_insert(medical_histories, db)  # No commit here, handled by the service
 
     async def get_by_id(self, record_id: uuid.UUID, db: AsyncSession) -> Optional[MedicalHistoryEntity]:
         result = await db.execute(
@@ -34,6 +38,19 @@ class SQLAlchemyMedicalHistoryRepository(MedicalHistoryRepository):
     async def filter_by_criteria(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                  diagnosis: Optional[str], veterinarian_name: Optional[str],
                                  pet_id: Optional[uuid.UUID], db: AsyncSession) -> List[MedicalHistoryEntity]:
+        result = await db.execute(self._criteria_query(start_date, end_date, diagnosis, veterinarian_name, pet_id))
+        return result.scalars().all()
+
+    async def stream_by_criteria(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                 diagnosis: Optional[str], veterinarian_name: Optional[str],
+                                 pet_id: Optional[uuid.UUID], db: AsyncSession) -> AsyncIterator[MedicalHistoryEntity]:
+        # Server-side cursor: rows arrive EXPORT_BATCH_SIZE at a time instead of all at once
+        query = self._criteria_query(start_date, end_date, diagnosis, veterinarian_name, pet_id)
+        return await db.stream_scalars(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    @staticmethod
+    def _criteria_query(start_date: Optional[datetime], end_date: Optional[datetime], diagnosis: Optional[str],
+                        veterinarian_name: Optional[str], pet_id: Optional[uuid.UUID]):
         query = select(MedicalHistoryEntity)
 
         # Date range filtering
@@ -61,6 +78,4 @@ class SQLAlchemyMedicalHistoryRepository(MedicalHistoryRepository):
             nullslast(MedicalHistoryEntity.diagnosis.asc()),
             nullslast(MedicalHistoryEntity.veterinarian_name.asc())
         )
-
-        result = await db.execute(query)
-        return result.scalars().all()
+        return query
@@ -0,0 +1,68 @@
+from datetime import datetime
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
+import uuid
+from entities.notification_entity import NotificationEntity
+from enums.notification_status_enum import NotificationStatusEnum
+from repositories.notification_repository import NotificationRepository
+from utils.bulk_insert import BulkInsertResult, bulk_insert
+
+
+class SQLAlchemyNotificationRepository(NotificationRepository):
+
+    async def add_all(self, notifications: Sequence[NotificationEntity], db: AsyncSession) -> BulkInsertResult:
+        # A notification for a user deleted in the meantime is reported instead of failing the batch, and one that
+        # was already saved (a job running again) is skipped
+        return await bulk_insert(notifications, db, conflict_constraint="notifications_pkey",
+                                 conflict_detail="Already saved.")  # Commit handled by the caller
+
+    async def get_by_user(self, user_id: uuid.UUID, status: Optional[str], limit: int, db: AsyncSession,
+                          after: Optional[Tuple] = None) -> List[NotificationEntity]:
+        query = select(NotificationEntity).where(NotificationEntity.user_id == user_id)
+        if status is not None:
+            query = query.where(NotificationEntity.status == status)
+        if after is not None:
+            query = query.where(tuple_(NotificationEntity.date, NotificationEntity.notification_id) < tuple_(*after))
+        query = query.order_by(NotificationEntity.date.desc(), NotificationEntity.notification_id.desc()).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def count_unread(self, user_id: uuid.UUID, db: AsyncSession) -> int:
+        # Index-only over (user_id, status, date)
+        result = await db.execute(
+            select(func.count())
+            .select_from(NotificationEntity)
+            .where(NotificationEntity.user_id == user_id)
+            .where(NotificationEntity.status == NotificationStatusEnum.UNREAD.value)
+        )
+        return result.scalar_one()
+
+    async def mark_read(self, user_id: uuid.UUID, notification_ids: Optional[Sequence[uuid.UUID]],
+                        db: AsyncSession) -> int:
+        statement = (
+            update(NotificationEntity)
+            .where(NotificationEntity.user_id == user_id)
+            .where(NotificationEntity.status == NotificationStatusEnum.UNREAD.value)
+            .values(status=NotificationStatusEnum.READ.value)
+            .execution_options(synchronize_session=False)
+        )
+        if notification_ids is not None:
+            statement = statement.where(NotificationEntity.notification_id.in_(notification_ids))
+        result = await db.execute(statement)
+        return result.rowcount  # Commit handled in the service
+
+    async def purge_read(self, older_than: datetime, limit: int, db: AsyncSession) -> int:
+        expired = (
+            select(NotificationEntity.notification_id)
+            .where(NotificationEntity.status == NotificationStatusEnum.READ.value)
+            .where(NotificationEntity.date < older_than)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            delete(NotificationEntity)
+            .where(NotificationEntity.notification_id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount  # Commit handled by the caller
@@ -3,22 +3,24 @@ import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.pet_entity import PetEntity
 from repositories.pet_repository import PetRepository
-from typing import List, Type
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional, Tuple, Type
+from sqlalchemy import select, tuple_, update
+from utils.insert_returning import insert_returning
 
 
 class SQLAlchemyPetRepository(PetRepository):
 
     async def create(self, pet: PetEntity, db: AsyncSession) -> PetEntity:
-        db.add(pet)
-        await db.flush()
-        await db.refresh(pet)
-        return pet
-
-    async def update(self, pet: PetEntity, db: AsyncSession) -> PetEntity:
-        await db.flush()
-        await db.refresh(pet)
-        return pet
+        return await insert_returning(pet, db)
+
+    async def update(self, pet_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                     db: AsyncSession) -> Optional[PetEntity]:
+        query = update(PetEntity).where(PetEntity.pet_id == pet_id)
+        if expected_version is not None:
+            query = query.where(PetEntity.version == expected_version)
+        # One round trip: the version check, the write and reading back the new row
+        result = await db.execute(query.values(**values, version=PetEntity.version + 1).returning(PetEntity))
+        return result.scalar_one_or_none()
 
     async def get_by_pet_id(self, pet_id: uuid.UUID, db: AsyncSession) -> PetEntity | None:
         result = await db.execute(
@@ -26,14 +28,20 @@ class SQLAlchemyPetRepository(PetRepository):
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int, limit: int, db: AsyncSession) -> List[PetEntity]:
-        result = await db.execute(
-            select(PetEntity).order_by(PetEntity.name).offset(skip).limit(limit)
-        )
+    async def get_all(self, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[PetEntity]:
+        result = await db.execute(self._paginate(select(PetEntity), skip, limit, after))
         return result.scalars().all()
 
-    async def get_by_user_id(self, user_id: uuid.UUID, skip: int, limit: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_by_user_id(self, user_id: uuid.UUID, skip: int, limit: int, db: AsyncSession, after: Optional[Tuple] = None) -> List[PetEntity]:
         result = await db.execute(
-            select(PetEntity).where(PetEntity.user_id == user_id).order_by(PetEntity.name).offset(skip).limit(limit)
+            self._paginate(select(PetEntity).where(PetEntity.user_id == user_id), skip, limit, after)
         )
         return result.scalars().all()
+
+    @staticmethod
+    def _paginate(query, skip: int, limit: int, after: Optional[Tuple]):
+        query = query.order_by(PetEntity.name, PetEntity.pet_id)
+        if after is not None:
+            # Keyset pagination: seek past the last (name, pet_id) instead of scanning skipped rows
+            return query.where(tuple_(PetEntity.name, PetEntity.pet_id) > tuple_(*after)).limit(limit)
+        return query.offset(skip).limit(limit)
@@ -5,19 +5,17 @@ from typing import List
 from entities.provider_phone_entity import ProviderPhoneEntity
 from repositories.provider_phone_repository import ProviderPhoneRepository
 import uuid
+from utils.insert_returning import insert_returning
+from utils.bulk_insert import BulkInsertResult, bulk_insert
 
 class SQLAlchemyProviderPhoneRepository(ProviderPhoneRepository):
 
     async def add_phone(self, phone: ProviderPhoneEntity, db: AsyncSession) -> ProviderPhoneEntity:
-        db.add(phone)
-        await db.flush()  # Await the flush operation
-        await db.refresh(phone)  # Await the refresh to get the latest data
-        return phone
+        return await insert_returning(phone, db)
 
-    async def add_phones_bulk(self, phones: List[ProviderPhoneEntity], db: AsyncSession) -> List[ProviderPhoneEntity]:
-        db.add_all(phones)
-        await db.flush()  # Await the flush operation
-        return phones
+    async def add_phones_bulk(self, phones: List[ProviderPhoneEntity], db: AsyncSession) -> BulkInsertResult:
+        return await bulk_insert(phones, db, conflict_constraint="uq_provider_phone_number",
+                                 conflict_detail="Phone number already exists for the provider.")
 
     async def remove_phone(self, phone_id: uuid.UUID, db: AsyncSession) -> None:
         phone = await db.get(ProviderPhoneEntity, phone_id)
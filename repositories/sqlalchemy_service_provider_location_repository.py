@@ -1,24 +1,23 @@
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
 from sqlalchemy.future import select
-from typing import List
+from typing import List, Optional
 from entities.service_provider_location_entity import ServiceProviderLocationEntity
 from repositories.service_provider_location_repository import ServiceProviderLocationRepository
+from utils.geo_query import geography_point, knn_distance
+from utils.insert_returning import insert_returning
+from utils.bulk_insert import BulkInsertResult, bulk_insert
 
 
 class SQLAlchemyServiceProviderLocationRepository(ServiceProviderLocationRepository):
 
     async def add_location(self, location: ServiceProviderLocationEntity, db: AsyncSession) -> ServiceProviderLocationEntity:
-        db.add(location)
-        await db.flush()  # Save the location to the database
-        await db.refresh(location)  # Refresh to get the latest data from the database
-        return location
+        return await insert_returning(location, db)
 
-    async def add_locations_bulk(self, locations: List[ServiceProviderLocationEntity], db: AsyncSession) -> List[ServiceProviderLocationEntity]:
-        db.add_all(locations)
-        await db.flush()  # Save the bulk locations to the database
-        return locations
+    async def add_locations_bulk(self, locations: List[ServiceProviderLocationEntity], db: AsyncSession) -> BulkInsertResult:
+        return await bulk_insert(locations, db)
 
     async def remove_location(self, location_id: uuid.UUID, db: AsyncSession) -> None:
         location = await db.get(ServiceProviderLocationEntity, location_id)
@@ -42,3 +41,13 @@ class SQLAlchemyServiceProviderLocationRepository(ServiceProviderLocationReposit
                                                     .limit(limit)
         result = await db.execute(stmt)
         return result.scalars().all()
+
+    async def get_nearest_locations(self, longitude: float, latitude: float, radius_km: Optional[float], db: AsyncSession, limit: int = 10) -> List[ServiceProviderLocationEntity]:
+        point = geography_point(longitude, latitude)
+        stmt = select(ServiceProviderLocationEntity)
+        if radius_km is not None:
+            stmt = stmt.where(func.ST_DWithin(ServiceProviderLocationEntity.geo_location, point, radius_km * 1000))
+        # ORDER BY <-> LIMIT n is answered by walking the GiST index closest-first
+        stmt = stmt.order_by(knn_distance(ServiceProviderLocationEntity.geo_location, point)).limit(limit)
+        result = await db.execute(stmt)
+        return result.scalars().all()
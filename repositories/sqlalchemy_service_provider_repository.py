@@ -1,7 +1,7 @@
 from datetime import time
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select, and_
+from sqlalchemy import func, select, case, tuple_, update
 from entities.service_provider_entity import ServiceProviderEntity
 from entities.service_provider_location_entity import ServiceProviderLocationEntity
 from entities.working_hours_entity import WorkingHoursEntity
@@ -10,23 +10,32 @@ from entities.user_provider_association_entity import UserProviderAssociationEnt
 from enums.day_of_week_enum import DayOfWeekEnum
 from dto.service_provider_dto import ServiceProviderDTO
 from dto.open_service_provider_dto import OpenServiceProviderDTO
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 from enums.membership_enum import MembershipEnum
 from repositories.service_provider_repository import ServiceProviderRepository
+from utils.geo_query import geography_point, knn_distance
 from utils.location import Location
+from utils.weekly_schedule import slot_at, slots_within
 from geoalchemy2.elements import WKBElement
 from shapely import wkb
 from sqlalchemy.orm import selectinload
 import uuid
+from utils.insert_returning import insert_returning
+
+# Locations scanned per requested provider in nearest mode before widening the scan (providers with several
+# locations, or filtered out, use up more of it)
+_NEAREST_SCAN_FACTOR = 4
+
+
+def _membership_rank():
+    """SQL expression for MembershipEnum.rank, so membership ordering happens before LIMIT rather than after it."""
+    return case(*[(ServiceProviderEntity.membership == membership, membership.rank) for membership in MembershipEnum])
 
 
 class SQLAlchemyServiceProviderRepository(ServiceProviderRepository):
     async def save_service_provider(self, service_provider: ServiceProviderEntity, db: AsyncSession) -> ServiceProviderEntity:
-        db.add(service_provider)
-        await db.flush()
-        await db.refresh(service_provider)
-        return service_provider
+        return await insert_returning(service_provider, db)
 
     async def add_users(self, users: List[UserProviderAssociationEntity], db: AsyncSession) -> None:
         db.add_all(users)
@@ -44,10 +53,16 @@ class SQLAlchemyServiceProviderRepository(ServiceProviderRepository):
         db.add_all(locations)
         await db.flush()
 
-    async def update_service_provider(self, provider: ServiceProviderEntity, db: AsyncSession) -> ServiceProviderEntity:
-        await db.flush()
-        await db.refresh(provider)
-        return provider
+    async def update_service_provider(self, provider_id: uuid.UUID, values: Dict[str, Any], expected_version: Optional[int],
+                                      db: AsyncSession) -> Optional[ServiceProviderEntity]:
+        query = update(ServiceProviderEntity).where(ServiceProviderEntity.provider_id == provider_id)
+        if expected_version is not None:
+            query = query.where(ServiceProviderEntity.version == expected_version)
+        # One round trip: the version check, the write and reading back the new row
+        result = await db.execute(
+            query.values(**values, version=ServiceProviderEntity.version + 1).returning(ServiceProviderEntity)
+        )
+        return result.scalar_one_or_none()
 
     async def get_by_id(self, provider_id: uuid.UUID, db: AsyncSession) -> Optional[ServiceProviderEntity]:
         result = await db.execute(
@@ -59,100 +74,143 @@ class SQLAlchemyServiceProviderRepository(ServiceProviderRepository):
             self, provider_id: Optional[uuid.UUID], user_id: Optional[uuid.UUID], service_type: Optional[str],
             name: Optional[str], phone_number: Optional[str], day_of_week: Optional[DayOfWeekEnum],
             desired_time: Optional[time], membership: Optional[str], longitude: Optional[float],
-            latitude: Optional[float], radius_km: Optional[float], page: int, size: int, db: AsyncSession
+            latitude: Optional[float], radius_km: Optional[float], nearest: bool, page: int, size: int, db: AsyncSession,
+            after: Optional[Tuple] = None
     ) -> List[ServiceProviderDTO]:
 
-        # Build the query with filters
-        query = select(ServiceProviderEntity).options(
-            selectinload(ServiceProviderEntity.users),
-            selectinload(ServiceProviderEntity.phones),
-            selectinload(ServiceProviderEntity.working_hours),
-            selectinload(ServiceProviderEntity.locations)
-        )
-
-        # Filters
+        # One row per provider: child-table filters are EXISTS subqueries rather than joins,
+        # so LIMIT/OFFSET count providers and never duplicated join rows
+        filters = []
         if provider_id:
-            query = query.where(ServiceProviderEntity.provider_id == provider_id)
+            filters.append(ServiceProviderEntity.provider_id == provider_id)
         if user_id:
-            query = query.join(ServiceProviderEntity.users).where(ServiceProviderEntity.users.any(user_id=user_id))
+            filters.append(ServiceProviderEntity.users.any(UserProviderAssociationEntity.user_id == user_id))
         if service_type:
-            query = query.where(ServiceProviderEntity.service_type == service_type)
+            filters.append(ServiceProviderEntity.service_type == service_type)
         if name:
-            query = query.where(func.lower(ServiceProviderEntity.name).contains(name.lower()))
+            filters.append(func.lower(ServiceProviderEntity.name).contains(name.lower()))
         if phone_number:
-            query = query.join(ServiceProviderEntity.phones).where(ProviderPhoneEntity.phone_number == phone_number)
+            filters.append(ServiceProviderEntity.phones.any(ProviderPhoneEntity.phone_number == phone_number))
         if membership:
-            query = query.where(ServiceProviderEntity.membership == membership)
+            filters.append(ServiceProviderEntity.membership == membership)
 
-        # Working hours filter
+        # Working hours filter, answered from the precomputed weekly slots so overnight shifts match too
         if day_of_week and desired_time:
-            query = query.join(ServiceProviderEntity.working_hours).where(
-                and_(
-                    WorkingHoursEntity.day_of_week == day_of_week,
-                    WorkingHoursEntity.start_time <= desired_time,
-                    WorkingHoursEntity.end_time >= desired_time
-                )
-            )
+            filters.append(ServiceProviderEntity.open_slots.contains([slot_at(day_of_week, desired_time)]))
+
+        query = select(ServiceProviderEntity).where(*filters).options(
+            selectinload(ServiceProviderEntity.users),
+            selectinload(ServiceProviderEntity.phones),
+            selectinload(ServiceProviderEntity.working_hours),
+            selectinload(ServiceProviderEntity.locations)
+        )
 
-        # Geo-location filter and ordering by distance
+        if nearest and longitude is not None and latitude is not None:
+            # Closest first, driven by a KNN scan of the locations rather than a distance per provider
+            provider_ids = await self._nearest_provider_ids(filters, geography_point(longitude, latitude), radius_km,
+                                                            (page - 1) * size, size, db)
+            if not provider_ids:
+                return []
+            result = await db.execute(query.where(ServiceProviderEntity.provider_id.in_(provider_ids)))
+            rank = {provider_id: index for index, provider_id in enumerate(provider_ids)}
+            return await self._to_dtos(sorted(result.scalars().all(), key=lambda provider: rank[provider.provider_id]))
+
+        # Premium providers first, as ranked by MembershipEnum
+        sort_keys = [_membership_rank()]
+
+        # Geo-location filter and ordering by the provider's closest location
         if longitude is not None and latitude is not None:
-            point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+            point = geography_point(longitude, latitude)
             if radius_km is not None:
-                query = query.join(ServiceProviderEntity.locations).where(
+                query = query.where(ServiceProviderEntity.locations.any(
                     func.ST_DWithin(ServiceProviderLocationEntity.geo_location, point, radius_km * 1000)
-                )
-            query = query.order_by(func.ST_Distance(ServiceProviderLocationEntity.geo_location, point))
+                ))
+            sort_keys.append(
+                select(func.min(func.ST_Distance(ServiceProviderLocationEntity.geo_location, point)))
+                .where(ServiceProviderLocationEntity.provider_id == ServiceProviderEntity.provider_id)
+                .scalar_subquery()
+            )
 
-        # Additional ordering: name, service type, membership
-        query = query.order_by(
-            func.lower(ServiceProviderEntity.name).asc(),
-            ServiceProviderEntity.service_type.asc(),
-        )
+        # Then name and service type; provider_id makes the order total so pages never overlap
+        sort_keys += [func.lower(ServiceProviderEntity.name), ServiceProviderEntity.service_type,
+                      ServiceProviderEntity.provider_id]
+        query = query.order_by(*sort_keys)
 
         # Apply pagination
-        query = query.offset((page - 1) * size).limit(size)
+        if after is not None:
+            after_membership, after_name, after_service_type, after_provider_id = after
+            query = query.where(tuple_(*sort_keys) > tuple_(
+                MembershipEnum(after_membership).rank, func.lower(after_name), after_service_type, after_provider_id
+            ))
+        else:
+            query = query.offset((page - 1) * size)
+        query = query.limit(size)
 
         # Execute query
         result = await db.execute(query)
-        providers = result.scalars().all()
-
+        return await self._to_dtos(result.scalars().all())
+
+    async def _nearest_provider_ids(self, filters: List, point, radius_km: Optional[float], skip: int, limit: int,
+                                    db: AsyncSession) -> List[uuid.UUID]:
+        """
+        One page of provider ids ordered by their closest location. The first n locations of a KNN scan
+        (ORDER BY geo_location <-> point LIMIT n, walked on the GiST index) rank every provider they contain exactly,
+        since no location outside them is closer; the scan is widened until the filtered providers fill the page
+        or it has reached every location.
+        """
+        distance = knn_distance(ServiceProviderLocationEntity.geo_location, point)
+        window = max((skip + limit) * _NEAREST_SCAN_FACTOR, limit)
+        while True:
+            scan = select(ServiceProviderLocationEntity.provider_id).order_by(distance).limit(window)
+            if radius_km is not None:
+                scan = scan.where(func.ST_DWithin(ServiceProviderLocationEntity.geo_location, point, radius_km * 1000))
+            location_providers = (await db.execute(scan)).scalars().all()
+            # Closest first, each provider at the rank of its closest location
+            candidates = list(dict.fromkeys(location_providers))
+            if filters and candidates:
+                result = await db.execute(select(ServiceProviderEntity.provider_id)
+                                          .where(ServiceProviderEntity.provider_id.in_(candidates), *filters))
+                matching = set(result.scalars().all())
+                candidates = [provider_id for provider_id in candidates if provider_id in matching]
+            if len(candidates) >= skip + limit or len(location_providers) < window:
+                return candidates[skip:skip + limit]
+            window *= 2
+
+    async def _to_dtos(self, providers: List[ServiceProviderEntity]) -> List[ServiceProviderDTO]:
         # Sort working hours for each provider by the rank of the day of the week
         for provider in providers:
             provider.working_hours.sort(key=lambda wh: wh.day_of_week.rank)
 
-        # In-memory sorting of providers using MembershipEnum and DayOfWeekEnum
-        providers.sort(key=lambda provider: (
-            MembershipEnum(provider.membership),
-        ))
-
         if providers:
             await self._convert_geo_locations_for_providers(providers)
 
         return [ServiceProviderDTO(**provider.__dict__) for provider in providers]
 
     async def get_open_service_providers(
-            self, day_of_week: DayOfWeekEnum, desired_time: time, page: int, size: int, db: AsyncSession
+            self, day_of_week: DayOfWeekEnum, desired_time: time, page: int, size: int, db: AsyncSession,
+            within_hours: Optional[float] = None
     ) -> List[OpenServiceProviderDTO]:
 
-        query = select(ServiceProviderEntity).join(ServiceProviderEntity.working_hours).where(
-            and_(
-                WorkingHoursEntity.day_of_week == day_of_week,
-                WorkingHoursEntity.start_time <= desired_time,
-                WorkingHoursEntity.end_time >= desired_time
-            )
-        ).options(
+        # A single GIN-indexed test against the precomputed weekly slots: @> for "open at",
+        # && for "open at any point in the next N hours"
+        if within_hours:
+            is_open = ServiceProviderEntity.open_slots.overlap(slots_within(day_of_week, desired_time, within_hours))
+        else:
+            is_open = ServiceProviderEntity.open_slots.contains([slot_at(day_of_week, desired_time)])
+
+        query = select(ServiceProviderEntity).where(is_open).options(
             selectinload(ServiceProviderEntity.users),
             selectinload(ServiceProviderEntity.phones),
             selectinload(ServiceProviderEntity.working_hours),
             selectinload(ServiceProviderEntity.locations)
         )
 
-        # Additional ordering: name, service type, membership
+        # Premium providers first, then name and service type
         query = query.order_by(
-            func.lower(ServiceProviderEntity.name).asc(),
-            ServiceProviderEntity.service_type.asc(),
-            ServiceProviderEntity.membership.asc(),
-            WorkingHoursEntity.day_of_week
+            _membership_rank(),
+            func.lower(ServiceProviderEntity.name),
+            ServiceProviderEntity.service_type,
+            ServiceProviderEntity.provider_id
         )
 
         # Apply pagination
@@ -162,9 +220,6 @@ class SQLAlchemyServiceProviderRepository(ServiceProviderRepository):
         result = await db.execute(query)
         open_providers = result.scalars().all()
 
-        # In-memory sorting of providers using MembershipEnum
-        open_providers.sort(key=lambda provider: MembershipEnum(provider.membership))
-
         if open_providers:
             await self._convert_geo_locations_for_providers(open_providers)
 
@@ -5,19 +5,17 @@ from repositories.user_provider_repository import UserProviderRepository
 from errors.validation_error import ValidationError
 from typing import List, Optional
 import uuid
+from utils.insert_returning import insert_returning
+from utils.bulk_insert import BulkInsertResult, bulk_insert
 
 class SQLAlchemyUserProviderRepository(UserProviderRepository):
 
     async def add_user_provider(self, association: UserProviderAssociationEntity, db: AsyncSession) -> UserProviderAssociationEntity:
-        db.add(association)
-        await db.flush()
-        await db.refresh(association)
-        return association
+        return await insert_returning(association, db)
 
-    async def add_user_providers_bulk(self, associations: List[UserProviderAssociationEntity], db: AsyncSession) -> List[UserProviderAssociationEntity]:
-        db.add_all(associations)
-        await db.flush()
-        return associations
+    async def add_user_providers_bulk(self, associations: List[UserProviderAssociationEntity], db: AsyncSession) -> BulkInsertResult:
+        return await bulk_insert(associations, db, conflict_constraint="uq_user_provider",
+                                 conflict_detail="The user is already associated with this provider.")
 
     async def remove_user_provider(self, user_id: uuid.UUID, provider_id: uuid.UUID, db: AsyncSession) -> None:
         query = select(UserProviderAssociationEntity).filter(
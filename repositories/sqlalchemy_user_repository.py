@@ -1,27 +1,25 @@
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, tuple_
+from typing import List, Optional, Tuple
 from entities.user_entity import UserEntity
 from repositories.user_repository import UserRepository
+from utils.insert_returning import insert_returning
 
 
 class SQLAlchemyUserRepository(UserRepository):
 
     async def create(self, user: UserEntity, db: AsyncSession) -> UserEntity:
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
-        return user
-
-    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[UserEntity]:
-        result = await db.execute(
-            select(UserEntity)
-            .order_by(UserEntity.email)
-            .offset(skip)
-            .limit(limit)
-        )
+        return await insert_returning(user, db)
+
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 10, after: Optional[Tuple] = None) -> List[UserEntity]:
+        query = select(UserEntity).order_by(UserEntity.email, UserEntity.user_id)
+        if after is not None:
+            query = query.where(tuple_(UserEntity.email, UserEntity.user_id) > tuple_(*after))
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         return result.scalars().all()
 
     async def get_by_id(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[UserEntity]:
@@ -1,23 +1,23 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from entities.service_provider_entity import ServiceProviderEntity
 from entities.working_hours_entity import WorkingHoursEntity
 from errors.not_found_error import NotFoundError
 from repositories.working_hours_repository import WorkingHoursRepository
 from typing import List, Optional
 import uuid  # Import UUID
+from utils.insert_returning import insert_returning
+from utils.bulk_insert import BulkInsertResult, bulk_insert
 
 class SQLAlchemyWorkingHoursRepository(WorkingHoursRepository):
 
-    async def add_working_hours_bulk(self, working_hours: List[WorkingHoursEntity], db: AsyncSession) -> List[WorkingHoursEntity]:
-        db.add_all(working_hours)
-        await db.flush()  # Commit handled in the service
-        return working_hours
+    async def add_working_hours_bulk(self, working_hours: List[WorkingHoursEntity], db: AsyncSession) -> BulkInsertResult:
+        # Commit handled in the service
+        return await bulk_insert(working_hours, db, conflict_constraint="uq_provider_day",
+                                 conflict_detail="Provider already has working hours for this day.")
 
     async def add_working_hours(self, working_hours: WorkingHoursEntity, db: AsyncSession) -> WorkingHoursEntity:
-        db.add(working_hours)
-        await db.flush()
-        await db.refresh(working_hours)
-        return working_hours
+        return await insert_returning(working_hours, db)
 
     async def update_working_hours(self, working_hours: WorkingHoursEntity, db: AsyncSession) -> WorkingHoursEntity:
         await db.flush()
@@ -36,6 +36,13 @@ class SQLAlchemyWorkingHoursRepository(WorkingHoursRepository):
         result = await db.execute(select(WorkingHoursEntity).filter_by(working_hours_id=working_hours_id))
         return result.scalar_one_or_none()
 
+    async def update_provider_open_slots(self, provider_id: uuid.UUID, open_slots: List[int], db: AsyncSession) -> None:
+        await db.execute(
+            update(ServiceProviderEntity)
+            .where(ServiceProviderEntity.provider_id == provider_id)
+            .values(open_slots=open_slots, version=ServiceProviderEntity.version + 1)
+        )
+
     async def get_by_provider_id(self, provider_id: uuid.UUID, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[WorkingHoursEntity]:
         result = await db.execute(
             select(WorkingHoursEntity)
@@ -4,6 +4,7 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from entities.user_provider_association_entity import UserProviderAssociationEntity
+from utils.bulk_insert import BulkInsertResult
 
 class UserProviderRepository(ABC):
 
@@ -13,8 +14,8 @@ class UserProviderRepository(ABC):
         pass
 
     @abstractmethod
-    async def add_user_providers_bulk(self, associations: List[UserProviderAssociationEntity], db: AsyncSession) -> List[UserProviderAssociationEntity]:
-        """Add multiple user-provider associations in bulk."""
+    async def add_user_providers_bulk(self, associations: List[UserProviderAssociationEntity], db: AsyncSession) -> BulkInsertResult:
+        """Add multiple user-provider associations in bulk; existing or invalid ones are reported per item."""
         pass
 
     @abstractmethod
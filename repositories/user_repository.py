@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.user_entity import UserEntity
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import uuid
 
 class UserRepository(ABC):
@@ -11,7 +11,7 @@ class UserRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[UserEntity]:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 10, after: Optional[Tuple] = None) -> List[UserEntity]:
         pass
 
     @abstractmethod
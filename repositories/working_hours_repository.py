@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import uuid
 from entities.working_hours_entity import WorkingHoursEntity
+from utils.bulk_insert import BulkInsertResult
 
 class WorkingHoursRepository(ABC):
     @abstractmethod
@@ -16,12 +17,13 @@ class WorkingHoursRepository(ABC):
         pass
 
     @abstractmethod
-    async def add_working_hours_bulk(self, working_hours: List[WorkingHoursEntity], db: AsyncSession) -> List[WorkingHoursEntity]:
+    async def add_working_hours_bulk(self, working_hours: List[WorkingHoursEntity], db: AsyncSession) -> BulkInsertResult:
         """
         Inserts multiple working hours entries into the database in bulk.
+        Entries for a day the provider already has are skipped and reported as errors, as are rows breaking a constraint.
         :param working_hours: A list of WorkingHoursEntity objects representing the new working hours.
         :param db: Async database session.
-        :return: A list of created WorkingHoursEntity objects.
+        :return: The created WorkingHoursEntity objects and the per-item errors.
         """
         pass
 
@@ -55,6 +57,17 @@ class WorkingHoursRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def update_provider_open_slots(self, provider_id: uuid.UUID, open_slots: List[int], db: AsyncSession) -> None:
+        """
+        Stores the weekly open slots derived from a provider's working hours on the provider row.
+        :param provider_id: The UUID of the service provider.
+        :param open_slots: The sorted weekly slots the provider is open in.
+        :param db: Async database session.
+        :return: None.
+        """
+        pass
+
     @abstractmethod
     async def get_by_provider_id(self, provider_id: uuid.UUID, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[WorkingHoursEntity]:
         """
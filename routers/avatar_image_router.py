@@ -3,12 +3,12 @@ import uuid
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from urllib.parse import urlparse, unquote
 import os
-from typing import List
-from app.dependencies import get_avatar_image_service, get_user_service
+from typing import List, Optional
+from app.dependencies import get_avatar_image_service, get_object_storage, get_user_service
 from app.database import get_db
 from services.avatar_image_service import AvatarImageService
+from services.object_storage_service import ObjectStorageService
 from services.user_service import UserService
 from boundaries.avatar_image_boundary import AvatarImageBoundary
 from errors.database_error import DatabaseError
@@ -35,7 +35,7 @@ def get_avatar_image_router() -> APIRouter:
         object_name = f"AvatarImages/{timestamp}_{unique_id}_{file_name}"
 
         try:
-            presigned_url = avatar_image_service.generate_presigned_url(object_name=object_name)
+            presigned_url = await avatar_image_service.generate_presigned_url(object_name=object_name)
             return presigned_url
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -46,15 +46,15 @@ def get_avatar_image_router() -> APIRouter:
             presigned_url: str,
             avatar_image_service: AvatarImageService = Depends(get_avatar_image_service),
             user_service: UserService = Depends(get_user_service),
+            storage: ObjectStorageService = Depends(get_object_storage),
             db: AsyncSession = Depends(get_db)
     ):
         user = await user_service.get_user_by_id(user_id=user_id, db=db)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Parse the presigned URL to extract the file path
-        parsed_url = urlparse(unquote(presigned_url))
-        file_path = parsed_url.path.lstrip('/')  # Remove leading slash
+        # The object key is in the presigned URL's path, after whatever prefix the storage backend puts there
+        file_path = storage.key_from_url(presigned_url)
 
         # Extract folder name and file name from file_path
         folder_name, file_name = os.path.split(file_path)
@@ -74,6 +74,7 @@ def get_avatar_image_router() -> APIRouter:
             user_id: uuid.UUID,
             page: int = Query(1, ge=1),
             size: int = Query(10, ge=1),
+            width: Optional[int] = Query(None, ge=1, description="Display width in pixels; display_url is the smallest variant at least this wide"),
             avatar_image_service: AvatarImageService = Depends(get_avatar_image_service),
             user_service: UserService = Depends(get_user_service),
             db: AsyncSession = Depends(get_db)
@@ -83,7 +84,7 @@ def get_avatar_image_router() -> APIRouter:
             raise HTTPException(status_code=404, detail="User not found")
 
         try:
-            images = await avatar_image_service.get_images_by_user(user_id=user.user_id, page=page, size=size, db=db)
+            images = await avatar_image_service.get_images_by_user(user_id=user.user_id, page=page, size=size, db=db, width=width)
             return images
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -1,18 +1,28 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional, List
-from app.dependencies import get_found_pet_report_service
+from app.dependencies import get_response_cache, get_found_pet_report_service
 from app.database import get_db
 from boundaries.requested_found_pet_report_boundary import RequestedFoundPetReportBoundary
 from boundaries.found_pet_report_boundary import FoundPetReportBoundary
 from boundaries.update_found_pet_report_boundary import UpdateFoundPetReportBoundary
+from boundaries.pet_match_boundary import PetMatchBoundary
+from boundaries.similar_lost_pet_boundary import SimilarLostPetBoundary
 from services.found_pet_report_service import FoundPetReportService
+from enums.export_format_enum import ExportFormatEnum
 from errors.validation_error import ValidationError
 from errors.not_found_error import NotFoundError
 from errors.database_error import DatabaseError
+from errors.precondition_failed_error import PreconditionFailedError
+from errors.service_unavailable_error import ServiceUnavailableError
+from utils.cursor import NEXT_CURSOR_HEADER, next_cursor, set_next_cursor
+from utils.response_cache import FOUND_PET_REPORTS, ResponseCache, serialize_list, serialize_one
+from utils.etag import ETAG_HEADER, if_match_version, version_etag
+from utils.export_stream import export_response
+from utils.geo_query import orders_by_distance
 
 
 def get_found_pet_report_router() -> APIRouter:
@@ -29,6 +39,9 @@ def get_found_pet_report_router() -> APIRouter:
                 user_id=report_data.user_id,
                 geo_location=report_data.geo_location,
                 description=report_data.description,
+                species=report_data.species,
+                breed=report_data.breed,
+                main_color=report_data.main_color,
                 db=db
             )
             return report
@@ -41,6 +54,8 @@ def get_found_pet_report_router() -> APIRouter:
     async def update_found_pet_report(
         report_id: uuid.UUID,
         report_data: UpdateFoundPetReportBoundary,
+        response: Response,
+        if_match: Optional[str] = Header(None, description="ETag of the version being updated; 412 if it has changed since"),
         service: FoundPetReportService = Depends(get_found_pet_report_service),
         db: AsyncSession = Depends(get_db)
     ):
@@ -49,9 +64,13 @@ def get_found_pet_report_router() -> APIRouter:
                 report_id=report_id,
                 geo_location=report_data.geo_location,
                 description=report_data.description,
-                db=db
+                db=db,
+                expected_version=if_match_version(if_match)
             )
+            response.headers[ETAG_HEADER] = version_etag(report.version)
             return report
+        except PreconditionFailedError as e:
+            raise HTTPException(status_code=412, detail=str(e))
         except NotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except ValidationError as e:
@@ -59,42 +78,120 @@ def get_found_pet_report_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/export", summary="Export Found Pet Reports as NDJSON or CSV")
+    async def export_found_pet_reports(
+        export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+        start_date: Optional[datetime] = Query(None),
+        end_date: Optional[datetime] = Query(None),
+        user_id: Optional[uuid.UUID] = Query(None),
+        longitude: Optional[float] = Query(None),
+        latitude: Optional[float] = Query(None),
+        radius_km: Optional[float] = Query(None),
+        service: FoundPetReportService = Depends(get_found_pet_report_service),
+        db: AsyncSession = Depends(get_db)
+    ):
+        try:
+            reports = await service.export_reports(
+                start_date=start_date,
+                end_date=end_date,
+                user_id=user_id,
+                longitude=longitude,
+                latitude=latitude,
+                radius_km=radius_km,
+                db=db
+            )
+            # Match candidates are only computed on creation, so they are not part of an export
+            return export_response(reports, FoundPetReportBoundary, export_format, "found_pet_reports",
+                                   exclude={"match_candidates"})
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
     @router.get("/{report_id}", response_model=FoundPetReportBoundary, summary="Get Found Pet Report by ID")
     async def get_found_pet_report_by_id(
         report_id: uuid.UUID,
+        request: Request,
         service: FoundPetReportService = Depends(get_found_pet_report_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
-        try:
+        async def load():
             report = await service.get_report_by_id(report_id, db)
             if not report:
                 raise HTTPException(status_code=404, detail="Found Pet Report not found.")
-            return report
+            return serialize_one(FoundPetReportBoundary, report, version_etag(report.version))
+
+        try:
+            return await cache.respond_entity(request, FOUND_PET_REPORTS, report_id, load)
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.get("/{report_id}/matches", response_model=List[PetMatchBoundary], summary="Get Lost Pet Matches for Found Pet Report")
+    async def get_found_pet_report_matches(
+        report_id: uuid.UUID,
+        service: FoundPetReportService = Depends(get_found_pet_report_service),
+        db: AsyncSession = Depends(get_db)
+    ):
+        try:
+            return await service.get_report_matches(report_id, db)
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ServiceUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.get("/{report_id}/similar-lost-pets", response_model=List[SimilarLostPetBoundary], summary="Get Lost Pets That Look Like the Found Pet")
+    async def get_similar_lost_pets(
+        report_id: uuid.UUID,
+        max_distance: Optional[int] = Query(None, ge=0, le=12, description="Most differing bits of 64 between two photos' hashes"),
+        radius_km: Optional[float] = Query(None, gt=0, description="Only lost reports this close to the found report"),
+        service: FoundPetReportService = Depends(get_found_pet_report_service),
+        db: AsyncSession = Depends(get_db)
+    ):
+        try:
+            return await service.get_similar_lost_pets(report_id, max_distance, radius_km, db)
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ServiceUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.get("/", response_model=List[FoundPetReportBoundary], summary="Get All Found Pet Reports with Pagination")
     async def get_all_found_pet_reports(
+        request: Request,
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         service: FoundPetReportService = Depends(get_found_pet_report_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
+        async def load():
+            reports = await service.get_all_reports(page=page, size=size, db=db, cursor=cursor)
+            following = next_cursor(reports, size, service.cursor_keyset)
+            return serialize_list(FoundPetReportBoundary, reports, {NEXT_CURSOR_HEADER: following} if following else None)
+
         try:
-            return await service.get_all_reports(page=page, size=size, db=db)
+            return await cache.respond(request, FOUND_PET_REPORTS, dict(page=page, size=size, cursor=cursor), load)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.get("/filters/", response_model=List[FoundPetReportBoundary], summary="Filter Found Pet Reports by Date, User ID, and Location")
     async def get_filtered_found_pet_reports(
+        response: Response,
         start_date: Optional[datetime] = Query(None),
         end_date: Optional[datetime] = Query(None),
         user_id: Optional[uuid.UUID] = Query(None),
         longitude: Optional[float] = Query(None),
         latitude: Optional[float] = Query(None),
         radius_km: Optional[float] = Query(None),
+        nearest: bool = Query(False, description="Order by distance from longitude/latitude, closest first"),
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         service: FoundPetReportService = Depends(get_found_pet_report_service),
         db: AsyncSession = Depends(get_db)
     ):
@@ -106,11 +203,17 @@ def get_found_pet_report_router() -> APIRouter:
                 longitude=longitude,
                 latitude=latitude,
                 radius_km=radius_km,
+                nearest=nearest,
                 page=page,
                 size=size,
-                db=db
+                db=db,
+                cursor=cursor
             )
+            if not orders_by_distance(longitude, latitude, radius_km, nearest):
+                set_next_cursor(response, reports, size, service.cursor_keyset)
             return reports
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
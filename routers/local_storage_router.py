@@ -0,0 +1,44 @@
+import asyncio
+import os
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
+
+from errors.storage_error import StorageError
+from services.local_object_storage_service_implementation import LocalObjectStorageServiceImplementation
+
+
+def get_local_storage_router(storage: LocalObjectStorageServiceImplementation) -> APIRouter:
+    """
+    Serves the URLs handed out by the local object storage backend, so presigned uploads, downloads and image
+    variants work in development without S3. Presigned URLs carry an expiry but no signature.
+    """
+    router = APIRouter()
+
+    def _path(key: str, expires: Optional[int]) -> str:
+        if expires is not None and expires < time.time():
+            raise HTTPException(status_code=403, detail="URL has expired")
+        try:
+            return storage.path_for(key)
+        except StorageError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @router.get("/{key:path}", summary="Download Stored Object")
+    async def download_object(key: str, expires: Optional[int] = Query(None)):
+        path = _path(key, expires)
+        if not await asyncio.to_thread(os.path.isfile, path):
+            raise HTTPException(status_code=404, detail="Object not found")
+        return FileResponse(path)
+
+    @router.put("/{key:path}", summary="Upload Stored Object")
+    async def upload_object(key: str, request: Request, expires: Optional[int] = Query(None)):
+        _path(key, expires)
+        try:
+            await storage.put_object(key, await request.body(), content_type=request.headers.get("content-type"))
+        except StorageError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        return Response(status_code=200)
+
+    return router
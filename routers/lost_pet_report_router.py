@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional, List
 import uuid
-from app.dependencies import get_lost_pet_report_service
+from app.dependencies import get_response_cache, get_lost_pet_report_service
 from app.database import get_db
 from boundaries.requested_lost_pet_report_boundary import RequestedLostPetReportBoundary
 from boundaries.update_lost_pet_report_boundary import UpdateLostPetReportBoundary
 from services.lost_pet_report_service import LostPetReportService
 from boundaries.lost_pet_report_boundary import LostPetReportBoundary
+from enums.export_format_enum import ExportFormatEnum
 from errors.validation_error import ValidationError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
 from errors.database_error import DatabaseError
+from utils.cursor import NEXT_CURSOR_HEADER, next_cursor, set_next_cursor
+from utils.export_stream import export_response
+from utils.etag import ETAG_HEADER, if_match_version, version_etag
+from utils.response_cache import LOST_PET_REPORTS, ResponseCache, serialize_list, serialize_one
+from utils.geo_query import orders_by_distance
 
 def get_lost_pet_report_router() -> APIRouter:
     router = APIRouter()
@@ -43,6 +50,8 @@ def get_lost_pet_report_router() -> APIRouter:
     async def update_lost_pet_report(
         report_id: uuid.UUID,
         report_data: UpdateLostPetReportBoundary,
+        response: Response,
+        if_match: Optional[str] = Header(None, description="ETag of the version being updated; 412 if it has changed since"),
         service: LostPetReportService = Depends(get_lost_pet_report_service),
         db: AsyncSession = Depends(get_db)
     ):
@@ -52,9 +61,13 @@ def get_lost_pet_report_router() -> APIRouter:
                 geo_location=report_data.geo_location,
                 description=report_data.description,
                 status=report_data.status,
-                db=db
+                db=db,
+                expected_version=if_match_version(if_match)
             )
+            response.headers[ETAG_HEADER] = version_etag(report.version)
             return report
+        except PreconditionFailedError as e:
+            raise HTTPException(status_code=412, detail=str(e))
         except NotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except ValidationError as e:
@@ -62,17 +75,52 @@ def get_lost_pet_report_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/export", summary="Export Lost Pet Reports as NDJSON or CSV")
+    async def export_lost_pet_reports(
+        export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+        start_date: Optional[datetime] = Query(None),
+        end_date: Optional[datetime] = Query(None),
+        status: Optional[str] = Query(None),
+        user_id: Optional[uuid.UUID] = Query(None),
+        pet_id: Optional[uuid.UUID] = Query(None),
+        longitude: Optional[float] = Query(None),
+        latitude: Optional[float] = Query(None),
+        radius_km: Optional[float] = Query(None),
+        service: LostPetReportService = Depends(get_lost_pet_report_service),
+        db: AsyncSession = Depends(get_db)
+    ):
+        try:
+            reports = await service.export_reports(
+                start_date=start_date,
+                end_date=end_date,
+                status=status,
+                user_id=user_id,
+                pet_id=pet_id,
+                longitude=longitude,
+                latitude=latitude,
+                radius_km=radius_km,
+                db=db
+            )
+            return export_response(reports, LostPetReportBoundary, export_format, "lost_pet_reports")
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
     @router.get("/{report_id}", response_model=LostPetReportBoundary, summary="Get Lost Pet Report by ID")
     async def get_lost_pet_report_by_id(
         report_id: uuid.UUID,
+        request: Request,
         service: LostPetReportService = Depends(get_lost_pet_report_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
-        try:
+        async def load():
             report = await service.get_report_by_id(report_id, db)
             if not report:
                 raise HTTPException(status_code=404, detail="Lost Pet Report not found.")
-            return report
+            return serialize_one(LostPetReportBoundary, report, version_etag(report.version))
+
+        try:
+            return await cache.respond_entity(request, LOST_PET_REPORTS, report_id, load)
         except NotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except DatabaseError as e:
@@ -80,13 +128,23 @@ def get_lost_pet_report_router() -> APIRouter:
 
     @router.get("/", response_model=List[LostPetReportBoundary], summary="Get All Lost Pet Reports with Pagination")
     async def get_all_lost_pet_reports(
+        request: Request,
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         service: LostPetReportService = Depends(get_lost_pet_report_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
+        async def load():
+            reports = await service.get_all_reports(page=page, size=size, db=db, cursor=cursor)
+            following = next_cursor(reports, size, service.cursor_keyset)
+            return serialize_list(LostPetReportBoundary, reports, {NEXT_CURSOR_HEADER: following} if following else None)
+
         try:
-            return await service.get_all_reports(page=page, size=size, db=db)
+            return await cache.respond(request, LOST_PET_REPORTS, dict(page=page, size=size, cursor=cursor), load)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
         except Exception as e:
@@ -94,6 +152,7 @@ def get_lost_pet_report_router() -> APIRouter:
 
     @router.get("/filters/", response_model=List[LostPetReportBoundary], summary="Filter Lost Pet Reports")
     async def get_filtered_lost_pet_reports(
+        response: Response,
         start_date: Optional[datetime] = Query(None),
         end_date: Optional[datetime] = Query(None),
         status: Optional[str] = Query(None),
@@ -102,8 +161,10 @@ def get_lost_pet_report_router() -> APIRouter:
         longitude: Optional[float] = Query(None),
         latitude: Optional[float] = Query(None),
         radius_km: Optional[float] = Query(None),
+        nearest: bool = Query(False, description="Order by distance from longitude/latitude, closest first"),
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         service: LostPetReportService = Depends(get_lost_pet_report_service),
         db: AsyncSession = Depends(get_db)
     ):
@@ -117,11 +178,17 @@ def get_lost_pet_report_router() -> APIRouter:
                 longitude=longitude,
                 latitude=latitude,
                 radius_km=radius_km,
+                nearest=nearest,
                 page=page,
                 size=size,
-                db=db
+                db=db,
+                cursor=cursor
             )
+            if not orders_by_distance(longitude, latitude, radius_km, nearest):
+                set_next_cursor(response, reports, size, service.cursor_keyset)
             return reports
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
         except Exception as e:
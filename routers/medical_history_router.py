@@ -1,17 +1,23 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 from app.database import get_db
-from app.dependencies import get_medical_history_service
+from app.dependencies import get_medical_history_service, get_response_cache
 from entities.medical_history_entity import MedicalHistoryEntity
 from services.medical_history_service import MedicalHistoryService
+from boundaries.bulk_create_response_boundary import BulkCreateResponseBoundary
 from boundaries.requested_medical_history_boundary import RequestedMedicalHistoryBoundary
 from boundaries.medical_history_boundary import MedicalHistoryBoundary
 from errors.database_error import DatabaseError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
+from enums.export_format_enum import ExportFormatEnum
 from errors.validation_error import ValidationError
+from utils.export_stream import export_response
+from utils.etag import ETAG_HEADER, conditional_json, if_match_version, version_etag
+from utils.response_cache import MEDICAL_HISTORIES, ResponseCache, serialize_list, serialize_one
 
 
 def get_medical_history_router() -> APIRouter:
@@ -44,11 +50,13 @@ def get_medical_history_router() -> APIRouter:
     async def update_medical_history(
         record_id: uuid.UUID,
         request: RequestedMedicalHistoryBoundary,
+        response: Response,
+        if_match: Optional[str] = Header(None, description="ETag of the version being updated; 412 if it has changed since"),
         service: MedicalHistoryService = Depends(get_medical_history_service),
         db: AsyncSession = Depends(get_db)
     ):
         try:
-            return await service.update_medical_history(
+            medical_history = await service.update_medical_history(
                 record_id=record_id,
                 pet_id=request.pet_id,
                 visit_date=request.visit_date,
@@ -56,8 +64,13 @@ def get_medical_history_router() -> APIRouter:
                 treatment=request.treatment,
                 notes=request.notes,
                 veterinarian_name=request.veterinarian_name,
-                db=db
+                db=db,
+                expected_version=if_match_version(if_match)
             )
+            response.headers[ETAG_HEADER] = version_etag(medical_history.version)
+            return medical_history
+        except PreconditionFailedError as e:
+            raise HTTPException(status_code=412, detail=str(e))
         except NotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except ValidationError as e:
@@ -65,22 +78,47 @@ def get_medical_history_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/export", summary="Export Medical Histories as NDJSON or CSV")
+    async def export_medical_histories(
+        export_format: ExportFormatEnum = Query(ExportFormatEnum.NDJSON, alias="format"),
+        start_date: Optional[datetime] = Query(None),
+        end_date: Optional[datetime] = Query(None),
+        diagnosis: Optional[str] = Query(None),
+        veterinarian_name: Optional[str] = Query(None),
+        pet_id: Optional[uuid.UUID] = Query(None),
+        service: MedicalHistoryService = Depends(get_medical_history_service),
+        db: AsyncSession = Depends(get_db)
+    ):
+        try:
+            records = await service.export_medical_histories(start_date, end_date, diagnosis, veterinarian_name, pet_id, db)
+            return export_response(records, MedicalHistoryBoundary, export_format, "medical_histories")
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
     @router.get("/{record_id}", response_model=MedicalHistoryBoundary, summary="Get Medical History by ID")
     async def get_medical_history_by_id(
         record_id: uuid.UUID,
+        request: Request,
         service: MedicalHistoryService = Depends(get_medical_history_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
-        try:
+        async def load():
             medical_history = await service.get_medical_history_by_id(record_id, db)
             if not medical_history:
                 raise HTTPException(status_code=404, detail="Medical history not found")
-            return medical_history
+            return serialize_one(MedicalHistoryBoundary, medical_history, version_etag(medical_history.version))
+
+        try:
+            return await cache.respond_entity(request, MEDICAL_HISTORIES, record_id, load)
+        except NotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
     @router.get("/", response_model=List[MedicalHistoryBoundary], summary="Filter Medical Histories")
     async def filter_medical_histories(
+        request: Request,
         start_date: Optional[datetime] = Query(None),
         end_date: Optional[datetime] = Query(None),
         diagnosis: Optional[str] = Query(None),
@@ -90,11 +128,13 @@ def get_medical_history_router() -> APIRouter:
         db: AsyncSession = Depends(get_db)
     ):
         try:
-            return await service.filter_medical_histories(start_date, end_date, diagnosis, veterinarian_name, pet_id, db)
+            records = await service.filter_medical_histories(start_date, end_date, diagnosis, veterinarian_name, pet_id, db)
+            cached = serialize_list(MedicalHistoryBoundary, records)
+            return conditional_json(request, cached.body, cached.headers)
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
-    @router.post("/bulk", response_model=List[MedicalHistoryBoundary], summary="Create Multiple Medical Histories")
+    @router.post("/bulk", response_model=BulkCreateResponseBoundary[MedicalHistoryBoundary], summary="Create Multiple Medical Histories")
     async def create_all_medical_histories(
         requests: List[RequestedMedicalHistoryBoundary],
         service: MedicalHistoryService = Depends(get_medical_history_service),
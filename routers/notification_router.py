@@ -0,0 +1,93 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+from app.database import get_db
+from app.dependencies import get_notification_hub, get_notification_service
+from app.oauth2 import get_current_user, oauth2_scheme
+from boundaries.mark_notifications_read_boundary import MarkNotificationsReadBoundary
+from boundaries.mark_notifications_read_response_boundary import MarkNotificationsReadResponseBoundary
+from boundaries.notification_boundary import NotificationBoundary
+from boundaries.unread_count_boundary import UnreadCountBoundary
+from enums.notification_status_enum import NotificationStatusEnum
+from errors.database_error import DatabaseError
+from errors.validation_error import ValidationError
+from services.notification_service import NotificationService
+from utils.cursor import set_next_cursor
+from utils.jwt_helper import decode_access_token
+from utils.notification_hub import NotificationHub
+
+
+def get_notification_router() -> APIRouter:
+    router = APIRouter()
+
+    @router.get("/", response_model=List[NotificationBoundary], summary="List My Notifications")
+    async def get_notifications(
+        response: Response,
+        notification_status: Optional[NotificationStatusEnum] = Query(None, alias="status"),
+        size: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+        service: NotificationService = Depends(get_notification_service),
+        db: AsyncSession = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+    ):
+        user_id, role = get_current_user(token)
+        try:
+            notifications = await service.get_notifications(
+                user_id, notification_status.value if notification_status else None, size, db, cursor=cursor
+            )
+            set_next_cursor(response, notifications, size, service.cursor_keyset)
+            return notifications
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.get("/unread-count", response_model=UnreadCountBoundary, summary="Count My Unread Notifications")
+    async def get_unread_count(
+        service: NotificationService = Depends(get_notification_service),
+        db: AsyncSession = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+    ):
+        user_id, role = get_current_user(token)
+        try:
+            return UnreadCountBoundary(unread=await service.get_unread_count(user_id, db))
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.post("/mark-read", response_model=MarkNotificationsReadResponseBoundary, summary="Mark My Notifications as Read")
+    async def mark_notifications_read(
+        request: MarkNotificationsReadBoundary,
+        service: NotificationService = Depends(get_notification_service),
+        db: AsyncSession = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+    ):
+        user_id, role = get_current_user(token)
+        try:
+            marked = await service.mark_read(user_id, request.notification_ids, db)
+            return MarkNotificationsReadResponseBoundary(marked=marked, unread=await service.get_unread_count(user_id, db))
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.websocket("/ws")
+    async def notification_socket(
+        websocket: WebSocket,
+        token: Optional[str] = Query(None, description="Access token, for clients that cannot set an Authorization header"),
+        hub: NotificationHub = Depends(get_notification_hub)
+    ):
+        authorization = websocket.headers.get("authorization", "")
+        if token is None and authorization.lower().startswith("bearer "):
+            token = authorization[len("bearer "):]
+        try:
+            user_id = decode_access_token(token).user_id if token else None
+        except (JWTError, ValueError):
+            user_id = None
+        if user_id is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+        await websocket.accept()
+        await hub.serve(user_id, websocket)
+
+    return router
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.dependencies import get_pet_service
+from app.dependencies import get_pet_service, get_response_cache
 from boundaries.requested_pet_boundary import RequestedPetBoundary
 from errors.database_error import DatabaseError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
 from errors.validation_error import ValidationError
 from services.pet_service import PetService
 from boundaries.pet_boundary import PetBoundary
-from typing import List
+from utils.cursor import NEXT_CURSOR_HEADER, next_cursor
+from utils.etag import ETAG_HEADER, conditional_json, if_match_version, version_etag
+from utils.response_cache import PETS, ResponseCache, serialize_list, serialize_one
+from typing import List, Optional
 import uuid
 
+def _conditional_list(request: Request, pets: List, size: int, service: PetService):
+    # Content-hash ETag, so a client re-polling an unchanged page gets a 304 instead of the body again
+    following = next_cursor(pets, size, service.cursor_keyset)
+    cached = serialize_list(PetBoundary, pets, {NEXT_CURSOR_HEADER: following} if following else None)
+    return conditional_json(request, cached.body, cached.headers)
+
+
 def get_pet_router() -> APIRouter:
     router = APIRouter()
 
@@ -41,6 +52,8 @@ def get_pet_router() -> APIRouter:
     async def update_pet(
         pet_id: uuid.UUID,
         pet_data: RequestedPetBoundary,
+        response: Response,
+        if_match: Optional[str] = Header(None, description="ETag of the version being updated; 412 if it has changed since"),
         db: AsyncSession = Depends(get_db),
         service: PetService = Depends(get_pet_service)
     ):
@@ -53,9 +66,13 @@ def get_pet_router() -> APIRouter:
                 date_of_birth=pet_data.date_of_birth,
                 main_color=pet_data.main_color,
                 pet_details=pet_data.pet_details,
-                db=db
+                db=db,
+                expected_version=if_match_version(if_match)
             )
+            response.headers[ETAG_HEADER] = version_etag(pet.version)
             return pet
+        except PreconditionFailedError as e:
+            raise HTTPException(status_code=412, detail=str(e))
         except NotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except ValidationError as e:
@@ -66,12 +83,17 @@ def get_pet_router() -> APIRouter:
     @router.get("/{pet_id}", response_model=PetBoundary, summary="Get Pet by ID")
     async def get_pet_by_id(
             pet_id: uuid.UUID,
+            request: Request,
             db: AsyncSession = Depends(get_db),
-            service: PetService = Depends(get_pet_service)
+            service: PetService = Depends(get_pet_service),
+            cache: ResponseCache = Depends(get_response_cache)
     ):
+        async def load():
+            pet = await service.get_pet_by_id(pet_id, db)
+            return serialize_one(PetBoundary, pet, version_etag(pet.version))
+
         try:
-            pet = await service.get_pet_by_id(pet_id, db)  # Convert to UUID
-            return pet
+            return await cache.respond_entity(request, PETS, pet_id, load)
         except NotFoundError:
             raise HTTPException(status_code=404, detail="Pet not found.")
         except DatabaseError as e:
@@ -79,26 +101,36 @@ def get_pet_router() -> APIRouter:
 
     @router.get("/", response_model=List[PetBoundary], summary="Get All Pets with Pagination")
     async def get_all_pets(
+        request: Request,
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         db: AsyncSession = Depends(get_db),
         service: PetService = Depends(get_pet_service)
     ):
         try:
-            return await service.get_all_pets(page, size, db)
+            pets = await service.get_all_pets(page, size, db, cursor=cursor)
+            return _conditional_list(request, pets, size, service)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.get("/by-user/{user_id}", response_model=List[PetBoundary], summary="Get Pets by User ID with Pagination")
     async def get_pets_by_user_id(
         user_id: str,
+        request: Request,
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         db: AsyncSession = Depends(get_db),
         service: PetService = Depends(get_pet_service)
     ):
         try:
-            return await service.get_pets_by_user_id(uuid.UUID(user_id), page, size, db)  # Convert to UUID
+            pets = await service.get_pets_by_user_id(uuid.UUID(user_id), page, size, db, cursor=cursor)  # Convert to UUID
+            return _conditional_list(request, pets, size, service)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -5,6 +5,7 @@ import uuid
 
 from app.database import get_db
 from app.dependencies import get_provider_phone_service
+from boundaries.bulk_create_response_boundary import BulkCreateResponseBoundary
 from boundaries.provider_phone_create_boundary import ProviderPhoneCreateBoundary
 from boundaries.provider_phone_bulk_create_boundary import ProviderPhoneBulkCreateBoundary
 from boundaries.provider_phone_response_boundary import ProviderPhoneResponseBoundary
@@ -29,15 +30,14 @@ def get_provider_phone_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    @router.post("/bulk", response_model=List[ProviderPhoneResponseBoundary], summary="Add Phone Numbers in Bulk")
+    @router.post("/bulk", response_model=BulkCreateResponseBoundary[ProviderPhoneResponseBoundary], summary="Add Phone Numbers in Bulk")
     async def add_phones_bulk(
         bulk_boundary: ProviderPhoneBulkCreateBoundary,
         service: ProviderPhoneService = Depends(get_provider_phone_service),
         db: AsyncSession = Depends(get_db)
     ):
         try:
-            phones = await service.add_phones_bulk(bulk_boundary.provider_id, bulk_boundary.phones, db)
-            return phones
+            return await service.add_phones_bulk(bulk_boundary.provider_id, bulk_boundary.phones, db)
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 import uuid
 
 from app.database import get_db
 from app.dependencies import get_service_provider_location_service
+from boundaries.bulk_create_response_boundary import BulkCreateResponseBoundary
 from boundaries.service_provider_location_create_boundary import ServiceProviderLocationCreateBoundary
 from boundaries.service_provider_location_bulk_create_boundary import ServiceProviderLocationBulkCreateBoundary
 from boundaries.service_provider_location_response_boundary import ServiceProviderLocationResponseBoundary
@@ -29,15 +30,14 @@ def get_service_provider_location_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    @router.post("/bulk", response_model=List[ServiceProviderLocationResponseBoundary], summary="Add Locations in Bulk")
+    @router.post("/bulk", response_model=BulkCreateResponseBoundary[ServiceProviderLocationResponseBoundary], summary="Add Locations in Bulk")
     async def add_locations_bulk(
         bulk_boundary: ServiceProviderLocationBulkCreateBoundary,
         service: ServiceProviderLocationService = Depends(get_service_provider_location_service),
         db: AsyncSession = Depends(get_db)
     ):
         try:
-            locations = await service.add_locations_bulk(bulk_boundary.locations, db)
-            return locations
+            return await service.add_locations_bulk(bulk_boundary.provider_id, bulk_boundary.locations, db)
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
@@ -57,6 +57,20 @@ def get_service_provider_location_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get("/nearest", response_model=List[ServiceProviderLocationResponseBoundary], summary="Get Nearest Locations")
+    async def get_nearest_locations(
+        longitude: float = Query(..., ge=-180, le=180),
+        latitude: float = Query(..., ge=-90, le=90),
+        radius_km: Optional[float] = Query(None, gt=0),
+        limit: int = Query(10, ge=1, le=100),
+        service: ServiceProviderLocationService = Depends(get_service_provider_location_service),
+        db: AsyncSession = Depends(get_db)
+    ):
+        try:
+            return await service.get_nearest_locations(longitude, latitude, radius_km, db, limit)
+        except DatabaseError as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
     @router.get("/{provider_id}", response_model=List[ServiceProviderLocationResponseBoundary], summary="Get Locations by Provider")
     async def get_locations_by_provider_id(
         provider_id: uuid.UUID,
@@ -1,11 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Path, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import time
 from uuid import UUID
 
 from app.database import get_db
-from app.dependencies import get_service_provider_service
+from app.dependencies import get_response_cache, get_service_provider_service
 from boundaries.service_provider_boundary import ServiceProviderBoundary
 from services.service_provider_service import ServiceProviderService
 from boundaries.service_provider_create_boundary import ServiceProviderCreateBoundary
@@ -13,6 +13,10 @@ from dto.service_provider_dto import ServiceProviderDTO
 from dto.open_service_provider_dto import OpenServiceProviderDTO
 from errors.validation_error import ValidationError
 from errors.database_error import DatabaseError
+from errors.precondition_failed_error import PreconditionFailedError
+from utils.cursor import NEXT_CURSOR_HEADER, next_cursor
+from utils.etag import ETAG_HEADER, if_match_version, version_etag
+from utils.response_cache import SERVICE_PROVIDERS, ResponseCache, serialize_list
 
 
 def get_service_provider_router() -> APIRouter:
@@ -35,9 +39,11 @@ def get_service_provider_router() -> APIRouter:
     @router.put("/{provider_id}", response_model=ServiceProviderDTO, summary="Update Service Provider")
     async def update_service_provider(
         provider_id: UUID,
+        response: Response,
         name: Optional[str] = None,
         service_type: Optional[str] = None,
         email: Optional[str] = None,
+        if_match: Optional[str] = Header(None, description="ETag of the version being updated; 412 if it has changed since"),
         service: ServiceProviderService = Depends(get_service_provider_service),
         db: AsyncSession = Depends(get_db)
     ):
@@ -47,9 +53,13 @@ def get_service_provider_router() -> APIRouter:
                 name=name,
                 service_type=service_type,
                 email=email,
-                db=db
+                db=db,
+                expected_version=if_match_version(if_match)
             )
+            response.headers[ETAG_HEADER] = version_etag(provider.version)
             return provider
+        except PreconditionFailedError as e:
+            raise HTTPException(status_code=412, detail=str(e))
         except ValidationError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except DatabaseError as e:
@@ -57,6 +67,7 @@ def get_service_provider_router() -> APIRouter:
 
     @router.get("/", response_model=List[ServiceProviderDTO], summary="Get Service Providers by Filters with Pagination")
     async def get_service_providers(
+        request: Request,
         provider_id: Optional[UUID] = None,
         user_id: Optional[UUID] = None,
         service_type: Optional[str] = None,
@@ -68,12 +79,20 @@ def get_service_provider_router() -> APIRouter:
         longitude: Optional[float] = None,
         latitude: Optional[float] = None,
         radius_km: Optional[float] = None,
+        nearest: bool = Query(False, description="Order by distance from longitude/latitude, closest first"),
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         service: ServiceProviderService = Depends(get_service_provider_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
-        try:
+        params = dict(provider_id=provider_id, user_id=user_id, service_type=service_type, name=name,
+                      phone_number=phone_number, day_of_week=day_of_week, desired_time=desired_time,
+                      membership=membership, longitude=longitude, latitude=latitude, radius_km=radius_km,
+                      nearest=nearest, page=page, size=size, cursor=cursor)
+
+        async def load():
             providers = await service.get_service_providers(
                 provider_id=str(provider_id) if provider_id else None,
                 user_id=str(user_id) if user_id else None,
@@ -86,11 +105,21 @@ def get_service_provider_router() -> APIRouter:
                 longitude=longitude,
                 latitude=latitude,
                 radius_km=radius_km,
+                nearest=nearest,
                 page=page,
                 size=size,
-                db=db
+                db=db,
+                cursor=cursor
             )
-            return providers
+            headers = {}
+            if longitude is None or latitude is None:
+                following = next_cursor(providers, size, service.cursor_keyset)
+                if following is not None:
+                    headers[NEXT_CURSOR_HEADER] = following
+            return serialize_list(ServiceProviderDTO, providers, headers)
+
+        try:
+            return await cache.respond(request, SERVICE_PROVIDERS, params, load)
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
@@ -98,22 +127,32 @@ def get_service_provider_router() -> APIRouter:
 
     @router.get("/open-in", response_model=List[OpenServiceProviderDTO], summary="Get Open Service Providers for Specific Day and Time")
     async def get_open_service_providers(
+        request: Request,
         day_of_week: str,
         desired_time: time,
+        within_hours: Optional[float] = Query(None, gt=0, le=168, description="Open at any point in the next N hours instead of exactly at desired_time"),
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
         service: ServiceProviderService = Depends(get_service_provider_service),
+        cache: ResponseCache = Depends(get_response_cache),
         db: AsyncSession = Depends(get_db)
     ):
-        try:
+        params = dict(open_in=True, day_of_week=day_of_week, desired_time=desired_time, within_hours=within_hours,
+                      page=page, size=size)
+
+        async def load():
             providers = await service.get_open_service_providers(
                 day_of_week=day_of_week,
                 desired_time=desired_time,
+                within_hours=within_hours,
                 page=page,
                 size=size,
                 db=db
             )
-            return providers
+            return serialize_list(OpenServiceProviderDTO, providers)
+
+        try:
+            return await cache.respond(request, SERVICE_PROVIDERS, params, load)
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
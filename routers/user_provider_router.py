@@ -6,6 +6,7 @@ from typing import List, Optional
 
 from app.database import get_db
 from app.dependencies import get_user_provider_service
+from boundaries.bulk_create_response_boundary import BulkCreateResponseBoundary
 from boundaries.user_provider_create_boundary import UserProviderCreateBoundary
 from boundaries.user_provider_bulk_create_boundary import UserProviderBulkCreateBoundary
 from boundaries.user_provider_response_boundary import UserProviderResponseBoundary
@@ -33,7 +34,7 @@ def get_user_provider_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    @router.post("/bulk", response_model=List[UserProviderResponseBoundary], summary="Add User-Provider Associations in Bulk")
+    @router.post("/bulk", response_model=BulkCreateResponseBoundary[UserProviderResponseBoundary], summary="Add User-Provider Associations in Bulk")
     async def add_user_providers_bulk(
         bulk_boundary: UserProviderBulkCreateBoundary,
         service: UserProviderService = Depends(get_user_provider_service),
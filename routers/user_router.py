@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Path, Query, Depends, Request, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Path, Query, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.database import get_db
+from app.database import get_db, get_primary_db
 from app.dependencies import get_user_service
 from app.oauth2 import get_current_user, oauth2_scheme
 from boundaries.update_user_boundary import UpdateUserBoundary
@@ -12,8 +12,11 @@ from boundaries.new_user_boundary import NewUserBoundary
 from errors.not_found_error import NotFoundError
 from errors.validation_error import ValidationError
 from errors.database_error import DatabaseError
+from errors.service_unavailable_error import ServiceUnavailableError
 from utils.jwt_helper import create_access_token
+from utils.cursor import set_next_cursor
 from pydantic import BaseModel
+from typing import Optional
 import uuid
 
 
@@ -24,7 +27,6 @@ def get_user_router() -> APIRouter:
     async def create_new_user(
             new_user: NewUserBoundary,
             request: Request,
-            background_tasks: BackgroundTasks,
             service: UserService = Depends(get_user_service),
             db: AsyncSession = Depends(get_db)
     ):
@@ -45,12 +47,14 @@ def get_user_router() -> APIRouter:
                 request.url_for('verify_user_email', user_id=user.user_id, token=token)
             )
 
-            # Step 3: Add the email task to the background task
-            background_tasks.add_task(service.send_verification_email, user.email, verification_url)
+            # Step 3: Queue the verification email, the mail dispatcher sends it
+            await service.send_verification_email(user.email, verification_url, db=db)
 
             return user
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
+        except ServiceUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -70,11 +74,15 @@ def get_user_router() -> APIRouter:
             raise HTTPException(status_code=400, detail=str(e))
         except NotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
+        except ServiceUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
     @router.get("/", response_model=list[UserBoundary], summary="List Users")
     async def read_users(
+        response: Response,
         page: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page; takes precedence over page"),
         service: UserService = Depends(get_user_service),
         db: AsyncSession = Depends(get_db),
         token: str = Depends(oauth2_scheme)
@@ -83,7 +91,9 @@ def get_user_router() -> APIRouter:
         if role < RoleEnum.ADMIN:  # Compare roles based on rank
             raise HTTPException(status_code=403, detail="Access forbidden: higher roles only")
         try:
-            return await service.get_users(page=page, size=size, db=db)
+            users = await service.get_users(page=page, size=size, db=db, cursor=cursor)
+            set_next_cursor(response, users, size, service.cursor_keyset)
+            return users
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
         except DatabaseError as e:
@@ -109,7 +119,7 @@ def get_user_router() -> APIRouter:
         user_id: uuid.UUID,
         token: str,
         service: UserService = Depends(get_user_service),
-        db: AsyncSession = Depends(get_db)
+        db: AsyncSession = Depends(get_primary_db)  # Writes the verification flag despite being a GET
     ):
         try:
             if await service.verify_email(user_id=user_id, token=token, db=db):
@@ -122,7 +132,6 @@ def get_user_router() -> APIRouter:
     async def reset_token(
             email: str,
             request: Request,
-            background_tasks: BackgroundTasks,
             service: UserService = Depends(get_user_service),
             db: AsyncSession = Depends(get_db)
     ):
@@ -135,8 +144,8 @@ def get_user_router() -> APIRouter:
                 request.url_for('verify_user_email', user_id=user_id, token=token)
             )
 
-            # Step 3: Add the email task to background tasks
-            background_tasks.add_task(service.send_verification_email, email, verification_url)
+            # Step 3: Queue the verification email, the mail dispatcher sends it
+            await service.send_verification_email(email, verification_url, db=db)
 
             return {"message": "Token reset email sent successfully."}
 
@@ -169,6 +178,8 @@ def get_user_router() -> APIRouter:
             raise HTTPException(status_code=404, detail=str(e))
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
+        except ServiceUnavailableError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
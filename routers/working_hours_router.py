@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from app.database import get_db
 from app.dependencies import get_working_hours_service
+from boundaries.bulk_create_response_boundary import BulkCreateResponseBoundary
 from boundaries.working_hours_bulk_create_boundary import WorkingHoursBulkCreateBoundary
 from boundaries.working_hours_create_boundary import WorkingHoursCreateBoundary
 from boundaries.working_hours_response_boundary import WorkingHoursResponseBoundary
@@ -29,14 +30,13 @@ def get_working_hours_router() -> APIRouter:
         except DatabaseError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    @router.post("/bulk", response_model=List[WorkingHoursResponseBoundary], summary="Add Working Hours in Bulk")
+    @router.post("/bulk", response_model=BulkCreateResponseBoundary[WorkingHoursResponseBoundary], summary="Add Working Hours in Bulk")
     async def add_working_hours_bulk(
         bulk_boundary: WorkingHoursBulkCreateBoundary,
         service: WorkingHoursService = Depends(get_working_hours_service),
         db: AsyncSession = Depends(get_db)
     ):
         try:
-
             return await service.add_working_hours_bulk(bulk_boundary.provider_id, bulk_boundary.working_hours_list, db)
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -7,7 +7,7 @@ from entities.avatar_image_entity import AvatarImageEntity
 class AvatarImageService(ABC):
 
     @abstractmethod
-    def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> str:
+    async def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> str:
         """Generate a presigned URL for image upload, enforcing JPEG content type."""
         pass
 
@@ -18,7 +18,10 @@ class AvatarImageService(ABC):
         pass
 
     @abstractmethod
-    async def get_images_by_user(self, user_id: uuid.UUID, page: int, size: int, db: AsyncSession) -> List[
-        AvatarImageEntity]:
-        """Retrieve all avatar images for a user, with pagination."""
+    async def get_images_by_user(self, user_id: uuid.UUID, page: int, size: int, db: AsyncSession,
+                                 width: Optional[int] = None) -> List[AvatarImageEntity]:
+        """
+        Retrieve all avatar images for a user, with pagination. display_url of each image is its smallest variant
+        at least width pixels wide, or the original.
+        """
         pass
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CacheStore(ABC):
+    """Byte store shared by every worker process, backing the second tier of the response cache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically increment an integer counter, creating it at 1, and return the new value."""
+        pass
+
+    @abstractmethod
+    async def incr_if_exists(self, key: str, amount: int) -> Optional[int]:
+        """Atomically add amount to an existing counter, keeping its expiry; None, and nothing stored, if it is absent."""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class EmailService(ABC):
 
     @abstractmethod
-    def send_verification_email(self, recipient_email: str, verification_url: str):
-        pass
\ No newline at end of file
+    async def send_verification_email(self, recipient_email: str, verification_url: str, db: AsyncSession):
+        """Queue the verification email as a send_email job; it is delivered in the background by app.job_worker."""
+        pass
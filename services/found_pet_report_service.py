@@ -1,31 +1,57 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from entities.found_pet_report_entity import FoundPetReportEntity
 from boundaries.requested_found_pet_report_boundary import Location
+from utils.cursor import Keyset
+from utils.image_similarity_index import SimilarLostPet
+from utils.pet_match_index import PetMatch
 
 class FoundPetReportService(ABC):
+    # Sort order of report listings, used to build and read pagination cursors
+    cursor_keyset = Keyset(("report_date", "report_id"), (datetime, UUID))
 
     @abstractmethod
-    async def create_report(self, user_id: UUID, geo_location: Optional[Location], description: str, db: AsyncSession) -> FoundPetReportEntity:
+    async def create_report(self, user_id: UUID, geo_location: Optional[Location], description: str,
+                            species: Optional[str], breed: Optional[str], main_color: Optional[str],
+                            db: AsyncSession) -> FoundPetReportEntity:
         pass
 
     @abstractmethod
-    async def update_report(self, report_id: UUID, geo_location: Optional[Location], description: str, db: AsyncSession) -> FoundPetReportEntity:
+    async def update_report(self, report_id: UUID, geo_location: Optional[Location], description: str, db: AsyncSession,
+                            expected_version: Optional[int] = None) -> FoundPetReportEntity:
+        """Raises NotFoundError for an unknown report and PreconditionFailedError if its version is not expected_version."""
         pass
 
     @abstractmethod
     async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                      user_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float],
-                                     radius_km: Optional[float], page: int, size: int, db: AsyncSession) -> List[FoundPetReportEntity]:
+                                     radius_km: Optional[float], nearest: bool, page: int, size: int, db: AsyncSession,
+                                     cursor: Optional[str] = None) -> List[FoundPetReportEntity]:
         pass
 
     @abstractmethod
-    async def get_all_reports(self, page: int, size: int, db: AsyncSession) -> List[FoundPetReportEntity]:
+    async def export_reports(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                             user_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float],
+                             radius_km: Optional[float], db: AsyncSession) -> AsyncIterator[FoundPetReportEntity]:
+        pass
+
+    @abstractmethod
+    async def get_all_reports(self, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[FoundPetReportEntity]:
         pass
 
     @abstractmethod
     async def get_report_by_id(self, report_id: UUID, db: AsyncSession) -> Optional[FoundPetReportEntity]:
         pass
+
+    @abstractmethod
+    async def get_report_matches(self, report_id: UUID, db: AsyncSession) -> List[PetMatch]:
+        pass
+
+    @abstractmethod
+    async def get_similar_lost_pets(self, report_id: UUID, max_distance: Optional[int], radius_km: Optional[float],
+                                    db: AsyncSession) -> List[SimilarLostPet]:
+        """Lost pets whose photos look like the report's photos, near the report's location if it has one."""
+        pass
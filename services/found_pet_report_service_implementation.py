@@ -1,5 +1,6 @@
+import logging
 import uuid
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,16 +9,32 @@ from shapely import wkb
 from entities.found_pet_report_entity import FoundPetReportEntity
 from repositories.found_pet_report_repository import FoundPetReportRepository
 from services.found_pet_report_service import FoundPetReportService
+from services.job_service import JobService
+from services.pet_matching_service import PetMatchingService
 from boundaries.requested_found_pet_report_boundary import Location
+from enums.job_kind_enum import JobKindEnum
+from enums.job_queue_enum import JobQueueEnum
 from errors.database_error import DatabaseError
 from errors.validation_error import ValidationError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
+from errors.service_unavailable_error import ServiceUnavailableError
+from utils.geo_query import orders_by_distance
+from utils.image_similarity_index import SimilarLostPet
+from utils.pet_match_index import PetMatch
+from utils.response_cache import FOUND_PET_REPORTS, ResponseCache
+
+logger = logging.getLogger(__name__)
 
 
 class FoundPetReportServiceImplementation(FoundPetReportService):
 
-    def __init__(self, repository: FoundPetReportRepository):
+    def __init__(self, repository: FoundPetReportRepository, matching_service: PetMatchingService, cache: ResponseCache,
+                 jobs: JobService):
         self.repository = repository
+        self.matching_service = matching_service
+        self.cache = cache
+        self.jobs = jobs
 
     async def _convert_geo_location(self, report: FoundPetReportEntity) -> None:
         """Convert WKBElement geo_location to Location object."""
@@ -25,16 +42,34 @@ class FoundPetReportServiceImplementation(FoundPetReportService):
             point = wkb.loads(bytes(report.geo_location.data))
             report.geo_location = Location(latitude=point.y, longitude=point.x)  # Convert to Location object
 
-    async def create_report(self, user_id: uuid.UUID, geo_location: Optional[Location], description: str, db: AsyncSession) -> FoundPetReportEntity:
+    def _decode_filter_cursor(self, cursor: Optional[str], longitude: Optional[float], latitude: Optional[float],
+                              radius_km: Optional[float], nearest: bool) -> Optional[Tuple]:
+        if not cursor:
+            return None
+        if orders_by_distance(longitude, latitude, radius_km, nearest):
+            raise ValidationError("Cursor pagination is not available when ordering by distance; use page instead.")
+        return self.cursor_keyset.decode(cursor)
+
+    async def create_report(self, user_id: uuid.UUID, geo_location: Optional[Location], description: str,
+                            species: Optional[str], breed: Optional[str], main_color: Optional[str],
+                            db: AsyncSession) -> FoundPetReportEntity:
         report = FoundPetReportEntity(
             user_id=user_id,
             geo_location=geo_location,
-            description=description
+            description=description,
+            species=species,
+            breed=breed,
+            main_color=main_color
         )
         try:
             created_report = await self.repository.create(report, db)
-            await db.commit()
+            # Detached, so converting geo_location in place is never flushed back
+            db.expunge(created_report)
             await self._convert_geo_location(created_report)  # Conversion is done here
+            # Alerts are queued in the report's own transaction, so they exist exactly when the report does
+            created_report.match_candidates = await self._match_and_alert(created_report, db)
+            await db.commit()
+            await self.cache.invalidate(FOUND_PET_REPORTS)
             return created_report
         except IntegrityError as e:
             await db.rollback()
@@ -46,27 +81,54 @@ class FoundPetReportServiceImplementation(FoundPetReportService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error occurred: {str(e)}")
 
-    async def update_report(self, report_id: uuid.UUID, geo_location: Optional[Location], description: str, db: AsyncSession) -> FoundPetReportEntity:
-        report = await self.repository.get_by_id(report_id, db)
-        if not report:
-            raise NotFoundError("Found pet report not found")
+    async def _match_and_alert(self, report: FoundPetReportEntity, db: AsyncSession) -> List[PetMatch]:
+        """
+        Rank open lost reports against a new found report and queue alerts for their owners, before the report is
+        committed. Matching only reads this worker's in-memory index and is best effort: if it fails (e.g. the index
+        is not built yet), the report is still created, without candidates.
+        """
+        try:
+            matches = await self.matching_service.match_found_report(report, db)
+        except ServiceUnavailableError as e:
+            logger.warning(f"Found pet report {report.report_id} created without match candidates: {str(e)}")
+            return []
+        alerts = [{"user_id": str(match.user_id),
+                   "message": f"A found pet report may match your lost pet report {match.report_id} "
+                              f"(report {report.report_id})."}
+                  for match in matches
+                  if match.user_id is not None and match.user_id != report.user_id]
+        if alerts:
+            # A failure here fails the whole creation, so a saved report never misses its alerts
+            await self.jobs.enqueue(JobQueueEnum.NOTIFICATIONS, JobKindEnum.NOTIFY_USERS, {"notifications": alerts}, db)
+        return matches
 
-        # Check for updates
-        has_updates = False
-        if geo_location and (geo_location.longitude != report.geo_location.longitude or geo_location.latitude != report.geo_location.latitude):
-            report.geo_location = (geo_location.longitude, geo_location.latitude)
-            has_updates = True
-        if description and description != report.description:
-            report.description = description
-            has_updates = True
+    async def update_report(self, report_id: uuid.UUID, geo_location: Optional[Location], description: str, db: AsyncSession,
+                            expected_version: Optional[int] = None) -> FoundPetReportEntity:
+        values = {}
+        if geo_location:
+            values["geo_location"] = geo_location
+        if description:
+            values["description"] = description
 
-        if not has_updates:
+        if not values:
+            report = await self.repository.get_by_id(report_id, db)
+            if not report:
+                raise NotFoundError("Found pet report not found")
+            if expected_version is not None and report.version != expected_version:
+                raise PreconditionFailedError("Found pet report was modified by someone else.")
             await self._convert_geo_location(report)  # Convert the geo-location to Location object before returning
             return report
 
         try:
-            updated_report = await self.repository.update(report, db)
+            updated_report = await self.repository.update(report_id, values, expected_version, db)
+            if updated_report is None:
+                # Only the failure path pays for telling a missing report from a stale version
+                await db.rollback()
+                if await self.repository.get_by_id(report_id, db):
+                    raise PreconditionFailedError("Found pet report was modified by someone else.")
+                raise NotFoundError("Found pet report not found")
             await db.commit()
+            await self.cache.invalidate(FOUND_PET_REPORTS, report_id)
             await self._convert_geo_location(updated_report)  # Conversion is done here
             return updated_report
         except IntegrityError as e:
@@ -79,21 +141,42 @@ class FoundPetReportServiceImplementation(FoundPetReportService):
 
     async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                      user_id: Optional[uuid.UUID], longitude: Optional[float], latitude: Optional[float],
-                                     radius_km: Optional[float], page: int, size: int, db: AsyncSession) -> List[FoundPetReportEntity]:
+                                     radius_km: Optional[float], nearest: bool, page: int, size: int, db: AsyncSession,
+                                     cursor: Optional[str] = None) -> List[FoundPetReportEntity]:
+        after = self._decode_filter_cursor(cursor, longitude, latitude, radius_km, nearest)
         try:
             skip = (page - 1) * size
             reports = await self.repository.get_reports_by_filters(start_date, end_date, user_id, longitude,
-                                                                   latitude, radius_km, skip=skip, limit=size, db=db)
+                                                                   latitude, radius_km, nearest, skip=skip, limit=size, db=db,
+                                                                   after=after)
             for report in reports:
                 await self._convert_geo_location(report)  # Convert geo-location for each report
             return reports
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to fetch reports: {str(e)}")
 
-    async def get_all_reports(self, page: int, size: int, db: AsyncSession) -> List[FoundPetReportEntity]:
+    async def export_reports(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                             user_id: Optional[uuid.UUID], longitude: Optional[float], latitude: Optional[float],
+                             radius_km: Optional[float], db: AsyncSession) -> AsyncIterator[FoundPetReportEntity]:
+        try:
+            reports = await self.repository.stream_reports_by_filters(start_date, end_date, user_id, longitude,
+                                                                      latitude, radius_km, db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to export reports: {str(e)}")
+        return self._converted(reports, db)
+
+    async def _converted(self, reports: AsyncIterator[FoundPetReportEntity], db: AsyncSession) -> AsyncIterator[FoundPetReportEntity]:
+        async for report in reports:
+            # Detach first: a converted (modified) report would otherwise stay pinned in the session until the export ends
+            db.expunge(report)
+            await self._convert_geo_location(report)
+            yield report
+
+    async def get_all_reports(self, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[FoundPetReportEntity]:
+        after = self.cursor_keyset.decode(cursor) if cursor else None
         try:
             skip = (page - 1) * size
-            reports = await self.repository.get_all(skip=skip, limit=size, db=db)
+            reports = await self.repository.get_all(skip=skip, limit=size, db=db, after=after)
             for report in reports:
                 await self._convert_geo_location(report)  # Convert geo-location for each report
             return reports
@@ -109,3 +192,17 @@ class FoundPetReportServiceImplementation(FoundPetReportService):
             raise NotFoundError("Found pet report not found")
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to fetch report: {str(e)}")
+
+    async def get_report_matches(self, report_id: uuid.UUID, db: AsyncSession) -> List[PetMatch]:
+        report = await self.get_report_by_id(report_id, db)
+        return await self.matching_service.match_found_report(report, db)
+
+    async def get_similar_lost_pets(self, report_id: uuid.UUID, max_distance: Optional[int],
+                                    radius_km: Optional[float], db: AsyncSession) -> List[SimilarLostPet]:
+        report = await self.get_report_by_id(report_id, db)
+        try:
+            perceptual_hashes = await self.repository.get_image_hashes(report_id, db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to fetch report photos: {str(e)}")
+        return await self.matching_service.find_similar_lost_pets(report, perceptual_hashes, max_distance,
+                                                                  radius_km, db)
@@ -4,11 +4,11 @@ from entities.image_entity import ImageEntity
 
 class ImageService(ABC):
     @abstractmethod
-    def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> str:
+    async def generate_presigned_url(self, object_name: str, expiration: int = 3600) -> str:
         pass
 
     @abstractmethod
-    def generate_presigned_get_url(self, object_name: str, expiration: int = 3600)-> str:
+    async def generate_presigned_get_url(self, object_name: str, expiration: int = 3600)-> str:
         pass
     @abstractmethod
     def upload_image(self, object_name:str, url: str, user_email: str) -> ImageEntity:
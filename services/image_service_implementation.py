@@ -1,35 +1,19 @@
 from typing import List
 from entities.image_entity import ImageEntity
 from repositories.image_repository import ImageRepository
-import boto3
-from botocore.exceptions import NoCredentialsError
 from services.image_service import ImageService
+from services.object_storage_service import ObjectStorageService
 
 class ImageServiceImplementation(ImageService):
-    def __init__(self, repository: ImageRepository, s3_client: boto3.client, bucket_name: str):
+    def __init__(self, repository: ImageRepository, storage: ObjectStorageService):
         self.repository = repository
-        self.s3_client = s3_client
-        self.bucket_name = bucket_name
+        self.storage = storage
 
-    def generate_presigned_url(self, object_name: str, expiration: int = 3600):
-        try:
-            response = self.s3_client.generate_presigned_url('put_object',
-                Params={'Bucket': self.bucket_name, 'Key': object_name},
-                ExpiresIn=expiration
-            )
-        except NoCredentialsError:
-            raise Exception("Credentials not available")
-        return response
+    async def generate_presigned_url(self, object_name: str, expiration: int = 3600):
+        return await self.storage.presign_upload(object_name, expiration)
 
-    def generate_presigned_get_url(self, object_name: str, expiration: int = 3600):
-        try:
-            response = self.s3_client.generate_presigned_url('get_object',
-                Params={'Bucket': self.bucket_name, 'Key': object_name},
-                ExpiresIn=expiration
-            )
-        except NoCredentialsError:
-            raise Exception("Credentials not available")
-        return response
+    async def generate_presigned_get_url(self, object_name: str, expiration: int = 3600):
+        return await self.storage.presign_download(object_name, expiration)
 
     def upload_image(self, object_name: str, url: str, user_email: str) -> ImageEntity:
         image = ImageEntity(id=object_name, url=url, user_email=user_email)
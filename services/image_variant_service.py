@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from sqlalchemy.ext.asyncio import AsyncSession
+import uuid
+from typing import Any, List, Optional, Sequence
+from entities.image_variant_entity import ImageVariantEntity
+
+
+class ImageVariantService(ABC):
+    """
+    Interface for the ImageVariantService. Derives resized WebP variants from uploaded images and picks the one a
+    client should download.
+    """
+
+    @abstractmethod
+    async def request_variants(self, source_key: str, db: AsyncSession) -> None:
+        """Queue the variants of an uploaded object in the caller's transaction; they are made in the background."""
+        pass
+
+    @abstractmethod
+    async def create_variants(self, source_key: str, db: AsyncSession) -> List[ImageVariantEntity]:
+        """
+        Download the original, render and upload its variants and add their rows, and record the original's
+        perceptual hash on the pet or found-pet image uploaded under source_key. The commit is left to the caller.
+        Raises NotFoundError if nothing was uploaded under source_key and ValidationError if it is not an image.
+        """
+        pass
+
+    @abstractmethod
+    async def start_perceptual_hash_backfill(self, db: AsyncSession) -> bool:
+        """
+        Queue the backfill of perceptual hashes for pet and found-pet images uploaded before they were hashed,
+        unless it was queued before. Returns whether it was queued now; the commit is left to the caller.
+        """
+        pass
+
+    @abstractmethod
+    async def backfill_perceptual_hashes(self, table: str, after: Optional[uuid.UUID], db: AsyncSession) -> int:
+        """
+        Queue variant jobs (which record the hash) for one batch of the images of a table that have no perceptual
+        hash, starting after the given image_id, and queue the backfill of the next batch. Returns the batch size.
+        """
+        pass
+
+    @abstractmethod
+    async def attach_variants(self, images: Sequence[Any], key_attribute: str, width: Optional[int],
+                              db: AsyncSession) -> None:
+        """
+        Set `variants` and `display_url` on each image entity, loading the variants of all of them with one query.
+        display_url is the smallest variant at least width pixels wide, or the original when there is none (no
+        width asked for, the original is already small, or its variants are not made yet).
+        :param key_attribute: Attribute of the entities that holds the object key of the original.
+        """
+        pass
@@ -0,0 +1,129 @@
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional, Sequence
+from entities.image_variant_entity import ImageVariantEntity
+from enums.job_kind_enum import JobKindEnum
+from enums.job_queue_enum import JobQueueEnum
+from errors.database_error import DatabaseError
+from errors.not_found_error import NotFoundError
+from repositories.image_variant_repository import ImageVariantRepository
+from services.image_variant_service import ImageVariantService
+from services.job_service import JobService
+from services.object_storage_service import ObjectStorageService
+from utils.image_resizer import VARIANT_CONTENT_TYPE, ImageResizer
+from utils.perceptual_hash import to_signed
+
+logger = logging.getLogger(__name__)
+
+# Images without a perceptual hash queued for variants per backfill job, and the pause before the next job, so
+# variants of new uploads wait behind at most one batch
+PERCEPTUAL_HASH_BACKFILL_BATCH_SIZE = int(os.getenv("PERCEPTUAL_HASH_BACKFILL_BATCH_SIZE", 500))
+PERCEPTUAL_HASH_BACKFILL_DELAY_SECONDS = float(os.getenv("PERCEPTUAL_HASH_BACKFILL_DELAY_SECONDS", 60))
+
+# Image tables whose rows carry a perceptual hash, in the order the backfill goes through them
+HASHED_IMAGE_TABLES = ("pet_images", "found_pet_images")
+# Fixed, so the backfill is queued once however many workers start and however often
+PERCEPTUAL_HASH_BACKFILL_JOB_ID = uuid.uuid5(uuid.NAMESPACE_URL, "jobs/backfill_perceptual_hashes")
+
+
+class ImageVariantServiceImplementation(ImageVariantService):
+    def __init__(self, repository: ImageVariantRepository, storage: ObjectStorageService, resizer: ImageResizer,
+                 jobs: Optional[JobService] = None):
+        self.repository = repository
+        self.storage = storage
+        self.resizer = resizer
+        self.jobs = jobs
+
+    @staticmethod
+    def variant_key(source_key: str, name: str) -> str:
+        return f"variants/{source_key}/{name}.webp"
+
+    async def request_variants(self, source_key: str, db: AsyncSession) -> None:
+        await self.jobs.enqueue(JobQueueEnum.IMAGES, JobKindEnum.CREATE_IMAGE_VARIANTS, {"source_key": source_key}, db)
+
+    async def create_variants(self, source_key: str, db: AsyncSession) -> List[ImageVariantEntity]:
+        original = await self.storage.get_object(source_key)
+        if original is None:
+            raise NotFoundError(f"No uploaded object '{source_key}'")
+        rendered = await self.resizer.render(original)
+
+        variants = []
+        for variant in rendered.variants:
+            object_key = self.variant_key(source_key, variant.name)
+            # Keys are fixed per variant, so a job that runs again overwrites instead of leaving orphans
+            await self.storage.put_object(object_key, variant.data, content_type=VARIANT_CONTENT_TYPE)
+            variants.append(ImageVariantEntity(
+                source_key=source_key,
+                name=variant.name,
+                object_key=object_key,
+                url=self.storage.public_url(object_key),
+                content_type=VARIANT_CONTENT_TYPE,
+                width=variant.width,
+                height=variant.height,
+                size_bytes=len(variant.data)
+            ))
+        try:
+            result = await self.repository.add_all(variants, db)
+            await self.repository.set_perceptual_hash(source_key, to_signed(rendered.perceptual_hash), db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to save the variants of '{source_key}': {str(e)}")
+        logger.info(f"Created {len(result.created)} variants of '{source_key}' "
+                    f"({len(original)} bytes down to {', '.join(str(v.size_bytes) for v in variants) or 'none'})")
+        return result.created
+
+    async def start_perceptual_hash_backfill(self, db: AsyncSession) -> bool:
+        if await self.jobs.exists(PERCEPTUAL_HASH_BACKFILL_JOB_ID, db):
+            return False
+        await self.jobs.enqueue(JobQueueEnum.DEFAULT, JobKindEnum.BACKFILL_PERCEPTUAL_HASHES,
+                                {"table": HASHED_IMAGE_TABLES[0], "after": None}, db,
+                                job_id=PERCEPTUAL_HASH_BACKFILL_JOB_ID)
+        return True
+
+    async def backfill_perceptual_hashes(self, table: str, after: Optional[uuid.UUID], db: AsyncSession) -> int:
+        try:
+            images = await self.repository.get_unhashed_images(table, after, PERCEPTUAL_HASH_BACKFILL_BATCH_SIZE, db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to fetch {table} without a perceptual hash: {str(e)}")
+        for _, source_key in images:
+            await self.request_variants(source_key, db)
+
+        # The next batch of this table, or the first of the next table once this one is done
+        if len(images) == PERCEPTUAL_HASH_BACKFILL_BATCH_SIZE:
+            payload = {"table": table, "after": str(images[-1][0])}
+        elif table != HASHED_IMAGE_TABLES[-1]:
+            payload = {"table": HASHED_IMAGE_TABLES[HASHED_IMAGE_TABLES.index(table) + 1], "after": None}
+        else:
+            payload = None
+        if payload is not None:
+            await self.jobs.enqueue(JobQueueEnum.DEFAULT, JobKindEnum.BACKFILL_PERCEPTUAL_HASHES, payload, db,
+                                    run_at=datetime.now(timezone.utc)
+                                    + timedelta(seconds=PERCEPTUAL_HASH_BACKFILL_DELAY_SECONDS))
+        logger.info(f"Queued variants of {len(images)} {table} without a perceptual hash"
+                    + ("" if payload else "; perceptual hash backfill finished"))
+        return len(images)
+
+    @staticmethod
+    def pick_variant(variants: Sequence[ImageVariantEntity], width: Optional[int]) -> Optional[ImageVariantEntity]:
+        """The smallest variant at least width pixels wide; variants are ordered by width."""
+        if width is None:
+            return None
+        return next((variant for variant in variants if variant.width >= width), None)
+
+    async def attach_variants(self, images: Sequence[Any], key_attribute: str, width: Optional[int],
+                              db: AsyncSession) -> None:
+        try:
+            found = await self.repository.get_by_source_keys([getattr(image, key_attribute) for image in images], db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to fetch image variants: {str(e)}")
+        by_source = defaultdict(list)
+        for variant in found:
+            by_source[variant.source_key].append(variant)
+        for image in images:
+            image.variants = by_source.get(getattr(image, key_attribute), [])
+            chosen = self.pick_variant(image.variants, width)
+            image.display_url = chosen.url if chosen else image.url
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+import uuid
+from typing import Any, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from entities.job_entity import JobEntity
+from enums.job_kind_enum import JobKindEnum
+from enums.job_queue_enum import JobQueueEnum
+
+
+class JobService(ABC):
+
+    @abstractmethod
+    async def enqueue(self, queue: JobQueueEnum, kind: JobKindEnum, payload: Dict[str, Any], db: AsyncSession,
+                      run_at: Optional[datetime] = None, job_id: Optional[uuid.UUID] = None) -> JobEntity:
+        """
+        Queue a job in the caller's transaction: it runs in the background (app.job_worker) once the caller commits,
+        and is never queued if the caller rolls back. The payload must be JSON serializable. A fixed job_id makes
+        the job one-off: queuing it again fails with DatabaseError, even after it has run.
+        """
+        pass
+
+    @abstractmethod
+    async def exists(self, job_id: uuid.UUID, db: AsyncSession) -> bool:
+        """Whether a job with this id was ever queued, whatever its status."""
+        pass
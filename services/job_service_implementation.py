@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from entities.job_entity import JobEntity
+from enums.job_kind_enum import JobKindEnum
+from enums.job_queue_enum import JobQueueEnum
+from errors.database_error import DatabaseError
+from repositories.job_repository import JobRepository
+from services.job_service import JobService
+
+
+class JobServiceImplementation(JobService):
+
+    def __init__(self, repository: JobRepository, max_attempts: int,
+                 on_enqueued: Optional[Callable[[str], None]] = None):
+        self.repository = repository
+        self.max_attempts = max_attempts
+        self.on_enqueued = on_enqueued
+
+    async def enqueue(self, queue: JobQueueEnum, kind: JobKindEnum, payload: Dict[str, Any], db: AsyncSession,
+                      run_at: Optional[datetime] = None, job_id: Optional[uuid.UUID] = None) -> JobEntity:
+        job = JobEntity(queue=queue.value, kind=kind.value, payload=payload, max_attempts=self.max_attempts)
+        if run_at is not None:
+            job.run_at = run_at
+        if job_id is not None:
+            job.job_id = job_id
+        try:
+            job = await self.repository.enqueue(job, db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to queue {kind.value} job: {str(e)}")
+
+        if self.on_enqueued and run_at is None:
+            # Wake the queue's worker once the job is visible, instead of leaving it for the next poll
+            event.listen(db.sync_session, "after_commit", lambda session: self.on_enqueued(queue.value), once=True)
+        return job
+
+    async def exists(self, job_id: uuid.UUID, db: AsyncSession) -> bool:
+        try:
+            return await self.repository.exists(job_id, db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to look up job {job_id}: {str(e)}")
@@ -0,0 +1,54 @@
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from services.cache_store import CacheStore
+
+
+class LocalCacheStoreImplementation(CacheStore):
+    """
+    In-process stand-in for Redis, for development and tests.
+    Only shared within one process, so it exercises the shared tier code path without a server.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        if len(self._values) >= self.max_entries:
+            now = time.monotonic()
+            self._values = {k: entry for k, entry in self._values.items() if entry[1] > now}
+            if len(self._values) >= self.max_entries:
+                # Evict the oldest value, never a counter
+                oldest = next((k for k, entry in self._values.items() if entry[1] != math.inf), None)
+                if oldest is not None:
+                    del self._values[oldest]
+        self._values[key] = (value, time.monotonic() + ttl_seconds)
+
+    async def incr(self, key: str) -> int:
+        # Stored like Redis does, as the decimal string of a value that never expires
+        value = int(await self.get(key) or 0) + 1
+        self._values[key] = (str(value).encode(), math.inf)
+        return value
+
+    async def incr_if_exists(self, key: str, amount: int) -> Optional[int]:
+        if await self.get(key) is None:
+            return None
+        value, expires_at = self._values[key]
+        value = int(value) + amount
+        self._values[key] = (str(value).encode(), expires_at)
+        return value
+
+    async def close(self) -> None:
+        self._values.clear()
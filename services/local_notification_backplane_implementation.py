@@ -0,0 +1,25 @@
+from typing import Optional, Sequence
+
+from services.notification_backplane import MessageHandler, NotificationBackplane
+
+
+class LocalNotificationBackplaneImplementation(NotificationBackplane):
+    """
+    In-process stand-in for Redis pub/sub, for development, tests and single-worker deployments.
+    Messages only reach the publishing process.
+    """
+
+    def __init__(self):
+        self._handler: Optional[MessageHandler] = None
+
+    async def subscribe(self, handler: MessageHandler) -> None:
+        self._handler = handler
+
+    async def publish(self, messages: Sequence[bytes]) -> None:
+        if self._handler is None:
+            return
+        for message in messages:
+            await self._handler(message)
+
+    async def close(self) -> None:
+        self._handler = None
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import time
+from typing import Optional
+from urllib.parse import quote, urlparse
+
+from errors.storage_error import StorageError
+from services.object_storage_service import ObjectStorageService
+
+
+class LocalObjectStorageServiceImplementation(ObjectStorageService):
+    """
+    Filesystem stand-in for S3, for development and tests.
+    Objects live under root_dir; "presigned" URLs point at base_url and are not signed. The app serves base_url
+    itself (routers.local_storage_router) unless it points elsewhere.
+    """
+
+    def __init__(self, root_dir: str, base_url: str):
+        self.root_dir = os.path.abspath(root_dir)
+        self.base_url = base_url.rstrip('/')
+        self.base_path = urlparse(self.base_url).path
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root_dir, key))
+        if os.path.commonpath([path, self.root_dir]) != self.root_dir:
+            raise StorageError(f"Invalid object key: {key}")
+        return path
+
+    def _expiring_url(self, key: str, expiration: int) -> str:
+        return f"{self.public_url(key)}?expires={int(time.time()) + expiration}"
+
+    async def presign_upload(self, key: str, expiration: int = 3600, content_type: Optional[str] = None) -> str:
+        self.path_for(key)
+        return self._expiring_url(key, expiration)
+
+    async def presign_download(self, key: str, expiration: int = 3600) -> str:
+        self.path_for(key)
+        return self._expiring_url(key, expiration)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.isfile, self.path_for(key))
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        try:
+            with open(path, 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written next to the target and renamed, so readers never see a partial object
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(data)
+        os.replace(temporary_path, path)
+
+    async def get_object(self, key: str) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(self._read, self.path_for(key))
+        except OSError as e:
+            raise StorageError(f"Failed to read object '{key}': {str(e)}")
+
+    async def put_object(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        try:
+            await asyncio.to_thread(self._write, self.path_for(key), data)
+        except OSError as e:
+            raise StorageError(f"Failed to write object '{key}': {str(e)}")
+
+    def public_url(self, key: str) -> str:
+        return f"{self.base_url}/{quote(key)}"
+
+    def key_from_url(self, url: str) -> str:
+        key = super().key_from_url(url)
+        prefix = self.base_path.lstrip('/')
+        if prefix and key.startswith(f"{prefix}/"):
+            key = key[len(prefix) + 1:]
+        return key
+
+    async def close(self) -> None:
+        pass
@@ -1,26 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from datetime import datetime
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.lost_pet_report_entity import LostPetReportEntity
 from boundaries.lost_pet_report_boundary import Location
+from utils.cursor import Keyset
 
 class LostPetReportService(ABC):
+    # Sort order of report listings, used to build and read pagination cursors
+    cursor_keyset = Keyset(("report_date", "report_id"), (datetime, UUID))
+
     @abstractmethod
     async def create_report(self, pet_id: UUID, user_id: UUID, geo_location: Optional[Location], description: str, status: str, db: AsyncSession) -> LostPetReportEntity:
         pass
 
     @abstractmethod
-    async def update_report(self, report_id: UUID, geo_location: Optional[Location], description: str, status: str, db: AsyncSession) -> LostPetReportEntity:
+    async def update_report(self, report_id: UUID, geo_location: Optional[Location], description: str, status: str, db: AsyncSession,
+                            expected_version: Optional[int] = None) -> LostPetReportEntity:
+        pass
+
+    @abstractmethod
+    async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str], user_id: Optional[UUID], pet_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float], nearest: bool, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[LostPetReportEntity]:
         pass
 
     @abstractmethod
-    async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str], user_id: Optional[UUID], pet_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float], page: int, size: int, db: AsyncSession) -> List[LostPetReportEntity]:
+    async def export_reports(self, start_date: Optional[datetime], end_date: Optional[datetime], status: Optional[str], user_id: Optional[UUID], pet_id: Optional[UUID], longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float], db: AsyncSession) -> AsyncIterator[LostPetReportEntity]:
         pass
 
     @abstractmethod
-    async def get_all_reports(self, page: int, size: int, db: AsyncSession) -> List[LostPetReportEntity]:
+    async def get_all_reports(self, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[LostPetReportEntity]:
         pass
 
     @abstractmethod
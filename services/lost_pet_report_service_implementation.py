@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,16 +8,27 @@ from shapely import wkb
 from entities.lost_pet_report_entity import LostPetReportEntity
 from repositories.lost_pet_report_repository import LostPetReportRepository
 from services.lost_pet_report_service import LostPetReportService
+from services.job_service import JobService
+from services.pet_matching_service import PetMatchingService
 from boundaries.lost_pet_report_boundary import Location
+from enums.job_kind_enum import JobKindEnum
+from enums.job_queue_enum import JobQueueEnum
 from errors.database_error import DatabaseError
 from errors.validation_error import ValidationError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
+from utils.geo_query import orders_by_distance
+from utils.response_cache import LOST_PET_REPORTS, ResponseCache
 
 
 class LostPetReportServiceImplementation(LostPetReportService):
 
-    def __init__(self, repository: LostPetReportRepository):
+    def __init__(self, repository: LostPetReportRepository, matching_service: PetMatchingService, cache: ResponseCache,
+                 jobs: JobService):
         self.repository = repository
+        self.matching_service = matching_service
+        self.cache = cache
+        self.jobs = jobs
 
     async def _convert_geo_location(self, report: LostPetReportEntity) -> LostPetReportEntity:
         if isinstance(report.geo_location, WKBElement):
@@ -25,6 +36,14 @@ class LostPetReportServiceImplementation(LostPetReportService):
             report.geo_location = Location(latitude=point.y, longitude=point.x)
         return report
 
+    def _decode_filter_cursor(self, cursor: Optional[str], longitude: Optional[float], latitude: Optional[float],
+                              radius_km: Optional[float], nearest: bool) -> Optional[Tuple]:
+        if not cursor:
+            return None
+        if orders_by_distance(longitude, latitude, radius_km, nearest):
+            raise ValidationError("Cursor pagination is not available when ordering by distance; use page instead.")
+        return self.cursor_keyset.decode(cursor)
+
     async def create_report(self, pet_id: uuid.UUID, user_id: uuid.UUID, geo_location: Optional[Location], description: str, status: str, db: AsyncSession) -> LostPetReportEntity:
         report = LostPetReportEntity(
             pet_id=pet_id,
@@ -36,6 +55,8 @@ class LostPetReportServiceImplementation(LostPetReportService):
         try:
             created_report = await self.repository.create(report, db)
             await db.commit()
+            await self.cache.invalidate(LOST_PET_REPORTS)
+            await self.matching_service.refresh_lost_report(created_report.report_id, db)
             return await self._convert_geo_location(created_report)
         except IntegrityError as e:
             await db.rollback()
@@ -47,28 +68,41 @@ class LostPetReportServiceImplementation(LostPetReportService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error occurred: {str(e)}")
 
-    async def update_report(self, report_id: uuid.UUID, geo_location: Optional[Location], description: str, status: str, db: AsyncSession) -> LostPetReportEntity:
-        report = await self.repository.get_by_id(report_id, db)
-        if not report:
-            raise NotFoundError("Lost pet report not found")
-
-        has_updates = False
-        if geo_location and geo_location != report.geo_location:
-            report.geo_location = geo_location
-            has_updates = True
-        if description and description != report.description:
-            report.description = description
-            has_updates = True
-        if status and status != report.status:
-            report.status = status
-            has_updates = True
+    async def update_report(self, report_id: uuid.UUID, geo_location: Optional[Location], description: str, status: str, db: AsyncSession,
+                            expected_version: Optional[int] = None) -> LostPetReportEntity:
+        values = {}
+        if geo_location:
+            values["geo_location"] = geo_location
+        if description:
+            values["description"] = description
+        if status:
+            values["status"] = status
 
-        if not has_updates:
-            return report
+        if not values:
+            report = await self.repository.get_by_id(report_id, db)
+            if not report:
+                raise NotFoundError("Lost pet report not found")
+            if expected_version is not None and report.version != expected_version:
+                raise PreconditionFailedError("Lost pet report was modified by someone else.")
+            return await self._convert_geo_location(report)
 
         try:
-            updated_report = await self.repository.update(report, db)
+            updated_report = await self.repository.update(report_id, values, expected_version, db)
+            if updated_report is None:
+                # Only the failure path pays for telling a missing report from a stale version
+                await db.rollback()
+                if await self.repository.get_by_id(report_id, db):
+                    raise PreconditionFailedError("Lost pet report was modified by someone else.")
+                raise NotFoundError("Lost pet report not found")
+            if "status" in values:
+                # Queued in the same transaction, so the owner is told exactly when the change is committed
+                message = f"Your lost pet report {report_id} is now {updated_report.status}."
+                await self.jobs.enqueue(JobQueueEnum.NOTIFICATIONS, JobKindEnum.NOTIFY_USERS,
+                                        {"notifications": [{"user_id": str(updated_report.user_id), "message": message}]},
+                                        db)
             await db.commit()
+            await self.cache.invalidate(LOST_PET_REPORTS, report_id)
+            await self.matching_service.refresh_lost_report(updated_report.report_id, db)
             return await self._convert_geo_location(updated_report)
         except IntegrityError as e:
             await db.rollback()
@@ -81,11 +115,14 @@ class LostPetReportServiceImplementation(LostPetReportService):
     async def get_reports_by_filters(self, start_date: Optional[datetime], end_date: Optional[datetime],
                                      status: Optional[str], user_id: Optional[uuid.UUID], pet_id: Optional[uuid.UUID],
                                      longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float],
-                                     page: int, size: int, db: AsyncSession) -> List[LostPetReportEntity]:
+                                     nearest: bool, page: int, size: int, db: AsyncSession,
+                                     cursor: Optional[str] = None) -> List[LostPetReportEntity]:
+        after = self._decode_filter_cursor(cursor, longitude, latitude, radius_km, nearest)
         try:
             skip = (page - 1) * size
             reports = await self.repository.get_reports_by_filters(
-                start_date, end_date, status, user_id, pet_id, longitude, latitude, radius_km, skip=skip, limit=size, db=db
+                start_date, end_date, status, user_id, pet_id, longitude, latitude, radius_km, nearest, skip=skip, limit=size, db=db,
+                after=after
             )
             for report in reports:
                 await self._convert_geo_location(report)
@@ -93,10 +130,29 @@ class LostPetReportServiceImplementation(LostPetReportService):
         except SQLAlchemyError as e:
             raise DatabaseError(f"Failed to fetch reports: {str(e)}")
 
-    async def get_all_reports(self, page: int, size: int, db: AsyncSession) -> List[LostPetReportEntity]:
+    async def export_reports(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                             status: Optional[str], user_id: Optional[uuid.UUID], pet_id: Optional[uuid.UUID],
+                             longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float],
+                             db: AsyncSession) -> AsyncIterator[LostPetReportEntity]:
+        try:
+            reports = await self.repository.stream_reports_by_filters(
+                start_date, end_date, status, user_id, pet_id, longitude, latitude, radius_km, db
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to export reports: {str(e)}")
+        return self._converted(reports, db)
+
+    async def _converted(self, reports: AsyncIterator[LostPetReportEntity], db: AsyncSession) -> AsyncIterator[LostPetReportEntity]:
+        async for report in reports:
+            # Detach first: a converted (modified) report would otherwise stay pinned in the session until the export ends
+            db.expunge(report)
+            yield await self._convert_geo_location(report)
+
+    async def get_all_reports(self, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[LostPetReportEntity]:
+        after = self.cursor_keyset.decode(cursor) if cursor else None
         try:
             skip = (page - 1) * size
-            reports = await self.repository.get_all(skip=skip, limit=size, db=db)
+            reports = await self.repository.get_all(skip=skip, limit=size, db=db, after=after)
             for report in reports:
                 await self._convert_geo_location(report)
             return reports
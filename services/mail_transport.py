@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+
+
+class MailTransport(ABC):
+
+    @abstractmethod
+    async def send(self, message: EmailMessage) -> None:
+        """Deliver one message, raising MailDeliveryError when the server does not accept it."""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.medical_history_entity import MedicalHistoryEntity
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 import uuid
+from utils.bulk_insert import BulkInsertResult
 
 
 class MedicalHistoryService(ABC):
@@ -18,11 +19,11 @@ class MedicalHistoryService(ABC):
     async def update_medical_history(self, record_id: uuid.UUID, pet_id: uuid.UUID, visit_date: datetime,
                                      diagnosis: Optional[str], treatment: Optional[str],
                                      notes: Optional[str], veterinarian_name: Optional[str],
-                                     db: AsyncSession) -> MedicalHistoryEntity:
+                                     db: AsyncSession, expected_version: Optional[int] = None) -> MedicalHistoryEntity:
         pass
 
     @abstractmethod
-    async def create_all_medical_histories(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> List[MedicalHistoryEntity]:
+    async def create_all_medical_histories(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
@@ -34,3 +35,9 @@ class MedicalHistoryService(ABC):
                                        diagnosis: Optional[str], veterinarian_name: Optional[str],
                                        pet_id: Optional[uuid.UUID], db: AsyncSession) -> List[MedicalHistoryEntity]:
         pass
+
+    @abstractmethod
+    async def export_medical_histories(self, start_date: Optional[datetime], end_date: Optional[datetime],
+                                       diagnosis: Optional[str], veterinarian_name: Optional[str],
+                                       pet_id: Optional[uuid.UUID], db: AsyncSession) -> AsyncIterator[MedicalHistoryEntity]:
+        pass
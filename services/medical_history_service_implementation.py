@@ -2,19 +2,23 @@ from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from errors.database_error import DatabaseError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
 from errors.validation_error import ValidationError
 from repositories.medical_history_repository import MedicalHistoryRepository
 from entities.medical_history_entity import MedicalHistoryEntity
 from services.medical_history_service import MedicalHistoryService
-from typing import List, Optional
+from utils.bulk_insert import BulkInsertResult
+from utils.response_cache import MEDICAL_HISTORIES, ResponseCache
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 import uuid
 
 
 class MedicalHistoryServiceImplementation(MedicalHistoryService):
 
-    def __init__(self, repository: MedicalHistoryRepository):
+    def __init__(self, repository: MedicalHistoryRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
 
     async def create_medical_history(self, pet_id: uuid.UUID, visit_date: datetime, diagnosis: Optional[str], treatment: Optional[str], notes: Optional[str], veterinarian_name: Optional[str], db: AsyncSession) -> MedicalHistoryEntity:
         medical_history = MedicalHistoryEntity(
@@ -39,41 +43,32 @@ class MedicalHistoryServiceImplementation(MedicalHistoryService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error occurred during medical history creation: {str(e)}")
 
-    async def update_medical_history(self, record_id: uuid.UUID, pet_id: uuid.UUID, visit_date: datetime, diagnosis: Optional[str], treatment: Optional[str], notes: Optional[str], veterinarian_name: Optional[str], db: AsyncSession) -> MedicalHistoryEntity:
-        medical_history = await self.repository.get_by_id(record_id, db)
-        if not medical_history:
-            raise NotFoundError(f"Medical history with ID '{record_id}' not found.")
-
-        # Track if any data was actually updated
-        has_updates = False
-
-        # Check and apply updates if there are new values
-        if pet_id and pet_id != medical_history.pet_id:
-            medical_history.pet_id = pet_id
-            has_updates = True
-        if visit_date and visit_date != medical_history.visit_date:
-            medical_history.visit_date = visit_date
-            has_updates = True
-        if diagnosis and diagnosis != medical_history.diagnosis:
-            medical_history.diagnosis = diagnosis
-            has_updates = True
-        if treatment and treatment != medical_history.treatment:
-            medical_history.treatment = treatment
-            has_updates = True
-        if notes and notes != medical_history.notes:
-            medical_history.notes = notes
-            has_updates = True
-        if veterinarian_name and veterinarian_name != medical_history.veterinarian_name:
-            medical_history.veterinarian_name = veterinarian_name
-            has_updates = True
+    async def update_medical_history(self, record_id: uuid.UUID, pet_id: uuid.UUID, visit_date: datetime, diagnosis: Optional[str], treatment: Optional[str], notes: Optional[str], veterinarian_name: Optional[str], db: AsyncSession,
+                                     expected_version: Optional[int] = None) -> MedicalHistoryEntity:
+        # Only the provided values are written
+        provided = dict(pet_id=pet_id, visit_date=visit_date, diagnosis=diagnosis, treatment=treatment, notes=notes,
+                        veterinarian_name=veterinarian_name)
+        values = {column: value for column, value in provided.items() if value}
 
         # If there are no changes, skip the update
-        if not has_updates:
+        if not values:
+            medical_history = await self.repository.get_by_id(record_id, db)
+            if not medical_history:
+                raise NotFoundError(f"Medical history with ID '{record_id}' not found.")
+            if expected_version is not None and medical_history.version != expected_version:
+                raise PreconditionFailedError(f"Medical history with ID '{record_id}' was modified by someone else.")
             return medical_history  # Return the current state without updating the database
 
         try:
-            medical_history = await self.repository.update(medical_history, db)
+            medical_history = await self.repository.update(record_id, values, expected_version, db)
+            if medical_history is None:
+                # Only the failure path pays for telling a missing record from a stale version
+                await db.rollback()
+                if await self.repository.get_by_id(record_id, db):
+                    raise PreconditionFailedError(f"Medical history with ID '{record_id}' was modified by someone else.")
+                raise NotFoundError(f"Medical history with ID '{record_id}' not found.")
             await db.commit()
+            await self.cache.invalidate(MEDICAL_HISTORIES, record_id)
             return medical_history
         except IntegrityError as e:
             await db.rollback()
@@ -83,11 +78,13 @@ class MedicalHistoryServiceImplementation(MedicalHistoryService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error occurred during medical history update: {str(e)}")
 
-    async def create_all_medical_histories(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> List[MedicalHistoryEntity]:
+    async def create_all_medical_histories(self, medical_histories: List[MedicalHistoryEntity], db: AsyncSession) -> BulkInsertResult:
         try:
-            medical_histories = await self.repository.create_all(medical_histories, db)
+            result = await self.repository.create_all(medical_histories, db)
             await db.commit()
-            return medical_histories
+            if result.created:
+                await self.cache.invalidate(MEDICAL_HISTORIES)
+            return result
         except IntegrityError as e:
             await db.rollback()
             error_message = str(e.orig)
@@ -110,3 +107,9 @@ class MedicalHistoryServiceImplementation(MedicalHistoryService):
             return await self.repository.filter_by_criteria(start_date, end_date, diagnosis, veterinarian_name, pet_id, db)
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error filtering medical histories: {str(e)}")
+
+    async def export_medical_histories(self, start_date: Optional[datetime], end_date: Optional[datetime], diagnosis: Optional[str], veterinarian_name: Optional[str], pet_id: Optional[uuid.UUID], db: AsyncSession) -> AsyncIterator[MedicalHistoryEntity]:
+        try:
+            return await self.repository.stream_by_criteria(start_date, end_date, diagnosis, veterinarian_name, pet_id, db)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Error exporting medical histories: {str(e)}")
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Sequence
+
+MessageHandler = Callable[[bytes], Awaitable[None]]
+
+
+class NotificationBackplane(ABC):
+    """Pub/sub channel between worker processes, so a notification published by any worker reaches every worker."""
+
+    @abstractmethod
+    async def subscribe(self, handler: MessageHandler) -> None:
+        """Start calling handler with every message published from now on, by this or any other worker."""
+        pass
+
+    @abstractmethod
+    async def publish(self, messages: Sequence[bytes]) -> None:
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
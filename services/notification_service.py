@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from entities.notification_entity import NotificationEntity
+from typing import List, Optional, Sequence
+import uuid
+from utils.cursor import Keyset
+
+
+class NotificationService(ABC):
+    """
+    Interface for the NotificationService. Defines the read side of a user's notification inbox.
+    """
+
+    # Inbox order, newest first, used to build and read pagination cursors
+    cursor_keyset = Keyset(("date", "notification_id"), (datetime, uuid.UUID))
+
+    @abstractmethod
+    async def get_notifications(self, user_id: uuid.UUID, status: Optional[str], size: int, db: AsyncSession,
+                                cursor: Optional[str] = None) -> List[NotificationEntity]:
+        pass
+
+    @abstractmethod
+    async def get_unread_count(self, user_id: uuid.UUID, db: AsyncSession) -> int:
+        pass
+
+    @abstractmethod
+    async def mark_read(self, user_id: uuid.UUID, notification_ids: Optional[Sequence[uuid.UUID]],
+                        db: AsyncSession) -> int:
+        """Mark the given notifications (all unread ones if None) as read and return how many changed."""
+        pass
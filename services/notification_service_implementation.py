@@ -0,0 +1,41 @@
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from entities.notification_entity import NotificationEntity
+from errors.database_error import DatabaseError
+from repositories.notification_repository import NotificationRepository
+from services.notification_service import NotificationService
+from utils.unread_counter import UnreadCounter
+from typing import List, Optional, Sequence
+import uuid
+
+
+class NotificationServiceImplementation(NotificationService):
+
+    def __init__(self, repository: NotificationRepository, unread_counter: UnreadCounter):
+        self.repository = repository
+        self.unread_counter = unread_counter
+
+    async def get_notifications(self, user_id: uuid.UUID, status: Optional[str], size: int, db: AsyncSession,
+                                cursor: Optional[str] = None) -> List[NotificationEntity]:
+        after = self.cursor_keyset.decode(cursor) if cursor else None
+        try:
+            return await self.repository.get_by_user(user_id, status, size, db, after=after)
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to fetch notifications: {str(e)}")
+
+    async def get_unread_count(self, user_id: uuid.UUID, db: AsyncSession) -> int:
+        try:
+            return await self.unread_counter.get(user_id, lambda: self.repository.count_unread(user_id, db))
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Failed to count unread notifications: {str(e)}")
+
+    async def mark_read(self, user_id: uuid.UUID, notification_ids: Optional[Sequence[uuid.UUID]],
+                        db: AsyncSession) -> int:
+        try:
+            marked = await self.repository.mark_read(user_id, notification_ids, db)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise DatabaseError(f"Failed to mark notifications as read: {str(e)}")
+        await self.unread_counter.add({user_id: -marked})
+        return marked
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from urllib.parse import unquote, urlparse
+
+
+class ObjectStorageService(ABC):
+    """Non-blocking access to the bucket holding uploaded images."""
+
+    @abstractmethod
+    async def presign_upload(self, key: str, expiration: int = 3600, content_type: Optional[str] = None) -> str:
+        """Return a URL the client can PUT the object to directly."""
+        pass
+
+    @abstractmethod
+    async def presign_download(self, key: str, expiration: int = 3600) -> str:
+        """Return a time-limited URL the client can GET the object from."""
+        pass
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether an object has been uploaded under the given key."""
+        pass
+
+    @abstractmethod
+    async def get_object(self, key: str) -> Optional[bytes]:
+        """Return the content of an object, or None if nothing was uploaded under the key."""
+        pass
+
+    @abstractmethod
+    async def put_object(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        """Store an object, replacing any object already under the key."""
+        pass
+
+    @abstractmethod
+    def public_url(self, key: str) -> str:
+        """Return the permanent URL of an object."""
+        pass
+
+    def key_from_url(self, url: str) -> str:
+        """Return the key of an object from one of its URLs (presigned or public)."""
+        return unquote(urlparse(url).path).lstrip('/')
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release the connection pool."""
+        pass
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from entities.found_pet_report_entity import FoundPetReportEntity
+from utils.image_similarity_index import SimilarLostPet
+from utils.pet_match_index import PetMatch
+
+
+class PetMatchingService(ABC):
+    """
+    Matches run against in-memory indexes of this worker, which requests only read: they are built and periodically
+    rebuilt by app.match_index_refresher, and kept current in between by refresh_lost_report. Until the first build
+    completes, matching raises ServiceUnavailableError.
+    """
+
+    @abstractmethod
+    async def rebuild_indexes(self, db: AsyncSession) -> None:
+        """Rebuild the lost report and lost pet photo indexes from the database and swap them in."""
+        pass
+
+    @abstractmethod
+    async def match_found_report(self, report: FoundPetReportEntity, db: AsyncSession) -> List[PetMatch]:
+        """Rank open lost pet reports against a found report whose geo_location is already a Location."""
+        pass
+
+    @abstractmethod
+    async def find_similar_lost_pets(self, report: FoundPetReportEntity, perceptual_hashes: Sequence[int],
+                                     max_distance: Optional[int], radius_km: Optional[float],
+                                     db: AsyncSession) -> List[SimilarLostPet]:
+        """
+        Rank open lost reports by how close their pet's photos are to the given photo hashes (Hamming distance), within
+        radius_km of the found report when it has a location. None falls back to the configured defaults.
+        """
+        pass
+
+    @abstractmethod
+    async def refresh_lost_report(self, report_id: UUID, db: AsyncSession) -> None:
+        """Re-index a lost pet report after it was created or updated."""
+        pass
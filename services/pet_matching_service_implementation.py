@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import List, Optional, Sequence
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from entities.found_pet_report_entity import FoundPetReportEntity
+from errors.service_unavailable_error import ServiceUnavailableError
+from repositories.lost_pet_report_repository import LostPetReportRepository
+from services.pet_matching_service import PetMatchingService
+from utils.image_similarity_index import ImageSimilarityIndex, SimilarLostPet, image_similarity_index
+from utils.pet_match_index import PetMatch, PetMatchIndex, pet_match_index
+
+logger = logging.getLogger(__name__)
+
+MATCH_RADIUS_KM = float(os.getenv("MATCH_RADIUS_KM", 10))
+MATCH_MAX_AGE_DAYS = int(os.getenv("MATCH_MAX_AGE_DAYS", 60))
+MATCH_RESULT_LIMIT = int(os.getenv("MATCH_RESULT_LIMIT", 10))
+# How often app.match_index_refresher rebuilds both indexes of this worker from the database
+MATCH_INDEX_REFRESH_SECONDS = float(os.getenv("MATCH_INDEX_REFRESH_SECONDS", 300))
+# Rows read per round trip while an index is rebuilt
+MATCH_INDEX_LOAD_BATCH_SIZE = int(os.getenv("MATCH_INDEX_LOAD_BATCH_SIZE", 10000))
+# Photos whose perceptual hashes differ in at most this many of 64 bits count as looking alike
+IMAGE_SIMILARITY_MAX_DISTANCE = int(os.getenv("IMAGE_SIMILARITY_MAX_DISTANCE", 10))
+
+# Both scale the match score, so they cannot be 0
+if MATCH_RADIUS_KM <= 0 or MATCH_MAX_AGE_DAYS <= 0:
+    raise ValueError("MATCH_RADIUS_KM and MATCH_MAX_AGE_DAYS must be greater than 0")
+
+# Lost report statuses (compared lower-case) that are no longer matched against found pets
+CLOSED_REPORT_STATUSES = ("found", "closed", "resolved", "reunited")
+
+
+class PetMatchingServiceImplementation(PetMatchingService):
+
+    def __init__(self, repository: LostPetReportRepository, index: PetMatchIndex = pet_match_index,
+                 photo_index: ImageSimilarityIndex = image_similarity_index):
+        self.repository = repository
+        self.index = index
+        self.photo_index = photo_index
+
+    async def rebuild_indexes(self, db: AsyncSession) -> None:
+        """
+        Each index is built into a fresh one on a thread, batch by batch as rows arrive, so neither the event loop
+        nor matches against the current index wait for it; it is swapped in once complete.
+        """
+        self.index.begin_rebuild()
+        try:
+            fresh = PetMatchIndex(self.index.precision, self.index.bucket_days)
+            async for candidates in self.repository.stream_open_match_candidates(CLOSED_REPORT_STATUSES,
+                                                                                 MATCH_INDEX_LOAD_BATCH_SIZE, db):
+                await asyncio.to_thread(fresh.extend, candidates)
+        except BaseException:
+            self.index.abandon_rebuild()
+            raise
+        # Reports created or updated by this worker while the rows were read are replayed onto the fresh index
+        self.index.replace_with(fresh)
+        logger.info(f"Pet match index rebuilt with {len(self.index)} open lost reports")
+
+        fresh_photos = ImageSimilarityIndex(self.photo_index.chunks)
+        async for photos in self.repository.stream_open_lost_pet_photos(CLOSED_REPORT_STATUSES,
+                                                                        MATCH_INDEX_LOAD_BATCH_SIZE, db):
+            await asyncio.to_thread(fresh_photos.extend, photos)
+        self.photo_index.replace_with(fresh_photos)
+        logger.info(f"Lost pet photo index rebuilt with {len(self.photo_index)} photos")
+
+    async def match_found_report(self, report: FoundPetReportEntity, db: AsyncSession) -> List[PetMatch]:
+        if report.geo_location is None:
+            return []
+        if not self.index.is_loaded:
+            raise ServiceUnavailableError("Lost pet reports are still being indexed, please retry shortly.")
+
+        return self.index.match(
+            latitude=report.geo_location.latitude,
+            longitude=report.geo_location.longitude,
+            found_date=report.report_date,
+            species=report.species,
+            breed=report.breed,
+            main_color=report.main_color,
+            radius_km=MATCH_RADIUS_KM,
+            max_age_days=MATCH_MAX_AGE_DAYS,
+            limit=MATCH_RESULT_LIMIT
+        )
+
+    async def find_similar_lost_pets(self, report: FoundPetReportEntity, perceptual_hashes: Sequence[int],
+                                     max_distance: Optional[int], radius_km: Optional[float],
+                                     db: AsyncSession) -> List[SimilarLostPet]:
+        if not perceptual_hashes:
+            return []
+        if not self.photo_index.is_loaded:
+            raise ServiceUnavailableError("Lost pet photos are still being indexed, please retry shortly.")
+
+        location = report.geo_location
+        return self.photo_index.search(
+            perceptual_hashes,
+            max_distance=IMAGE_SIMILARITY_MAX_DISTANCE if max_distance is None else max_distance,
+            limit=MATCH_RESULT_LIMIT,
+            latitude=location.latitude if location else None,
+            longitude=location.longitude if location else None,
+            radius_km=MATCH_RADIUS_KM if radius_km is None else radius_km
+        )
+
+    async def refresh_lost_report(self, report_id: uuid.UUID, db: AsyncSession) -> None:
+        if not self.index.is_loaded:
+            return  # The next match builds the index from scratch anyway
+        try:
+            candidate = await self.repository.get_match_candidate(report_id, CLOSED_REPORT_STATUSES, db)
+        except SQLAlchemyError as e:
+            # The report itself is already committed; the periodic rebuild will pick it up
+            logger.warning(f"Failed to re-index lost pet report {report_id}: {str(e)}")
+            return
+        if candidate:
+            self.index.upsert(candidate)
+        else:
+            self.index.remove(report_id)
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.pet_entity import PetEntity
-from typing import List
+from typing import List, Optional
 from datetime import date
 import uuid
+from utils.cursor import Keyset
 
 
 class PetService(ABC):
@@ -11,6 +12,9 @@ class PetService(ABC):
     Interface for the PetService. Defines all operations related to pets.
     """
 
+    # Sort order of pet listings, used to build and read pagination cursors
+    cursor_keyset = Keyset(("name", "pet_id"), (str, uuid.UUID))
+
     @abstractmethod
     async def create_pet(self, user_id: uuid.UUID, name: str, species: str, breed: str, date_of_birth: date,
                          main_color: str, pet_details: dict, db: AsyncSession) -> PetEntity:
@@ -31,7 +35,8 @@ class PetService(ABC):
 
     @abstractmethod
     async def update_pet(self, pet_id: uuid.UUID, name: str, species: str, breed: str, date_of_birth: date,
-                         main_color: str, pet_details: dict, db: AsyncSession) -> PetEntity:
+                         main_color: str, pet_details: dict, db: AsyncSession,
+                         expected_version: Optional[int] = None) -> PetEntity:
         """
         Updates an existing pet's details.
 
@@ -43,6 +48,7 @@ class PetService(ABC):
         :param main_color: The updated main color of the pet (optional).
         :param pet_details: Additional updated details about the pet in dictionary format (optional).
         :param db: AsyncSession object for interacting with the database.
+        :param expected_version: The version the client last read (If-Match); PreconditionFailedError if it changed.
         :return: The updated PetEntity.
         """
         pass
@@ -59,19 +65,20 @@ class PetService(ABC):
         pass
 
     @abstractmethod
-    async def get_all_pets(self, page: int, size: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_all_pets(self, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[PetEntity]:
         """
         Fetches all pets with pagination.
 
         :param page: The page number for pagination.
         :param size: The number of pets per page.
         :param db: AsyncSession object for interacting with the database.
+        :param cursor: Opaque cursor of the previous page; takes precedence over page when given.
         :return: A list of PetEntity objects.
         """
         pass
 
     @abstractmethod
-    async def get_pets_by_user_id(self, user_id: uuid.UUID, page: int, size: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_pets_by_user_id(self, user_id: uuid.UUID, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[PetEntity]:
         """
         Fetches all pets owned by a specific user, with pagination.
 
@@ -79,6 +86,7 @@ class PetService(ABC):
         :param page: The page number for pagination.
         :param size: The number of pets per page.
         :param db: AsyncSession object for interacting with the database.
+        :param cursor: Opaque cursor of the previous page; takes precedence over page when given.
         :return: A list of PetEntity objects owned by the user.
         """
         pass
@@ -2,18 +2,21 @@ from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from errors.database_error import DatabaseError
 from errors.not_found_error import NotFoundError
+from errors.precondition_failed_error import PreconditionFailedError
 from errors.validation_error import ValidationError
 from repositories.pet_repository import PetRepository
 from entities.pet_entity import PetEntity
 from services.pet_service import PetService
-from typing import List
+from utils.response_cache import PETS, ResponseCache
+from typing import List, Optional
 from datetime import date
 import uuid
 
 class PetServiceImplementation(PetService):
 
-    def __init__(self, repository: PetRepository):
+    def __init__(self, repository: PetRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
 
     async def create_pet(self, user_id: uuid.UUID, name: str, species: str, breed: str, date_of_birth: date, main_color: str, pet_details: dict, db: AsyncSession) -> PetEntity:
         pet = PetEntity(
@@ -39,21 +42,20 @@ class PetServiceImplementation(PetService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error occurred during pet creation: {str(e)}")
 
-    async def update_pet(self, pet_id: uuid.UUID, name: str, species: str, breed: str, date_of_birth: date, main_color: str, pet_details: dict, db: AsyncSession) -> PetEntity:
-        pet = await self.repository.get_by_pet_id(pet_id, db)
-        if not pet:
-            raise NotFoundError(f"Pet with ID '{pet_id}' not found.")
-
-        pet.name = name
-        pet.species = species
-        pet.breed = breed
-        pet.date_of_birth = date_of_birth
-        pet.main_color = main_color
-        pet.pet_details = pet_details
-
+    async def update_pet(self, pet_id: uuid.UUID, name: str, species: str, breed: str, date_of_birth: date, main_color: str, pet_details: dict, db: AsyncSession,
+                         expected_version: Optional[int] = None) -> PetEntity:
+        values = dict(name=name, species=species, breed=breed, date_of_birth=date_of_birth, main_color=main_color,
+                      pet_details=pet_details)
         try:
-            pet = await self.repository.update(pet, db)
+            pet = await self.repository.update(pet_id, values, expected_version, db)
+            if pet is None:
+                # Only the failure path pays for telling a missing pet from a stale version
+                await db.rollback()
+                if await self.repository.get_by_pet_id(pet_id, db):
+                    raise PreconditionFailedError(f"Pet with ID '{pet_id}' was modified by someone else.")
+                raise NotFoundError(f"Pet with ID '{pet_id}' not found.")
             await db.commit()
+            await self.cache.invalidate(PETS, pet_id)
             return pet
         except IntegrityError as e:
             await db.rollback()
@@ -71,16 +73,18 @@ class PetServiceImplementation(PetService):
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error fetching pet with ID '{pet_id}': {str(e)}")
 
-    async def get_all_pets(self, page: int, size: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_all_pets(self, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[PetEntity]:
         skip = (page - 1) * size
+        after = self.cursor_keyset.decode(cursor) if cursor else None
         try:
-            return await self.repository.get_all(skip=skip, limit=size, db=db)
+            return await self.repository.get_all(skip=skip, limit=size, db=db, after=after)
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error fetching all pets: {str(e)}")
 
-    async def get_pets_by_user_id(self, user_id: uuid.UUID, page: int, size: int, db: AsyncSession) -> List[PetEntity]:
+    async def get_pets_by_user_id(self, user_id: uuid.UUID, page: int, size: int, db: AsyncSession, cursor: Optional[str] = None) -> List[PetEntity]:
         skip = (page - 1) * size
+        after = self.cursor_keyset.decode(cursor) if cursor else None
         try:
-            return await self.repository.get_by_user_id(user_id, skip=skip, limit=size, db=db)
+            return await self.repository.get_by_user_id(user_id, skip=skip, limit=size, db=db, after=after)
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error fetching pets for user with ID '{user_id}': {str(e)}")
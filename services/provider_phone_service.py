@@ -4,6 +4,7 @@ from typing import List
 import uuid
 from entities.provider_phone_entity import ProviderPhoneEntity
 from boundaries.provider_phone_boundary import ProviderPhoneBoundary
+from utils.bulk_insert import BulkInsertResult
 
 class ProviderPhoneService(ABC):
 
@@ -12,7 +13,7 @@ class ProviderPhoneService(ABC):
         pass
 
     @abstractmethod
-    async def add_phones_bulk(self, provider_id: uuid.UUID, phones: List[ProviderPhoneBoundary], db: AsyncSession) -> List[ProviderPhoneEntity]:
+    async def add_phones_bulk(self, provider_id: uuid.UUID, phones: List[ProviderPhoneBoundary], db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
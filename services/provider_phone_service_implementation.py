@@ -8,11 +8,14 @@ from services.provider_phone_service import ProviderPhoneService
 from boundaries.provider_phone_boundary import ProviderPhoneBoundary
 from errors.database_error import DatabaseError
 from errors.validation_error import ValidationError
+from utils.bulk_insert import BulkInsertResult
+from utils.response_cache import SERVICE_PROVIDERS, ResponseCache
 
 class ProviderPhoneServiceImplementation(ProviderPhoneService):
 
-    def __init__(self, repository: ProviderPhoneRepository):
+    def __init__(self, repository: ProviderPhoneRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
 
     async def add_phone(self, provider_id: uuid.UUID, phone_boundary: ProviderPhoneBoundary, db: AsyncSession) -> ProviderPhoneEntity:
         phone = ProviderPhoneEntity(
@@ -23,6 +26,7 @@ class ProviderPhoneServiceImplementation(ProviderPhoneService):
         try:
             saved_phone = await self.repository.add_phone(phone, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
             return saved_phone
         except IntegrityError as e:
             await db.rollback()
@@ -36,7 +40,7 @@ class ProviderPhoneServiceImplementation(ProviderPhoneService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error during phone number creation: {str(e)}")
 
-    async def add_phones_bulk(self, provider_id: uuid.UUID, phones: List[ProviderPhoneBoundary], db: AsyncSession) -> List[ProviderPhoneEntity]:
+    async def add_phones_bulk(self, provider_id: uuid.UUID, phones: List[ProviderPhoneBoundary], db: AsyncSession) -> BulkInsertResult:
         phone_entities = [
             ProviderPhoneEntity(
                 phone_id=uuid.uuid4(),
@@ -45,9 +49,11 @@ class ProviderPhoneServiceImplementation(ProviderPhoneService):
             ) for phone in phones
         ]
         try:
-            saved_phones = await self.repository.add_phones_bulk(phone_entities, db)
+            result = await self.repository.add_phones_bulk(phone_entities, db)
             await db.commit()
-            return saved_phones
+            if result.created:
+                await self.cache.invalidate(SERVICE_PROVIDERS)
+            return result
         except IntegrityError as e:
             await db.rollback()
             error_message = str(e.orig)
@@ -64,6 +70,7 @@ class ProviderPhoneServiceImplementation(ProviderPhoneService):
         try:
             await self.repository.remove_phone(phone_id, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
         except ValueError as e:
             await db.rollback()
             raise ValidationError(f"Phone removal failed: {str(e)}")
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from services.cache_store import CacheStore
+
+# INCRBY alone would create a missing key at amount; INCRBY keeps the key's TTL
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return false
+"""
+
+
+class RedisCacheStoreImplementation(CacheStore):
+    """Shared tier on Redis; one connection pool per process."""
+
+    def __init__(self, url: str, max_connections: int = 50, socket_timeout: float = 0.5):
+        # A slow cache is worse than none: time out quickly and let the caller fall back to the database
+        self.client = Redis.from_url(url, max_connections=max_connections, socket_timeout=socket_timeout,
+                                     socket_connect_timeout=socket_timeout)
+        self._incr_if_exists = self.client.register_script(_INCR_IF_EXISTS)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.client.set(key, value, px=max(int(ttl_seconds * 1000), 1))
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+    async def incr_if_exists(self, key: str, amount: int) -> Optional[int]:
+        return await self._incr_if_exists(keys=[key], args=[amount])
+
+    async def close(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from typing import Optional, Sequence
+
+from redis.asyncio import Redis
+
+from services.notification_backplane import MessageHandler, NotificationBackplane
+
+logger = logging.getLogger(__name__)
+
+
+class RedisNotificationBackplaneImplementation(NotificationBackplane):
+    """Redis pub/sub on one channel; every worker subscribes and delivers to the sockets it holds."""
+
+    def __init__(self, url: str, channel: str = "notifications", reconnect_seconds: float = 1.0):
+        # No socket timeout: the subscriber connection blocks on reads until something is published
+        self.client = Redis.from_url(url)
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self, handler: MessageHandler) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(handler))
+
+    async def _listen(self, handler: MessageHandler) -> None:
+        while True:
+            try:
+                async with self.client.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            await handler(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Messages published while disconnected are lost; clients catch up from the notifications table
+                logger.exception("Notification backplane subscription failed, reconnecting")
+                await asyncio.sleep(self.reconnect_seconds)
+
+    async def publish(self, messages: Sequence[bytes]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.publish(self.channel, message)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.client.aclose()
@@ -0,0 +1,112 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from errors.storage_error import StorageError
+from services.object_storage_service import ObjectStorageService
+
+_MISSING_OBJECT_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+class S3ObjectStorageServiceImplementation(ObjectStorageService):
+    """
+    S3 (or any S3-compatible endpoint such as MinIO) behind one process-wide client.
+    botocore clients are thread-safe, so a single client and its urllib3 connection pool are shared by every request,
+    and each call runs on a dedicated thread pool sized to that connection pool instead of on the event loop.
+    """
+
+    def __init__(self, bucket_name: str, region_name: Optional[str] = None, endpoint_url: Optional[str] = None,
+                 aws_access_key_id: Optional[str] = None, aws_secret_access_key: Optional[str] = None,
+                 max_pool_connections: int = 50, connect_timeout: float = 5, read_timeout: float = 10):
+        self.bucket_name = bucket_name
+        self.endpoint_url = endpoint_url
+        self.client = boto3.client(
+            's3',
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            region_name=region_name,
+            endpoint_url=endpoint_url,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                retries={'max_attempts': 3, 'mode': 'standard'},
+                # MinIO and most self-hosted endpoints only serve path-style URLs
+                s3={'addressing_style': 'path' if endpoint_url else 'auto'}
+            )
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_pool_connections, thread_name_prefix="s3")
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        except BotoCoreError as e:
+            raise StorageError(f"Object storage request failed: {str(e)}")
+
+    async def _presign(self, operation: str, params: dict, expiration: int) -> str:
+        try:
+            return await self._run(self.client.generate_presigned_url, operation, Params=params, ExpiresIn=expiration)
+        except ClientError as e:
+            raise StorageError(f"Failed to generate presigned URL: {e.response['Error']['Message']}")
+
+    async def presign_upload(self, key: str, expiration: int = 3600, content_type: Optional[str] = None) -> str:
+        params = {'Bucket': self.bucket_name, 'Key': key}
+        if content_type:
+            params['ContentType'] = content_type
+        return await self._presign('put_object', params, expiration)
+
+    async def presign_download(self, key: str, expiration: int = 3600) -> str:
+        return await self._presign('get_object', {'Bucket': self.bucket_name, 'Key': key}, expiration)
+
+    async def exists(self, key: str) -> bool:
+        try:
+            await self._run(self.client.head_object, Bucket=self.bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in _MISSING_OBJECT_CODES:
+                return False
+            raise StorageError(f"Failed to look up object '{key}': {e.response['Error']['Message']}")
+
+    def _read_object(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket_name, Key=key)
+        with response['Body'] as body:
+            return body.read()
+
+    async def get_object(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._run(self._read_object, key)
+        except ClientError as e:
+            if e.response['Error']['Code'] in _MISSING_OBJECT_CODES:
+                return None
+            raise StorageError(f"Failed to download object '{key}': {e.response['Error']['Message']}")
+
+    async def put_object(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        params = {'Bucket': self.bucket_name, 'Key': key, 'Body': data}
+        if content_type:
+            params['ContentType'] = content_type
+        try:
+            await self._run(self.client.put_object, **params)
+        except ClientError as e:
+            raise StorageError(f"Failed to upload object '{key}': {e.response['Error']['Message']}")
+
+    def public_url(self, key: str) -> str:
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}/{key}"
+        return f"https://{self.bucket_name}.s3.amazonaws.com/{key}"
+
+    def key_from_url(self, url: str) -> str:
+        key = super().key_from_url(url)
+        # Path-style URLs of a custom endpoint start with the bucket name
+        if self.endpoint_url and key.startswith(f"{self.bucket_name}/"):
+            key = key[len(self.bucket_name) + 1:]
+        return key
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.client.close()
@@ -3,7 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from entities.service_provider_location_entity import ServiceProviderLocationEntity
 from boundaries.service_provider_location_create_boundary import ServiceProviderLocationCreateBoundary
 from boundaries.service_provider_location_boundary import ServiceProviderLocationBoundary
-from typing import List
+from typing import List, Optional
+from utils.bulk_insert import BulkInsertResult
 import uuid
 
 
@@ -14,7 +15,7 @@ class ServiceProviderLocationService(ABC):
         pass
 
     @abstractmethod
-    async def add_locations_bulk(self, bulk_boundary: List[ServiceProviderLocationBoundary], db: AsyncSession) -> List[ServiceProviderLocationEntity]:
+    async def add_locations_bulk(self, provider_id: uuid.UUID, locations: List[ServiceProviderLocationBoundary], db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
@@ -28,3 +29,7 @@ class ServiceProviderLocationService(ABC):
     @abstractmethod
     async def get_all_locations(self, db: AsyncSession, skip: int = 0, limit: int = 10) -> List[ServiceProviderLocationEntity]:
         pass
+
+    @abstractmethod
+    async def get_nearest_locations(self, longitude: float, latitude: float, radius_km: Optional[float], db: AsyncSession, limit: int = 10) -> List[ServiceProviderLocationEntity]:
+        pass
@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from typing import List
+from typing import List, Optional
 import uuid
 
 from boundaries.service_provider_location_boundary import ServiceProviderLocationBoundary
@@ -13,11 +13,14 @@ from services.service_provider_location_service import ServiceProviderLocationSe
 from utils.location import Location
 from geoalchemy2.elements import WKBElement
 from shapely import wkb
+from utils.bulk_insert import BulkInsertResult
+from utils.response_cache import SERVICE_PROVIDERS, ResponseCache
 
 class ServiceProviderLocationServiceImplementation(ServiceProviderLocationService):
 
-    def __init__(self, repository: ServiceProviderLocationRepository):
+    def __init__(self, repository: ServiceProviderLocationRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
 
     async def add_location(self, location_boundary: ServiceProviderLocationCreateBoundary, db: AsyncSession) -> ServiceProviderLocationEntity:
         location = ServiceProviderLocationEntity(
@@ -28,6 +31,7 @@ class ServiceProviderLocationServiceImplementation(ServiceProviderLocationServic
         try:
             saved_location = await self.repository.add_location(location, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
 
             # Convert geo_point to Location object before returning
             saved_location.geo_location = await self._convert_geo_point(saved_location.geo_location)
@@ -39,22 +43,24 @@ class ServiceProviderLocationServiceImplementation(ServiceProviderLocationServic
             await db.rollback()
             raise DatabaseError(f"Unexpected error during location creation: {str(e)}")
 
-    async def add_locations_bulk(self, bulk_boundary: List[ServiceProviderLocationBoundary], db: AsyncSession) -> List[ServiceProviderLocationEntity]:
+    async def add_locations_bulk(self, provider_id: uuid.UUID, locations: List[ServiceProviderLocationBoundary], db: AsyncSession) -> BulkInsertResult:
         location_entities = [
             ServiceProviderLocationEntity(
-                provider_id=location.provider_id,
-                full_address=location.location.full_address,
-                geo_location=location.location.geo_location  # Storing as PostGIS point
-            ) for location in bulk_boundary
+                provider_id=provider_id,
+                full_address=location.full_address,
+                geo_location=location.geo_location  # Storing as PostGIS point
+            ) for location in locations
         ]
         try:
-            saved_locations = await self.repository.add_locations_bulk(location_entities, db)
+            result = await self.repository.add_locations_bulk(location_entities, db)
             await db.commit()
+            if result.created:
+                await self.cache.invalidate(SERVICE_PROVIDERS)
 
             # Convert geo_points to Location objects before returning
-            for loc in saved_locations:
+            for loc in result.created:
                 loc.geo_location = await self._convert_geo_point(loc.geo_location)
-            return saved_locations
+            return result
         except IntegrityError as e:
             await db.rollback()
             raise ValidationError(f"Failed to commit locations in bulk: {str(e.orig)}")
@@ -66,6 +72,7 @@ class ServiceProviderLocationServiceImplementation(ServiceProviderLocationServic
         try:
             await self.repository.remove_location(location_id, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
         except ValueError as e:
             await db.rollback()
             raise ValidationError(f"Location removal failed: {str(e)}")
@@ -98,6 +105,17 @@ class ServiceProviderLocationServiceImplementation(ServiceProviderLocationServic
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error fetching all locations: {str(e)}")
 
+    async def get_nearest_locations(self, longitude: float, latitude: float, radius_km: Optional[float], db: AsyncSession, limit: int = 10) -> List[ServiceProviderLocationEntity]:
+        try:
+            locations = await self.repository.get_nearest_locations(longitude, latitude, radius_km, db, limit)
+
+            # Convert geo_points to Location objects before returning
+            for loc in locations:
+                loc.geo_location = self._convert_geo_point(loc.geo_location)
+            return locations
+        except SQLAlchemyError as e:
+            raise DatabaseError(f"Error fetching nearest locations: {str(e)}")
+
     def _convert_geo_point(self, geo_point: WKBElement) -> Location:
         """Converts the PostGIS point (WKBElement) to the Location object."""
         point = wkb.loads(bytes(geo_point.data))
@@ -8,16 +8,20 @@ from boundaries.service_provider_create_boundary import ServiceProviderCreateBou
 from dto.service_provider_dto import ServiceProviderDTO
 from dto.open_service_provider_dto import OpenServiceProviderDTO
 from entities.service_provider_entity import ServiceProviderEntity
+from utils.cursor import Keyset
 
 
 class ServiceProviderService(ABC):
+    # Sort order of provider searches without a location, used to build and read pagination cursors
+    cursor_keyset = Keyset(("membership", "name", "service_type", "provider_id"), (str, str, str, uuid.UUID))
 
     @abstractmethod
     async def create_service_provider(self, boundary: ServiceProviderCreateBoundary, db: AsyncSession) -> ServiceProviderEntity:
         pass
 
     @abstractmethod
-    async def update_service_provider(self, provider_id: uuid.UUID, name: Optional[str], service_type: Optional[str], email: Optional[str], db: AsyncSession) -> ServiceProviderEntity:
+    async def update_service_provider(self, provider_id: uuid.UUID, name: Optional[str], service_type: Optional[str], email: Optional[str], db: AsyncSession,
+                                      expected_version: Optional[int] = None) -> ServiceProviderEntity:
         pass
 
     @abstractmethod
@@ -34,12 +38,14 @@ class ServiceProviderService(ABC):
         longitude: Optional[float],
         latitude: Optional[float],
         radius_km: Optional[float],
+        nearest: bool,
         page: int,
         size: int,
-        db: AsyncSession
+        db: AsyncSession,
+        cursor: Optional[str] = None
     ) -> List[ServiceProviderDTO]:
         pass
 
     @abstractmethod
-    async def get_open_service_providers(self, day_of_week: str, desired_time: time, page: int, size: int, db: AsyncSession) -> List[OpenServiceProviderDTO]:
+    async def get_open_service_providers(self, day_of_week: str, desired_time: time, page: int, size: int, db: AsyncSession, within_hours: Optional[float] = None) -> List[OpenServiceProviderDTO]:
         pass
@@ -5,6 +5,7 @@ from datetime import time
 import uuid
 
 from enums.day_of_week_enum import DayOfWeekEnum
+from enums.membership_enum import MembershipEnum
 from services.service_provider_service import ServiceProviderService
 from repositories.service_provider_repository import ServiceProviderRepository
 from entities.service_provider_entity import ServiceProviderEntity
@@ -15,14 +16,18 @@ from entities.service_provider_location_entity import ServiceProviderLocationEnt
 from boundaries.service_provider_create_boundary import ServiceProviderCreateBoundary
 from errors.validation_error import ValidationError
 from errors.database_error import DatabaseError
+from errors.precondition_failed_error import PreconditionFailedError
 from dto.service_provider_dto import ServiceProviderDTO
 from dto.open_service_provider_dto import OpenServiceProviderDTO
 from utils.location import Location
+from utils.weekly_schedule import open_slots
+from utils.response_cache import SERVICE_PROVIDERS, ResponseCache
 
 
 class ServiceProviderServiceImplementation(ServiceProviderService):
-    def __init__(self, repository: ServiceProviderRepository):
+    def __init__(self, repository: ServiceProviderRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
 
     async def create_service_provider(self, boundary: ServiceProviderCreateBoundary,
                                       db: AsyncSession) -> ServiceProviderEntity:
@@ -33,7 +38,8 @@ class ServiceProviderServiceImplementation(ServiceProviderService):
                 name=boundary.name,
                 service_type=boundary.service_type,
                 email=boundary.email,
-                membership="Free"  # Default membership to 'Free'
+                membership="Free",  # Default membership to 'Free'
+                open_slots=open_slots(boundary.working_hours)
             )
 
             # Save the service provider entity
@@ -81,6 +87,7 @@ class ServiceProviderServiceImplementation(ServiceProviderService):
 
             # Commit the transaction
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
             return saved_provider
 
         except IntegrityError as e:
@@ -100,32 +107,31 @@ class ServiceProviderServiceImplementation(ServiceProviderService):
             raise DatabaseError("An unexpected database error occurred while creating the service provider.")
 
     async def update_service_provider(self, provider_id: uuid.UUID, name: Optional[str], service_type: Optional[str],
-                                      email: Optional[str], db: AsyncSession) -> ServiceProviderEntity:
-        provider = await self.repository.get_by_id(provider_id, db)
-        if not provider:
-            raise ValidationError(f"Service provider with ID '{provider_id}' was not found.")
-
-        # Track if any data was actually updated
-        has_updates = False
-
-        # Check if the fields are provided and not None, and apply updates if there are new values
-        if name is not None and name != provider.name:
-            provider.name = name
-            has_updates = True
-        if service_type is not None and service_type != provider.service_type:
-            provider.service_type = service_type
-            has_updates = True
-        if email is not None and email != provider.email:
-            provider.email = email
-            has_updates = True
+                                      email: Optional[str], db: AsyncSession,
+                                      expected_version: Optional[int] = None) -> ServiceProviderEntity:
+        # Only the fields that are provided and not None are written
+        provided = dict(name=name, service_type=service_type, email=email)
+        values = {column: value for column, value in provided.items() if value is not None}
 
         # If there are no changes, skip the update
-        if not has_updates:
+        if not values:
+            provider = await self.repository.get_by_id(provider_id, db)
+            if not provider:
+                raise ValidationError(f"Service provider with ID '{provider_id}' was not found.")
+            if expected_version is not None and provider.version != expected_version:
+                raise PreconditionFailedError(f"Service provider with ID '{provider_id}' was modified by someone else.")
             return provider  # Return the current state without updating the database
 
         try:
-            updated_provider = await self.repository.update_service_provider(provider, db)
+            updated_provider = await self.repository.update_service_provider(provider_id, values, expected_version, db)
+            if updated_provider is None:
+                # Only the failure path pays for telling a missing provider from a stale version
+                await db.rollback()
+                if await self.repository.get_by_id(provider_id, db):
+                    raise PreconditionFailedError(f"Service provider with ID '{provider_id}' was modified by someone else.")
+                raise ValidationError(f"Service provider with ID '{provider_id}' was not found.")
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
             return updated_provider
 
         except IntegrityError as e:
@@ -144,10 +150,19 @@ class ServiceProviderServiceImplementation(ServiceProviderService):
                                     name: Optional[str], phone_number: Optional[str], day_of_week: Optional[str],
                                     desired_time: Optional[time], membership: Optional[str],
                                     longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float],
-                                    page: int, size: int, db: AsyncSession) -> List[ServiceProviderDTO]:
+                                    nearest: bool, page: int, size: int, db: AsyncSession,
+                                    cursor: Optional[str] = None) -> List[ServiceProviderDTO]:
         try:
             day_of_week_enum = None  # Initialize day_of_week_enum to None
 
+            after = None
+            if cursor:
+                if longitude is not None and latitude is not None:
+                    raise ValidationError("Cursor pagination is not available when ordering by distance; use page instead.")
+                after = self.cursor_keyset.decode(cursor)
+                if after[0] not in {membership.value for membership in MembershipEnum}:
+                    raise ValidationError("Invalid pagination cursor.")
+
             # Validate day_of_week if provided
             if day_of_week:
                 try:
@@ -168,18 +183,22 @@ class ServiceProviderServiceImplementation(ServiceProviderService):
                 longitude=longitude,
                 latitude=latitude,
                 radius_km=radius_km,
+                nearest=nearest,
                 page=page,
                 size=size,
-                db=db
+                db=db,
+                after=after
             )
 
             return providers
 
+        except ValidationError:
+            raise
         except Exception as e:
             raise DatabaseError(f"An error occurred while fetching service providers: {str(e)}")
 
     async def get_open_service_providers(self, day_of_week: str, desired_time: time, page: int, size: int,
-                                         db: AsyncSession) -> List[OpenServiceProviderDTO]:
+                                         db: AsyncSession, within_hours: Optional[float] = None) -> List[OpenServiceProviderDTO]:
         try:
             # Validate the incoming day_of_week
             try:
@@ -188,7 +207,7 @@ class ServiceProviderServiceImplementation(ServiceProviderService):
                 raise ValidationError(f"Invalid day of the week: {day_of_week}")
 
             open_providers = await self.repository.get_open_service_providers(
-                day_of_week_enum, desired_time, page, size, db
+                day_of_week_enum, desired_time, page, size, db, within_hours=within_hours
             )
 
             # Convert to DTOs with Location transformation
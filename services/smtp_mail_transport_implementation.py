@@ -0,0 +1,91 @@
+import logging
+import time
+from email.message import EmailMessage
+from typing import Optional
+
+import aiosmtplib
+
+from errors.mail_delivery_error import MailDeliveryError
+from services.mail_transport import MailTransport
+
+logger = logging.getLogger(__name__)
+
+
+class SmtpMailTransportImplementation(MailTransport):
+    """
+    Keeps one authenticated SMTP connection open and sends every message over it.
+    The connection is opened on first use, reopened once if the server dropped it, and closed after idle_timeout
+    seconds without mail so it does not hold a session on the mail server between bursts.
+    """
+
+    def __init__(self, hostname: str, port: int, username: Optional[str], password: Optional[str],
+                 security: str = "starttls", timeout: float = 30, idle_timeout: float = 60):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.security = security  # "starttls", "tls" or "none" (plain, for a local sink such as Mailpit)
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            timeout=self.timeout,
+            use_tls=self.security == "tls",
+            start_tls=self.security == "starttls"
+        )
+        await smtp.connect()
+        if self.username and self.password:
+            await smtp.login(self.username, self.password)
+        logger.info(f"Opened SMTP connection to {self.hostname}:{self.port}")
+        return smtp
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is not None and (not self._smtp.is_connected
+                                       or time.monotonic() - self._last_used > self.idle_timeout):
+            await self.close()
+        if self._smtp is None:
+            self._smtp = await self._connect()
+        return self._smtp
+
+    async def _open(self) -> aiosmtplib.SMTP:
+        try:
+            return await self._connection()
+        except (aiosmtplib.SMTPException, OSError) as e:
+            # Connection and login failures say nothing about the message, so they are always retried
+            await self.close()
+            raise MailDeliveryError(f"Could not connect to {self.hostname}:{self.port}: {str(e)}")
+
+    async def send(self, message: EmailMessage) -> None:
+        try:
+            try:
+                await (await self._open()).send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server closed an idle connection since the last message; retry once on a fresh one
+                await self.close()
+                await (await self._open()).send_message(message)
+        except aiosmtplib.SMTPRecipientsRefused as e:
+            raise MailDeliveryError(str(e), permanent=True)
+        except aiosmtplib.SMTPResponseException as e:
+            if e.code >= 500:
+                raise MailDeliveryError(f"{e.code} {e.message}", permanent=True)
+            await self.close()
+            raise MailDeliveryError(f"{e.code} {e.message}")
+        except (aiosmtplib.SMTPException, OSError) as e:
+            await self.close()
+            raise MailDeliveryError(str(e))
+        self._last_used = time.monotonic()
+
+    async def close(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            smtp.close()
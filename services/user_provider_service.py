@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from entities.user_provider_association_entity import UserProviderAssociationEntity
 from boundaries.user_provider_boundary import UserProviderBoundary
+from utils.bulk_insert import BulkInsertResult
 
 class UserProviderService(ABC):
     @abstractmethod
@@ -10,7 +11,7 @@ class UserProviderService(ABC):
         pass
 
     @abstractmethod
-    async def add_user_providers_bulk(self, users: List[UserProviderBoundary], provider_id: str, db: AsyncSession) -> List[UserProviderAssociationEntity]:
+    async def add_user_providers_bulk(self, users: List[UserProviderBoundary], provider_id: str, db: AsyncSession) -> BulkInsertResult:
         pass
 
     @abstractmethod
@@ -8,11 +8,14 @@ from errors.validation_error import ValidationError
 from errors.database_error import DatabaseError
 from typing import List, Optional
 import uuid
+from utils.bulk_insert import BulkInsertResult
+from utils.response_cache import SERVICE_PROVIDERS, ResponseCache
 
 class UserProviderServiceImplementation(UserProviderService):
 
-    def __init__(self, repository: UserProviderRepository):
+    def __init__(self, repository: UserProviderRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
 
     async def add_user_provider(self, boundary: UserProviderBoundary, provider_id: uuid.UUID, db: AsyncSession) -> UserProviderAssociationEntity:
         association = UserProviderAssociationEntity(
@@ -23,6 +26,7 @@ class UserProviderServiceImplementation(UserProviderService):
         try:
             association = await self.repository.add_user_provider(association, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
             return association
         except IntegrityError as e:
             await db.rollback()
@@ -36,18 +40,20 @@ class UserProviderServiceImplementation(UserProviderService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error occurred while adding user-provider association: {str(e)}")
 
-    async def add_user_providers_bulk(self, users: List[UserProviderBoundary], provider_id: uuid.UUID, db: AsyncSession) -> List[UserProviderAssociationEntity]:
+    async def add_user_providers_bulk(self, users: List[UserProviderBoundary], provider_id: uuid.UUID, db: AsyncSession) -> BulkInsertResult:
         associations = [
             UserProviderAssociationEntity(
-                user_email=user.user_email,
+                user_id=user.user_id,
                 provider_id=provider_id,
                 role=user.role
             ) for user in users
         ]
         try:
-            associations = await self.repository.add_user_providers_bulk(associations, db)
+            result = await self.repository.add_user_providers_bulk(associations, db)
             await db.commit()
-            return associations
+            if result.created:
+                await self.cache.invalidate(SERVICE_PROVIDERS)
+            return result
         except IntegrityError as e:
             await db.rollback()
             error_message = str(e.orig)
@@ -64,6 +70,7 @@ class UserProviderServiceImplementation(UserProviderService):
         try:
             await self.repository.remove_user_provider(user_id, provider_id, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
         except ValidationError as e:
             await db.rollback()
             raise ValidationError(f"Failed to remove user-provider association: {str(e)}")
@@ -1,18 +1,20 @@
 from abc import ABC, abstractmethod
-from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from entities.user_entity import UserEntity
 from typing import List, Optional
 import uuid
+from utils.cursor import Keyset
 
 class UserService(ABC):
+    # Sort order of user listings, used to build and read pagination cursors
+    cursor_keyset = Keyset(("email", "user_id"), (str, uuid.UUID))
 
     @abstractmethod
     async def create_user(self, email: str, password: str, first_name: str, last_name: str, role: str,
                           phone_number: str, db: AsyncSession = None) -> tuple[UserEntity, str]:
         pass
     @abstractmethod
-    async def send_verification_email(self, email: str, verification_url: str):
+    async def send_verification_email(self, email: str, verification_url: str, db: AsyncSession):
         pass
 
     @abstractmethod
@@ -34,7 +36,7 @@ class UserService(ABC):
         pass
 
     @abstractmethod
-    async def get_users(self, db: AsyncSession, page: int = 1, size: int = 10) -> List[UserEntity]:
+    async def get_users(self, db: AsyncSession, page: int = 1, size: int = 10, cursor: Optional[str] = None) -> List[UserEntity]:
         pass
 
     @abstractmethod
@@ -1,6 +1,5 @@
-import os
+import logging
 
-from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from repositories.user_repository import UserRepository
@@ -10,14 +9,14 @@ from services.email_service import EmailService
 from errors.not_found_error import NotFoundError
 from errors.validation_error import ValidationError
 from errors.database_error import DatabaseError
-from passlib.context import CryptContext
 import secrets
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 import uuid
 from utils.jwt_helper import create_access_token
-crypt_scheme = os.getenv("CRYPT_SCHEME")
-pwd_context = CryptContext(schemes=[crypt_scheme], deprecated="auto")
+from utils.password_hasher import password_hasher
+
+logger = logging.getLogger(__name__)
 
 
 class UserServiceImplementation(UserService):
@@ -26,9 +25,17 @@ class UserServiceImplementation(UserService):
         self.repository = repository
         self.email_service = email_service
 
+    @staticmethod
+    async def _check_password_strength(password: str) -> None:
+        """Score a password on the hashing pool, raising ValidationError with zxcvbn's suggestions when it is weak."""
+        feedback = await password_hasher.password_weakness(password)
+        if feedback:
+            raise ValidationError(feedback)
+
     async def create_user(self, email: str, password: str, first_name: str, last_name: str, role: str,
                           phone_number: str, db: AsyncSession = None) -> tuple[UserEntity, str]:
-        hashed_password = self._hash_password(password)
+        await self._check_password_strength(password)
+        hashed_password = await self._hash_password(password)
         token = secrets.token_urlsafe(16)  # Generate the token
         expiration = datetime.now(timezone.utc) + timedelta(hours=1)
 
@@ -55,17 +62,21 @@ class UserServiceImplementation(UserService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error during user creation: {str(e)}")
 
-    async def send_verification_email(self, email: str, verification_url: str):
-        # Your email service call to send the email
-        await self.email_service.send_verification_email(email, verification_url)
+    async def send_verification_email(self, email: str, verification_url: str, db: AsyncSession):
+        # Queued as a send_email job, delivered by the job worker
+        await self.email_service.send_verification_email(email, verification_url, db)
 
     async def login_user(self, email: str, password: str, db: AsyncSession) -> Optional[UserEntity]:
         try:
             user = await self.repository.get_by_email(db, email)
-            if user and self.verify_password(password, user.hashed_password):
-                if not user.email_verified:
-                    raise ValidationError("Email not verified.")
-                return user
+            if user:
+                valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+                if valid:
+                    if not user.email_verified:
+                        raise ValidationError("Email not verified.")
+                    if new_hash:
+                        await self._rehash_password(user, new_hash, db)
+                    return user
             raise NotFoundError("Invalid email or password.")
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error during login: {str(e)}")
@@ -115,12 +126,15 @@ class UserServiceImplementation(UserService):
     async def update_user_details(self, user_id: uuid.UUID, old_password: str, new_password: Optional[str],
                                   first_name: Optional[str], last_name: Optional[str],
                                   phone_number: Optional[str], db: AsyncSession) -> UserEntity:
+        if new_password:
+            await self._check_password_strength(new_password)
+
         try:
             user = await self.repository.get_by_id(db, user_id)
             if not user:
                 raise NotFoundError(f"User with ID '{user_id}' not found.")
 
-            if not old_password or not self.verify_password(old_password, user.hashed_password):
+            if not old_password or not await self.verify_password(old_password, user.hashed_password):
                 raise ValidationError("Incorrect old password.")
 
             # Track whether any changes are made
@@ -128,7 +142,7 @@ class UserServiceImplementation(UserService):
 
             # Update only if new_password is provided and different
             if new_password:
-                hashed_new_password = self._hash_password(new_password)
+                hashed_new_password = await self._hash_password(new_password)
                 if hashed_new_password != user.hashed_password:
                     user.hashed_password = hashed_new_password
                     changes_made = True
@@ -160,10 +174,11 @@ class UserServiceImplementation(UserService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error during user update: {str(e)}")
 
-    async def get_users(self, db: AsyncSession, page: int = 1, size: int = 10) -> List[UserEntity]:
+    async def get_users(self, db: AsyncSession, page: int = 1, size: int = 10, cursor: Optional[str] = None) -> List[UserEntity]:
         skip = (page - 1) * size
+        after = self.cursor_keyset.decode(cursor) if cursor else None
         try:
-            return await self.repository.get_all(db, skip=skip, limit=size)
+            return await self.repository.get_all(db, skip=skip, limit=size, after=after)
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error fetching users: {str(e)}")
 
@@ -173,8 +188,18 @@ class UserServiceImplementation(UserService):
         except SQLAlchemyError as e:
             raise DatabaseError(f"Error fetching user by ID: {str(e)}")
 
-    def _hash_password(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def _rehash_password(self, user: UserEntity, new_hash: str, db: AsyncSession) -> None:
+        """Store a hash made with the current CryptContext settings; a failure here must not fail the login."""
+        user.hashed_password = new_hash
+        try:
+            await self.repository.update(db, user)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.warning(f"Could not store upgraded password hash for user {user.user_id}: {str(e)}")
+
+    async def _hash_password(self, password: str) -> str:
+        return await password_hasher.hash(password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
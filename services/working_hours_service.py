@@ -7,6 +7,7 @@ from boundaries.working_hours_boundary import WorkingHoursBoundary
 from entities.working_hours_entity import WorkingHoursEntity
 from boundaries.working_hours_create_boundary import WorkingHoursCreateBoundary
 from boundaries.working_hours_update_boundary import WorkingHoursUpdateBoundary
+from utils.bulk_insert import BulkInsertResult
 
 class WorkingHoursService(ABC):
     @abstractmethod
@@ -21,13 +22,14 @@ class WorkingHoursService(ABC):
         pass
 
     @abstractmethod
-    async def add_working_hours_bulk(self, provider_id: uuid.UUID, working_hours_list: List[WorkingHoursBoundary], db: AsyncSession) -> List[WorkingHoursEntity]:
+    async def add_working_hours_bulk(self, provider_id: uuid.UUID, working_hours_list: List[WorkingHoursBoundary], db: AsyncSession) -> BulkInsertResult:
         """
-        Adds multiple working hours entries in bulk for a service provider.
+        Adds multiple working hours entries in bulk for a service provider. Entries that cannot be added
+        (a day the provider already has, say) are reported per item while the rest are saved.
         :param provider_id: The UUID of the service provider.
         :param working_hours_list: List of working hours boundary objects.
         :param db: Async database session.
-        :return: A list of created WorkingHoursEntity objects.
+        :return: The created WorkingHoursEntity objects and the per-item errors.
         """
         pass
 
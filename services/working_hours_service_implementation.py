@@ -5,17 +5,27 @@ import uuid
 
 from boundaries.working_hours_boundary import WorkingHoursBoundary
 from entities.working_hours_entity import WorkingHoursEntity
+from enums.day_of_week_enum import DayOfWeekEnum
 from repositories.working_hours_repository import WorkingHoursRepository
 from services.working_hours_service import WorkingHoursService
 from boundaries.working_hours_create_boundary import WorkingHoursCreateBoundary
 from boundaries.working_hours_update_boundary import WorkingHoursUpdateBoundary
 from errors.validation_error import ValidationError
 from errors.database_error import DatabaseError
+from utils.bulk_insert import BulkInsertResult
+from utils.weekly_schedule import open_slots
+from utils.response_cache import SERVICE_PROVIDERS, ResponseCache
 
 
 class WorkingHoursServiceImplementation(WorkingHoursService):
-    def __init__(self, repository: WorkingHoursRepository):
+    def __init__(self, repository: WorkingHoursRepository, cache: ResponseCache):
         self.repository = repository
+        self.cache = cache
+
+    async def _refresh_open_slots(self, provider_id: uuid.UUID, db: AsyncSession) -> None:
+        # Rebuild the provider's weekly slot set in the same transaction as the working hours change
+        working_hours = await self.repository.get_by_provider_id(provider_id, db, 0, len(DayOfWeekEnum))
+        await self.repository.update_provider_open_slots(provider_id, open_slots(working_hours), db)
 
     async def add_working_hours(self, provider_id: uuid.UUID, working_hours_boundary: WorkingHoursCreateBoundary, db: AsyncSession) -> WorkingHoursEntity:
         working_hours_entity = WorkingHoursEntity(
@@ -26,7 +36,9 @@ class WorkingHoursServiceImplementation(WorkingHoursService):
         )
         try:
             saved_working_hours = await self.repository.add_working_hours(working_hours_entity, db)
+            await self._refresh_open_slots(provider_id, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
             return saved_working_hours
         except IntegrityError as e:
             await db.rollback()
@@ -38,7 +50,7 @@ class WorkingHoursServiceImplementation(WorkingHoursService):
             await db.rollback()
             raise DatabaseError(f"Unexpected error while creating working hours: {str(e)}")
 
-    async def add_working_hours_bulk(self, provider_id: uuid.UUID, working_hours_list: List[WorkingHoursBoundary], db: AsyncSession) -> List[WorkingHoursEntity]:
+    async def add_working_hours_bulk(self, provider_id: uuid.UUID, working_hours_list: List[WorkingHoursBoundary], db: AsyncSession) -> BulkInsertResult:
         working_hours_entities = [
             WorkingHoursEntity(
                 provider_id=provider_id,
@@ -49,9 +61,13 @@ class WorkingHoursServiceImplementation(WorkingHoursService):
         ]
 
         try:
-            saved_working_hours = await self.repository.add_working_hours_bulk(working_hours_entities, db)
+            result = await self.repository.add_working_hours_bulk(working_hours_entities, db)
+            if result.created:
+                await self._refresh_open_slots(provider_id, db)
             await db.commit()
-            return saved_working_hours
+            if result.created:
+                await self.cache.invalidate(SERVICE_PROVIDERS)
+            return result
         except IntegrityError as e:
             await db.rollback()
             error_message = str(e.orig)
@@ -73,7 +89,9 @@ class WorkingHoursServiceImplementation(WorkingHoursService):
             existing_working_hours.end_time = working_hours_update.end_time
 
             updated_working_hours = await self.repository.update_working_hours(existing_working_hours, db)
+            await self._refresh_open_slots(updated_working_hours.provider_id, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
             return updated_working_hours
         except IntegrityError as e:
             await db.rollback()
@@ -85,8 +103,12 @@ class WorkingHoursServiceImplementation(WorkingHoursService):
 
     async def remove_working_hours(self, working_hours_id: uuid.UUID, db: AsyncSession) -> None:
         try:
+            existing_working_hours = await self.repository.get_by_id(working_hours_id, db)
             await self.repository.remove_working_hours(working_hours_id, db)
+            if existing_working_hours:
+                await self._refresh_open_slots(existing_working_hours.provider_id, db)
             await db.commit()
+            await self.cache.invalidate(SERVICE_PROVIDERS)
         except IntegrityError as e:
             await db.rollback()
             error_message = str(e.orig)
@@ -0,0 +1,96 @@
+# Chunked multi-row inserts for the /bulk endpoints, with per-item conflict and constraint errors
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 1000))
+# PostgreSQL's limit on bind parameters in one statement
+_MAX_PARAMETERS = 32767
+
+
+class BulkItemError(NamedTuple):
+    index: int  # Position of the item in the request
+    detail: str
+
+
+class BulkInsertResult(NamedTuple):
+    created: List[Any]  # The inserted entities, in request order
+    errors: List[BulkItemError]
+
+
+def _values(entity: Any) -> Dict[str, Any]:
+    """Column values of a transient entity, with its primary key generated here so inserted rows can be matched up."""
+    state = inspect(entity)
+    values = {attribute.key: state.dict[attribute.key] for attribute in state.mapper.column_attrs
+              if attribute.key in state.dict}
+    for column in state.mapper.primary_key:
+        key = state.mapper.get_property_by_column(column).key
+        if values.get(key) is None and column.default is not None and column.default.is_callable:
+            values[key] = column.default.arg(None)
+    return values
+
+
+def _describe(error: DBAPIError) -> str:
+    # asyncpg messages come as "<class '...'>: message\nDETAIL:  ..."
+    message = str(error.orig).split(": ", 1)[-1]
+    return " ".join(line.strip() for line in message.splitlines() if line.strip())
+
+
+async def bulk_insert(entities: Sequence[Any], db: AsyncSession, conflict_constraint: Optional[str] = None,
+                      conflict_detail: str = "Already exists.",
+                      chunk_size: int = BULK_INSERT_CHUNK_SIZE) -> BulkInsertResult:
+    """
+    Insert transient entities of one type with multi-row INSERT ... RETURNING statements of up to chunk_size rows,
+    instead of the per-object unit-of-work bookkeeping of add_all() + flush().
+
+    Rows that hit conflict_constraint are skipped (ON CONFLICT DO NOTHING) and reported with conflict_detail. Each
+    chunk runs in a savepoint. A chunk failing on another constraint (an unknown foreign key, say) is split in halves
+    until the offending rows are isolated and reported, so one bad row does not fail the batch. Nothing is committed.
+    """
+    if not entities:
+        return BulkInsertResult(created=[], errors=[])
+    entity_type = type(entities[0])
+    mapper = inspect(entity_type)
+    primary_key = [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+    rows = [_values(entity) for entity in entities]
+    columns = len(mapper.column_attrs)
+    chunk_size = max(1, min(chunk_size, _MAX_PARAMETERS // columns))
+
+    statement = insert(entity_type)
+    if conflict_constraint is not None:
+        statement = statement.on_conflict_do_nothing(constraint=conflict_constraint)
+    statement = statement.returning(entity_type)
+
+    created: Dict[int, Any] = {}
+    errors: List[BulkItemError] = []
+
+    async def insert_chunk(indexes: List[int]) -> None:
+        try:
+            async with db.begin_nested():
+                result = await db.execute(statement, [rows[index] for index in indexes])
+                inserted = {tuple(getattr(entity, key) for key in primary_key): entity for entity in result.scalars()}
+        except (IntegrityError, DataError) as e:
+            if len(indexes) == 1:
+                errors.append(BulkItemError(index=indexes[0], detail=_describe(e)))
+                return
+            middle = len(indexes) // 2
+            await insert_chunk(indexes[:middle])
+            await insert_chunk(indexes[middle:])
+            return
+        for index in indexes:
+            # Of several items with the same key only the first can have been inserted
+            entity = inserted.pop(tuple(rows[index][key] for key in primary_key), None)
+            if entity is not None:
+                created[index] = entity
+            else:
+                errors.append(BulkItemError(index=index, detail=conflict_detail))
+
+    for start in range(0, len(rows), chunk_size):
+        await insert_chunk(list(range(start, min(start + chunk_size, len(rows)))))
+
+    return BulkInsertResult(created=[created[index] for index in sorted(created)],
+                            errors=sorted(errors, key=lambda error: error.index))
@@ -0,0 +1,74 @@
+# Opaque keyset pagination cursors for list endpoints
+import base64
+import binascii
+import enum
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from errors.validation_error import ValidationError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _load(value: Any, value_type: type) -> Any:
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type is date:
+        return date.fromisoformat(value)
+    if value_type is uuid.UUID:
+        return uuid.UUID(value)
+    if not isinstance(value, value_type):
+        raise TypeError(f"Expected {value_type.__name__}")
+    return value
+
+
+class Keyset(NamedTuple):
+    """
+    The ordered attributes a list is sorted by, ending with a unique column.
+    A cursor carries the values of the last row of a page, so the next page can start with
+    WHERE (a, b) > (:a, :b) instead of skipping over every earlier row with OFFSET.
+    """
+    attributes: Tuple[str, ...]
+    types: Tuple[type, ...]
+
+    def encode(self, item: Any) -> str:
+        payload = json.dumps([_dump(getattr(item, attribute)) for attribute in self.attributes], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, token: str) -> Tuple:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            if not isinstance(payload, list) or len(payload) != len(self.types):
+                raise ValueError("Wrong number of cursor values")
+            return tuple(_load(value, value_type) for value, value_type in zip(payload, self.types))
+        except (ValueError, TypeError, AttributeError, binascii.Error):
+            raise ValidationError("Invalid pagination cursor.")
+
+
+def next_cursor(items: Sequence[Any], size: int, keyset: Keyset) -> Optional[str]:
+    """Return the cursor of the page after `items`, or None if this was the last page."""
+    if len(items) < size:
+        return None
+    return keyset.encode(items[-1])
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], size: int, keyset: Keyset) -> Optional[str]:
+    """Expose the cursor of the page after `items` in the X-Next-Cursor header, unless this was the last page."""
+    cursor = next_cursor(items, size, keyset)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
@@ -0,0 +1,61 @@
+# Entity tags and If-None-Match handling for conditional GETs
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from errors.precondition_failed_error import PreconditionFailedError
+
+ETAG_HEADER = "ETag"
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong entity tag from a hash of the encoded response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def version_etag(version: int) -> str:
+    """Entity tag of a versioned row; its version changes with every update, so no hashing is needed."""
+    return f'"v{version}"'
+
+
+def if_match_version(if_match: Optional[str]) -> Optional[int]:
+    """
+    The row version an If-Match header requires, or None when there is no precondition (absent or *).
+    If-Match uses strong comparison, so weak or unrecognised tags can never match and fail the precondition.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith('"v') and tag.endswith('"') and tag[2:-1].isdigit():
+        return int(tag[2:-1])
+    raise PreconditionFailedError("If-Match does not name a current version of this resource.")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison as If-None-Match requires: W/ prefixes are ignored and * matches anything."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
+
+
+def conditional_json(request: Request, body: bytes, headers: Optional[dict] = None,
+                     etag: Optional[str] = None) -> Response:
+    """A JSON response carrying its ETag, or an empty 304 when the client already holds that version."""
+    etag = etag or (headers or {}).get(ETAG_HEADER) or compute_etag(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    return Response(content=body, media_type="application/json", headers={**(headers or {}), ETAG_HEADER: etag})
@@ -0,0 +1,24 @@
+# Shared PostGIS expressions for geo filtering and ordering
+from geoalchemy2 import Geography
+from typing import Optional
+
+from sqlalchemy import cast, func
+
+
+def geography_point(longitude: float, latitude: float):
+    """Build a constant WGS84 geography point, so comparisons against Geography columns can use their GiST index."""
+    return cast(func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326), Geography(geometry_type='POINT', srid=4326))
+
+
+def knn_distance(column, point):
+    """
+    PostGIS `<->` distance operator. In ORDER BY ... LIMIT it is answered by walking the GiST index
+    in distance order instead of computing ST_Distance for every row and sorting.
+    """
+    return column.op('<->')(point)
+
+
+def orders_by_distance(longitude: Optional[float], latitude: Optional[float], radius_km: Optional[float],
+                       nearest: bool) -> bool:
+    """Whether a report filter is sorted by distance from the given point rather than by report date."""
+    return longitude is not None and latitude is not None and (nearest or radius_km is not None)
@@ -0,0 +1,95 @@
+# Geohash helpers used to bucket geo points into a fixed grid
+import math
+from typing import Set, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def _cell_bits(precision: int) -> Tuple[int, int]:
+    """Return the number of (longitude, latitude) bits used by a geohash of the given precision."""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    return lon_bits, total_bits - lon_bits
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """Return the (longitude, latitude) size of a geohash cell in degrees."""
+    lon_bits, lat_bits = _cell_bits(precision)
+    return 360.0 / (1 << lon_bits), 180.0 / (1 << lat_bits)
+
+
+def _encode_cell(lon_index: int, lat_index: int, precision: int) -> str:
+    lon_bits, lat_bits = _cell_bits(precision)
+    bits = 0
+    # Interleave bits starting with longitude, most significant bit first
+    for i in range(precision * 5):
+        if i % 2 == 0:
+            lon_bits -= 1
+            bits = (bits << 1) | ((lon_index >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            bits = (bits << 1) | ((lat_index >> lat_bits) & 1)
+
+    chars = []
+    for shift in range((precision - 1) * 5, -1, -5):
+        chars.append(_BASE32[(bits >> shift) & 31])
+    return "".join(chars)
+
+
+def cell_index(latitude: float, longitude: float, precision: int) -> Tuple[int, int]:
+    """Return the integer (longitude, latitude) coordinates of the geohash cell containing a point."""
+    lon_bits, lat_bits = _cell_bits(precision)
+    lon_cells, lat_cells = 1 << lon_bits, 1 << lat_bits
+    lon_index = min(int((longitude + 180.0) / 360.0 * lon_cells), lon_cells - 1)
+    lat_index = min(int((latitude + 90.0) / 180.0 * lat_cells), lat_cells - 1)
+    return lon_index, lat_index
+
+
+def encode(latitude: float, longitude: float, precision: int = 5) -> str:
+    """Encode a latitude/longitude pair into a geohash string."""
+    lon_index, lat_index = cell_index(latitude, longitude, precision)
+    return _encode_cell(lon_index, lat_index, precision)
+
+
+def cell_indexes_within(latitude: float, longitude: float, radius_km: float, precision: int = 5) -> Set[Tuple[int, int]]:
+    """
+    Return the integer coordinates of every geohash cell that intersects the bounding box of a circle.
+    Longitude wraps around the antimeridian; latitude is clamped at the poles.
+    """
+    lon_bits, lat_bits = _cell_bits(precision)
+    lon_cells, lat_cells = 1 << lon_bits, 1 << lat_bits
+    lon_size, lat_size = cell_size_degrees(precision)
+
+    lat_delta = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lon_delta = min(radius_km / (KM_PER_DEGREE * cos_lat), 180.0)
+
+    lon_index, lat_index = cell_index(latitude, longitude, precision)
+    lon_steps = min(int(math.ceil(lon_delta / lon_size)), lon_cells // 2)
+    lat_steps = int(math.ceil(lat_delta / lat_size))
+
+    cells = set()
+    for lat_offset in range(-lat_steps, lat_steps + 1):
+        cell_lat = lat_index + lat_offset
+        if cell_lat < 0 or cell_lat >= lat_cells:
+            continue
+        for lon_offset in range(-lon_steps, lon_steps + 1):
+            cells.add(((lon_index + lon_offset) % lon_cells, cell_lat))
+    return cells
+
+
+def cells_within(latitude: float, longitude: float, radius_km: float, precision: int = 5) -> Set[str]:
+    """Return every geohash cell, as a geohash string, that intersects the bounding box of a circle."""
+    return {_encode_cell(lon_index, lat_index, precision)
+            for lon_index, lat_index in cell_indexes_within(latitude, longitude, radius_km, precision)}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -0,0 +1,115 @@
+# Resized WebP variants and perceptual hashes of uploaded images, rendered on a process pool
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Sequence
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from errors.validation_error import ValidationError
+from utils.perceptual_hash import dhash
+
+logger = logging.getLogger(__name__)
+
+# Longest side in pixels of each variant; images are never scaled up, so a small original gets fewer variants
+IMAGE_VARIANT_SIZES = sorted({int(size) for size in os.getenv("IMAGE_VARIANT_SIZES", "64,256,1024").split(",")
+                              if size.strip()})
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", 80))
+# 0 renders on a thread of this process instead of a process pool
+IMAGE_RESIZE_WORKERS = int(os.getenv("IMAGE_RESIZE_WORKERS", 2))
+# Larger originals are rejected before decoding, so a small file cannot expand into gigabytes of pixels
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 50_000_000))
+
+VARIANT_CONTENT_TYPE = "image/webp"
+
+
+class RenderedVariant(NamedTuple):
+    name: str
+    width: int
+    height: int
+    data: bytes
+
+
+class RenderedImage(NamedTuple):
+    perceptual_hash: int  # Unsigned 64-bit dHash
+    variants: List[RenderedVariant]  # Largest first; none when the original is already smaller than every size
+
+
+def variant_name(size: int) -> str:
+    return f"max_{size}"
+
+
+def _render(data: bytes, sizes: Sequence[int], quality: int, max_pixels: int) -> RenderedImage:
+    try:
+        with Image.open(io.BytesIO(data)) as original:
+            if original.width * original.height > max_pixels:
+                raise ValidationError(f"Image is too large ({original.width}x{original.height} pixels).")
+            sizes = sorted((size for size in sizes if size < max(original.size)), reverse=True)
+            # JPEGs decode straight at a reduced scale that is still enough for the largest variant and the hash
+            target = max(sizes[0] if sizes else 0, 64)
+            original.draft("RGB", (target, target))
+            image = ImageOps.exif_transpose(original)
+            transparent = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if transparent else "RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValidationError(f"Uploaded file is not a readable image: {str(e)}")
+
+    perceptual_hash = dhash(image)
+    variants = []
+    # Largest first, each scaled down from the previous one rather than from the full original
+    for size in sizes:
+        image = image.copy()
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "WEBP", quality=quality)
+        variants.append(RenderedVariant(variant_name(size), image.width, image.height, buffer.getvalue()))
+    return RenderedImage(perceptual_hash, variants)
+
+
+class ImageResizer:
+    """
+    Decoding and re-encoding images is CPU bound, so it runs on a process pool instead of on the event loop or
+    under the GIL of the web worker. Calls come from the images job queue, whose concurrency bounds them.
+    """
+
+    def __init__(self, sizes: Sequence[int] = IMAGE_VARIANT_SIZES, quality: int = IMAGE_VARIANT_QUALITY,
+                 workers: int = IMAGE_RESIZE_WORKERS, max_pixels: int = IMAGE_MAX_PIXELS):
+        self.sizes = list(sizes)
+        self.quality = quality
+        self.workers = workers
+        self.max_pixels = max_pixels
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers > 0 and self._executor is None:
+            # Spawned workers do not inherit the event loop, sockets or threads of the web worker
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def render(self, data: bytes) -> RenderedImage:
+        """Return the hash and variants of an encoded image; ValidationError if it cannot be decoded."""
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(_render, data, self.sizes, self.quality, self.max_pixels)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, _render, data, self.sizes, self.quality, self.max_pixels)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM killed); start a fresh pool for the next call and let the job retry
+            logger.error("Image resizing pool is broken, restarting it")
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Process-wide resizer used by the image variant jobs of this worker
+image_resizer = ImageResizer()
@@ -0,0 +1,149 @@
+# In-memory multi-index hash over lost pet photos, searched by Hamming distance to found pet photos
+import itertools
+import time
+import uuid
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from utils import geohash
+from utils.perceptual_hash import HASH_BITS
+
+
+class LostPetPhoto(NamedTuple):
+    image_id: uuid.UUID
+    pet_id: uuid.UUID
+    report_id: uuid.UUID  # Open lost report of the pet
+    latitude: float
+    longitude: float
+    perceptual_hash: int  # Unsigned 64-bit dHash
+    user_id: Optional[uuid.UUID] = None
+
+
+class SimilarLostPet(NamedTuple):
+    report_id: uuid.UUID
+    pet_id: uuid.UUID
+    image_id: uuid.UUID  # The pet's photo closest to the found pet photos
+    hamming_distance: int
+    distance_km: Optional[float]
+    user_id: Optional[uuid.UUID] = None
+
+
+class ImageSimilarityIndex:
+    """
+    Multi-index hashing: every 64-bit hash is cut into `chunks` substrings, and each substring position has its own
+    table from substring value to photos. Hashes at most max_distance bits apart agree within max_distance // chunks
+    bits on at least one substring, so a search probes each table only for the substrings that close to the query's
+    and checks the full distance of the photos found there, instead of comparing against every photo. With 16-bit
+    substrings, a table bucket holds about size / 65536 photos.
+    """
+
+    def __init__(self, chunks: int = 4):
+        if HASH_BITS % chunks:
+            raise ValueError(f"chunks must divide {HASH_BITS}")
+        self.chunks = chunks
+        self.chunk_bits = HASH_BITS // chunks
+        self._chunk_mask = (1 << self.chunk_bits) - 1
+        self._photos: List[LostPetPhoto] = []
+        self._hashes = array("Q")
+        self._tables: List[Dict[int, array]] = [{} for _ in range(chunks)]
+        self._flip_masks: Dict[int, List[int]] = {}
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._photos)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age_seconds
+
+    def extend(self, photos: Iterable[LostPetPhoto]) -> None:
+        """
+        Add photos to the index. Not safe while the index is searched; build a fresh index with it (e.g. on a
+        thread, batch by batch) and swap it in with replace_with.
+        """
+        loaded, hashes, tables = self._photos, self._hashes, self._tables
+        for position, photo in enumerate(photos, start=len(loaded)):
+            loaded.append(photo)
+            hashes.append(photo.perceptual_hash)
+            for chunk, table in enumerate(tables):
+                key = (photo.perceptual_hash >> (chunk * self.chunk_bits)) & self._chunk_mask
+                positions = table.get(key)
+                if positions is None:
+                    positions = table[key] = array("I")
+                positions.append(position)
+
+    def replace_with(self, other: "ImageSimilarityIndex") -> None:
+        """Swap in the photos of another index at once; searches see either the old or the new photos."""
+        if other.chunks != self.chunks:
+            raise ValueError("Both indexes must use the same number of chunks")
+        self._photos, self._hashes, self._tables = other._photos, other._hashes, other._tables
+        self.loaded_at = time.monotonic()
+
+    def replace_all(self, photos: Iterable[LostPetPhoto]) -> None:
+        """Rebuild the whole index and swap it in at once."""
+        fresh = ImageSimilarityIndex(self.chunks)
+        fresh.extend(photos)
+        self.replace_with(fresh)
+
+    def _masks(self, radius: int) -> List[int]:
+        """Every chunk_bits-wide value with at most radius bits set, i.e. the flips to probe around a substring."""
+        masks = self._flip_masks.get(radius)
+        if masks is None:
+            masks = [sum(1 << bit for bit in bits)
+                     for flipped in range(radius + 1)
+                     for bits in itertools.combinations(range(self.chunk_bits), flipped)]
+            self._flip_masks[radius] = masks
+        return masks
+
+    def search(self, perceptual_hashes: Sequence[int], max_distance: int, limit: int,
+               latitude: Optional[float] = None, longitude: Optional[float] = None,
+               radius_km: Optional[float] = None) -> List[SimilarLostPet]:
+        """
+        Return the lost pets with a photo at most max_distance bits from any of the given hashes, closest first and
+        one entry per lost report. With a location and radius_km, only reports within radius_km are returned.
+        """
+        geo_filter = latitude is not None and longitude is not None and radius_km is not None
+        masks = self._masks(max_distance // self.chunks)
+        photos, hashes = self._photos, self._hashes
+        best: Dict[uuid.UUID, SimilarLostPet] = {}
+        for query in perceptual_hashes:
+            seen = set()
+            for chunk, table in enumerate(self._tables):
+                key = (query >> (chunk * self.chunk_bits)) & self._chunk_mask
+                for mask in masks:
+                    positions = table.get(key ^ mask)
+                    if positions is None:
+                        continue
+                    for position in positions:
+                        if position in seen:
+                            continue
+                        seen.add(position)
+                        distance = (hashes[position] ^ query).bit_count()
+                        if distance > max_distance:
+                            continue
+                        photo = photos[position]
+                        distance_km = None
+                        if geo_filter:
+                            distance_km = geohash.haversine_km(latitude, longitude, photo.latitude, photo.longitude)
+                            if distance_km > radius_km:
+                                continue
+                            distance_km = round(distance_km, 3)
+                        current = best.get(photo.report_id)
+                        if current is None or distance < current.hamming_distance:
+                            best[photo.report_id] = SimilarLostPet(
+                                report_id=photo.report_id,
+                                pet_id=photo.pet_id,
+                                image_id=photo.image_id,
+                                hamming_distance=distance,
+                                distance_km=distance_km,
+                                user_id=photo.user_id
+                            )
+        ranked = sorted(best.values(), key=lambda match: (match.hamming_distance, match.distance_km or 0.0))
+        return ranked[:limit]
+
+
+# Process-wide index shared by every request handled by this worker
+image_similarity_index = ImageSimilarityIndex()
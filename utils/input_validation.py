@@ -0,0 +1,61 @@
+# Phone number normalisation and password strength checks shared by the user and provider boundaries
+import asyncio
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+import phonenumbers
+
+logger = logging.getLogger(__name__)
+
+PHONE_CACHE_SIZE = int(os.getenv("PHONE_CACHE_SIZE", 10000))
+# Regions whose phone metadata is loaded at startup instead of on the first registration from there
+PHONE_WARMUP_REGIONS = [region.strip().upper() for region in os.getenv("PHONE_WARMUP_REGIONS", "US,GB").split(",")
+                        if region.strip()]
+MIN_PASSWORD_SCORE = 3
+# zxcvbn gets slower with length and bcrypt ignores everything past 72 bytes anyway
+PASSWORD_SCORE_MAX_LENGTH = 72
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def normalize_phone_number(value: str) -> Optional[str]:
+    """Return the E.164 form of a phone number, or None when it is not a valid number. Results are cached."""
+    try:
+        phone = phonenumbers.parse(value)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(phone):
+        return None
+    return phonenumbers.format_number(phone, phonenumbers.PhoneNumberFormat.E164)
+
+
+def password_weakness(password: str) -> Optional[str]:
+    """
+    Return the feedback message for a password that is too weak, or None when it is strong enough. CPU bound, so
+    it runs on the password hashing pool (PasswordHasher.password_weakness).
+    """
+    # Imported here so only the processes that score passwords load zxcvbn's dictionaries
+    from zxcvbn import zxcvbn
+    result = zxcvbn(password[:PASSWORD_SCORE_MAX_LENGTH])
+    if result['score'] >= MIN_PASSWORD_SCORE:
+        return None
+    return "Password is too weak. " + " ".join(result['feedback']['suggestions'])
+
+
+def warm_up_password_scoring() -> None:
+    password_weakness("warm-up Tr0ub4dor&3")
+
+
+def _warm_up() -> None:
+    for region in PHONE_WARMUP_REGIONS:
+        example = phonenumbers.example_number(region)
+        if example is None:
+            logger.warning(f"Unknown phone warm-up region {region}")
+            continue
+        normalize_phone_number(phonenumbers.format_number(example, phonenumbers.PhoneNumberFormat.E164))
+
+
+async def warm_up_validation() -> None:
+    """Load the phone metadata of PHONE_WARMUP_REGIONS before the first request."""
+    await asyncio.to_thread(_warm_up)
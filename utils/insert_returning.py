@@ -0,0 +1,24 @@
+# Single round-trip ORM inserts that read the stored row back with RETURNING
+from typing import TypeVar
+
+from sqlalchemy import insert, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+EntityT = TypeVar("EntityT")
+
+
+async def insert_returning(entity: EntityT, db: AsyncSession) -> EntityT:
+    """
+    Insert a new (transient) entity and return the persistent instance loaded from the inserted row.
+
+    db.add() + flush() + refresh() is two round trips: the INSERT, then a SELECT to read back defaults and the
+    database's representation of columns such as geography points. INSERT ... RETURNING does both at once.
+    Column defaults apply to every attribute that was not set. Only columns are written, so related objects
+    must be inserted separately.
+    """
+    state = inspect(entity)
+    values = {attribute.key: state.dict[attribute.key] for attribute in state.mapper.column_attrs
+              if attribute.key in state.dict}
+    entity_type = type(entity)
+    result = await db.execute(insert(entity_type).values(**values).returning(entity_type))
+    return result.scalar_one()
@@ -1,42 +1,64 @@
+import calendar
 import os
 import uuid
 
-from jose import JWTError, jwt
+from jose import JWTError
 from datetime import datetime, timedelta
 from typing import Union
 from pydantic import BaseModel
 
 from enums.role_enum import RoleEnum
+from utils.token_cache import VerifiedTokenCache
+from utils.token_signer import HmacTokenSigner, JoseTokenSigner, TokenSigner
 
 # Load environment variables
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ALGORITHM = os.getenv("JWT_ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))  # Token expiration time as int
+# "jose" for python-jose, "hmac" for the standard library fast path (HS256/HS384/HS512 only)
+JWT_BACKEND = os.getenv("JWT_BACKEND", "jose").lower()
+# Verified tokens are reused for up to JWT_CACHE_TTL_SECONDS, never past their exp; 0 disables the cache
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10000))
+JWT_CACHE_TTL_SECONDS = float(os.getenv("JWT_CACHE_TTL_SECONDS", 300))
 
 class TokenData(BaseModel):
     user_id: uuid.UUID
     role: RoleEnum
 
 
+def _create_token_signer() -> TokenSigner:
+    if JWT_BACKEND == "hmac":
+        return HmacTokenSigner(SECRET_KEY, ALGORITHM)
+    return JoseTokenSigner(SECRET_KEY, ALGORITHM)
+
+
+token_signer = _create_token_signer()
+token_cache = VerifiedTokenCache(max_size=JWT_CACHE_SIZE, ttl_seconds=JWT_CACHE_TTL_SECONDS)
+
+
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": calendar.timegm(expire.utctimetuple())})
 
     # Ensure the role is stored as its value in the token
     if 'role' in to_encode and isinstance(to_encode['role'], RoleEnum):
         to_encode['role'] = to_encode['role'].value  # Convert Enum to its string value
 
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = token_signer.sign(to_encode)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> TokenData:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_signer.verify(token)
         user_id: str = payload.get("sub")
         role: str = payload.get("role")
 
@@ -47,7 +69,9 @@ def decode_access_token(token: str) -> TokenData:
         role_enum = RoleEnum(role)
         user_id_uuid = uuid.UUID(user_id)  # Ensure user_id is a valid UUID
 
-        return TokenData(user_id=user_id_uuid, role=role_enum)
+        token_data = TokenData(user_id=user_id_uuid, role=role_enum)
+        token_cache.put(token, token_data, payload.get("exp"))
+        return token_data
 
     except JWTError as e:
         # Catch any JWT-related error, including expired tokens
@@ -1,34 +1,52 @@
+import functools
+import inspect
 import logging
-from typing import Iterable
-from sqlalchemy.engine import Row  # Importing to handle SQLAlchemy row results
+import time
+from collections.abc import Sized
 
 logger = logging.getLogger(__name__)
 
+
+def _rows(result) -> int:
+    # Only the size of the result is logged, never its contents
+    if result is None:
+        return 0
+    return len(result) if isinstance(result, Sized) and not isinstance(result, str) else 1
+
+
 def log_db_operation(func):
-    async def wrapper(*args, **kwargs):  # Make the decorator async-friendly if needed
-        # Convert args and kwargs to a more readable format
-        formatted_args = [str(arg) for arg in args]
-        formatted_kwargs = {k: str(v) for k, v in kwargs.items()}
+    """Log the duration and result size of a repository call at DEBUG, and failures at ERROR."""
+    name = func.__qualname__
 
-        logger.info(f"DB Operation: {func.__name__} called with args: {formatted_args}, kwargs: {formatted_kwargs}")
-        try:
-            result = await func(*args, **kwargs) if callable(func) else func(*args, **kwargs)  # Ensure async compatibility
-
-            # Format the result for logging
-            if isinstance(result, Iterable) and not isinstance(result, str):
-                # If it's an iterable but not a string, log its elements
-                if all(isinstance(item, Row) for item in result):
-                    # For SQLAlchemy rows, log each row's dictionary representation
-                    formatted_result = f"[{', '.join(str(dict(item)) for item in result)}]"
-                else:
-                    formatted_result = f"[{', '.join(str(item) for item in result)}]"
-            else:
-                # Log the result directly if it's not an iterable
-                formatted_result = str(result)
-
-            logger.info(f"DB Operation Successful: {func.__name__} returned {formatted_result}")
+    def _log(started: float, result) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DB operation %s", name, extra={
+                "operation": name,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "rows": _rows(result),
+            })
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                logger.error("DB operation %s failed: %s", name, type(e).__name__, extra={"operation": name})
+                raise
+            _log(started, result)
             return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"DB Operation Failed: {func.__name__} raised {e}")
+            logger.error("DB operation %s failed: %s", name, type(e).__name__, extra={"operation": name})
             raise
+        _log(started, result)
+        return result
     return wrapper
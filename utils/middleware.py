@@ -1,14 +1,117 @@
+import functools
+import inspect
 import logging
-from fastapi import Request
+import time
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+from utils import query_profiler
+from utils.metrics import observe_request
+from utils.request_stats import RequestStats, current_request_stats
+from utils.structured_logging import RouteSampler
 
 logger = logging.getLogger(__name__)
+sampler = RouteSampler.from_env()
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Pure ASGI middleware recording per-route metrics (utils.metrics) for every request and writing one structured,
+    sampled log record with timing fields instead of payloads.
+    Unlike an @app.middleware("http") function it does not wrap the response in an extra task and stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        send_profile = False
+        if query_profiler.SQL_PROFILER_ENABLED:
+            stats.profile = query_profiler.QueryProfile()
+            send_profile = any(name == query_profiler.SQL_DEBUG_REQUEST_HEADER for name, _ in scope["headers"])
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        response_started = None
+
+        async def send_with_status(message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = time.perf_counter()
+                if send_profile:
+                    headers = list(message.get("headers", []))
+                    headers.append((query_profiler.SQL_PROFILE_HEADER, stats.profile.header_value()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            current_request_stats.reset(token)
+            # Label by route template so /pets/{pet_id} is one series, unmatched paths share "unmatched"
+            route = getattr(scope.get("route"), "path", "unmatched")
+            serialization_ms = None
+            if stats.endpoint_finished is not None and response_started is not None:
+                serialization_ms = (response_started - stats.endpoint_finished) * 1000
+
+            if stats.profile is not None:
+                query_profiler.report(stats.profile, scope["method"], route)
+            observe_request(scope["method"], route, status_code, latency_ms / 1000, stats.db_ms / 1000,
+                            stats.pool_wait_ms / 1000, serialization_ms / 1000 if serialization_ms is not None else None)
+            if sampler.should_log(route, status_code, latency_ms):
+                logger.info("%s %s %s", scope["method"], route, status_code, extra={
+                    "method": scope["method"],
+                    "route": route,
+                    "status": status_code,
+                    "latency_ms": round(latency_ms, 2),
+                    "db_ms": round(stats.db_ms, 2),
+                    "db_queries": stats.db_queries,
+                    "rows": stats.rows,
+                    "pool_wait_ms": round(stats.pool_wait_ms, 2),
+                    "serialization_ms": round(serialization_ms, 2) if serialization_ms is not None else None,
+                })
+
+
+def _mark_endpoint_finished() -> None:
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.endpoint_finished = time.perf_counter()
+
 
+def _timed_endpoint(call):
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                _mark_endpoint_finished()
+        return async_endpoint
 
-async def log_requests(request: Request, call_next):
-    # Log the request method and URL
-    logger.info(f"Incoming request: {request.method} {request.url}")
+    @functools.wraps(call)
+    def endpoint(*args, **kwargs):
+        try:
+            return call(*args, **kwargs)
+        finally:
+            _mark_endpoint_finished()
+    return endpoint
 
-    # Proceed with processing the request
-    response = await call_next(request)
 
-    return response
+def instrument_routes(app: FastAPI) -> None:
+    """
+    Mark when each route's endpoint returns, so the middleware can tell serialization time apart from handler time.
+    Called once after every get_*_router() is included; the handlers themselves are untouched.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.dependant.call is not None \
+                and not getattr(route.dependant.call, "_instrumented", False):
+            route.dependant.call = _timed_endpoint(route.dependant.call)
+            route.dependant.call._instrumented = True
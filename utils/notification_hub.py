@@ -0,0 +1,128 @@
+# Per-worker WebSocket registry that saves notifications and fans them out through a pub/sub backplane
+import asyncio
+import collections
+import json
+import logging
+import uuid
+from typing import Dict, List
+
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from boundaries.notification_boundary import NotificationBoundary
+from entities.notification_entity import NotificationEntity
+from repositories.notification_repository import NotificationRepository
+from services.notification_backplane import NotificationBackplane
+from utils.metrics import Counter, registry
+from utils.unread_counter import UnreadCounter
+
+logger = logging.getLogger(__name__)
+
+notifications_dropped = registry.register(Counter(
+    "notifications_dropped_total",
+    "Notifications not pushed by reason: slow_client (the connection's send queue was full).",
+    ("reason",)))
+
+
+class NotificationHub:
+    """
+    Notifications are produced by notify_users jobs (app.jobs), which save each job's notifications with one
+    multi-row insert through save() and then publish them on the backplane. Every worker subscribes to the
+    backplane and hands each message to the sockets it holds for that user, so the worker a client happens to be
+    connected to does not matter. Each socket has a bounded send queue; a client that stops reading misses live
+    pushes but still finds its notifications in the table.
+    """
+
+    def __init__(self, repository: NotificationRepository, backplane: NotificationBackplane,
+                 unread_counter: UnreadCounter, send_queue_size: int = 100, send_timeout: float = 5.0):
+        self.repository = repository
+        self.backplane = backplane
+        self.unread_counter = unread_counter
+        self.send_queue_size = send_queue_size
+        self.send_timeout = send_timeout
+        self._connections: Dict[uuid.UUID, Dict[WebSocket, asyncio.Queue]] = {}
+        self._subscribed = False
+
+    def __len__(self) -> int:
+        """Open connections on this worker."""
+        return sum(len(sockets) for sockets in self._connections.values())
+
+    async def start(self) -> None:
+        if not self._subscribed:
+            await self.backplane.subscribe(self._deliver)
+            self._subscribed = True
+
+    async def stop(self) -> None:
+        await self.backplane.close()
+        self._subscribed = False
+        for sockets in list(self._connections.values()):
+            for websocket in list(sockets):
+                try:
+                    await websocket.close(code=status.WS_1001_GOING_AWAY)
+                except RuntimeError:
+                    pass  # Already closed by the client
+
+    async def save(self, notifications: List[NotificationEntity], db: AsyncSession) -> int:
+        """
+        Save notifications and commit, then count and publish the ones that were new. Notifications whose id is
+        already in the table are skipped, so a job that sets ids deterministically can safely run again.
+        """
+        result = await self.repository.add_all(notifications, db)
+        await db.commit()
+        for error in result.errors:
+            logger.warning(f"Notification for user {notifications[error.index].user_id} not saved: {error.detail}")
+        if result.created:
+            await self.unread_counter.add(collections.Counter(notification.user_id for notification in result.created))
+            try:
+                await self.backplane.publish([NotificationBoundary.model_validate(notification).model_dump_json().encode()
+                                              for notification in result.created])
+            except Exception:
+                # Saved, so clients still see them when they next load their notifications
+                logger.exception(f"Failed to publish {len(result.created)} notifications")
+        return len(result.created)
+
+    async def _deliver(self, message: bytes) -> None:
+        """Backplane handler: queue a published notification on this worker's sockets for its user."""
+        try:
+            user_id = uuid.UUID(json.loads(message)["user_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed notification message")
+            return
+        text = message.decode()
+        for queue in self._connections.get(user_id, {}).values():
+            try:
+                queue.put_nowait(text)
+            except asyncio.QueueFull:
+                notifications_dropped.inc("slow_client")
+
+    async def serve(self, user_id: uuid.UUID, websocket: WebSocket) -> None:
+        """Push user_id's notifications to an accepted socket until the client disconnects."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.send_queue_size)
+        self._connections.setdefault(user_id, {})[websocket] = queue
+        sender = asyncio.create_task(self._send(websocket, queue))
+        try:
+            while True:
+                # Clients have nothing to say; reading is how a disconnect is noticed
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            sockets = self._connections.get(user_id, {})
+            sockets.pop(websocket, None)
+            if not sockets:
+                self._connections.pop(user_id, None)
+
+    async def _send(self, websocket: WebSocket, queue: asyncio.Queue) -> None:
+        while True:
+            text = await queue.get()
+            try:
+                await asyncio.wait_for(websocket.send_text(text), timeout=self.send_timeout)
+            except (asyncio.TimeoutError, RuntimeError, WebSocketDisconnect):
+                logger.info("Closing a notification socket that stopped accepting messages")
+                try:
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                except RuntimeError:
+                    pass
+                return
@@ -0,0 +1,156 @@
+# Password hashing off the event loop, on a bounded process pool
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from errors.service_unavailable_error import ServiceUnavailableError
+from utils.input_validation import password_weakness, warm_up_password_scoring
+from utils.metrics import Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+# Comma separated; the first scheme hashes new passwords, the others are only verified and rehashed on login
+CRYPT_SCHEMES = [scheme.strip() for scheme in (os.getenv("CRYPT_SCHEME") or "bcrypt").split(",") if scheme.strip()]
+PASSWORD_HASH_ROUNDS = os.getenv("PASSWORD_HASH_ROUNDS")
+# 0 hashes on a thread of this process instead of a process pool
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", max(PASSWORD_HASH_WORKERS, 1) * 8))
+PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", 5))
+
+
+def crypt_context_settings() -> Dict:
+    settings = {"schemes": CRYPT_SCHEMES, "deprecated": "auto"}
+    if PASSWORD_HASH_ROUNDS:
+        # Hashes below the configured cost are flagged by verify_and_update and upgraded on the next login
+        settings[f"{CRYPT_SCHEMES[0]}__default_rounds"] = int(PASSWORD_HASH_ROUNDS)
+        settings[f"{CRYPT_SCHEMES[0]}__min_rounds"] = int(PASSWORD_HASH_ROUNDS)
+    return settings
+
+
+# Context of the current process; pool workers build their own in _init_worker
+_context = CryptContext(**crypt_context_settings())
+
+
+def _init_worker(settings: Dict) -> None:
+    global _context
+    _context = CryptContext(**settings)
+    # Load the zxcvbn dictionaries before the first strength check is waiting on this worker
+    warm_up_password_scoring()
+
+
+def _hash(password: str) -> str:
+    return _context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return _context.verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs hashing, verification and zxcvbn strength scoring on a process pool so a login or registration storm cannot
+    stall the event loop, nor hold the GIL of the web worker. At most max_pending calls are queued or running at once; callers beyond that wait up to queue_timeout
+    seconds for a free place and are then rejected with ServiceUnavailableError.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 queue_timeout: float = PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls submitted but not yet picked up by a worker, plus callers waiting for a place in the queue."""
+        return max(self.in_flight - max(self.workers, 1), 0) + self.waiting
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+        }
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers > 0 and self._executor is None:
+            # Spawned workers do not inherit the event loop, sockets or threads of the web worker
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(crypt_context_settings(),)
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            logger.warning(f"Password hashing queue full ({self.max_pending} pending), rejecting request")
+            raise ServiceUnavailableError("Too many concurrent password operations, please retry shortly.")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return await asyncio.to_thread(func, *args)
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM killed); start a fresh pool for the next call
+            logger.error("Password hashing pool is broken, restarting it")
+            self.close()
+            raise ServiceUnavailableError("Password hashing is temporarily unavailable, please retry.")
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Return whether the password matches, and a replacement hash when the stored one uses outdated settings."""
+        return await self._run(_verify_and_update, password, hashed_password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        valid, _ = await self.verify_and_update(password, hashed_password)
+        return valid
+
+    async def password_weakness(self, password: str) -> Optional[str]:
+        """zxcvbn's feedback for a password that is too weak, or None when it is strong enough."""
+        return await self._run(password_weakness, password)
+
+    async def warm_up(self) -> None:
+        """Start a pool worker (which loads the zxcvbn dictionaries) before the first request needs one."""
+        await self._run(warm_up_password_scoring)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Process-wide hasher shared by every request handled by this worker
+password_hasher = PasswordHasher()
+
+registry.register(Gauge("password_hash_queue_depth", "Password hash operations waiting for a pool worker.",
+                        lambda: password_hasher.queue_depth))
+registry.register(Gauge("password_hash_rejected", "Password hash operations rejected since start (HTTP 503).",
+                        lambda: password_hasher.rejected))
@@ -0,0 +1,33 @@
+# 64-bit perceptual hashes of images, compared by Hamming distance
+from PIL import Image
+
+HASH_BITS = 64
+_SIGN_BIT = 1 << (HASH_BITS - 1)
+_MASK = (1 << HASH_BITS) - 1
+
+
+def dhash(image: Image.Image) -> int:
+    """
+    Difference hash: the image shrunk to 9x8 grey pixels, one bit per pair of horizontal neighbours set when the
+    left one is brighter. Re-encoding, resizing and small colour shifts flip few bits; different pictures about half.
+    """
+    pixels = list(image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            value = (value << 1) | (left > pixels[row * 9 + column + 1])
+    return value
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return (first ^ second).bit_count()
+
+
+def to_signed(value: int) -> int:
+    """Store a hash in a BIGINT column, which is signed."""
+    return value - (1 << HASH_BITS) if value & _SIGN_BIT else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & _MASK
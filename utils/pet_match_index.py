@@ -0,0 +1,200 @@
+# In-memory candidate index used to match found pets against open lost pet reports
+import heapq
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils import geohash
+
+
+# (longitude cell, latitude cell, time bucket)
+BucketKey = Tuple[int, int, int]
+
+
+class LostPetCandidate(NamedTuple):
+    report_id: uuid.UUID
+    pet_id: uuid.UUID
+    latitude: float
+    longitude: float
+    report_date: datetime
+    species: Optional[str]
+    breed: Optional[str]
+    main_color: Optional[str]
+    user_id: Optional[uuid.UUID] = None  # Owner of the lost report, who is alerted on a match
+
+
+class PetMatch(NamedTuple):
+    report_id: uuid.UUID
+    pet_id: uuid.UUID
+    score: float
+    distance_km: float
+    report_date: datetime
+    user_id: Optional[uuid.UUID] = None
+
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    value = value.strip().lower()
+    return value or None
+
+
+class PetMatchIndex:
+    """
+    Geohash grid + time bucket index over open lost pet reports.
+    Reports are bucketed by (geohash cell, report_date ordinal // bucket_days), with cells addressed by their
+    integer grid coordinates, so a match only scores the reports around the found location and inside the time window.
+    """
+
+    # Score weights, summing to 1.0
+    DISTANCE_WEIGHT = 0.35
+    TIME_WEIGHT = 0.2
+    SPECIES_WEIGHT = 0.2
+    BREED_WEIGHT = 0.15
+    COLOR_WEIGHT = 0.1
+
+    def __init__(self, precision: int = 5, bucket_days: int = 14):
+        self.precision = precision
+        self.bucket_days = bucket_days
+        self._buckets: Dict[BucketKey, Dict[uuid.UUID, LostPetCandidate]] = {}
+        self._locations: Dict[uuid.UUID, BucketKey] = {}
+        # Changes made while a replacement index is being built, replayed onto it by replace_with
+        self._journal: Optional[List[Tuple[uuid.UUID, Optional[LostPetCandidate]]]] = None
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age_seconds
+
+    def _bucket_key(self, candidate: LostPetCandidate) -> BucketKey:
+        lon_index, lat_index = geohash.cell_index(candidate.latitude, candidate.longitude, self.precision)
+        return lon_index, lat_index, candidate.report_date.toordinal() // self.bucket_days
+
+    def extend(self, candidates: Iterable[LostPetCandidate]) -> None:
+        """
+        Add candidates to the index. Not safe while the index is matched against; build a fresh index with it (e.g.
+        on a thread, batch by batch) and swap it in with replace_with.
+        """
+        buckets, locations = self._buckets, self._locations
+        for candidate in candidates:
+            candidate = self._prepare(candidate)
+            key = self._bucket_key(candidate)
+            buckets.setdefault(key, {})[candidate.report_id] = candidate
+            locations[candidate.report_id] = key
+
+    def begin_rebuild(self) -> None:
+        """
+        Record upserts and removals from now on, so replace_with can replay them onto an index built from rows read
+        after this call, which may predate those changes.
+        """
+        self._journal = []
+
+    def abandon_rebuild(self) -> None:
+        self._journal = None
+
+    def replace_with(self, other: "PetMatchIndex") -> None:
+        """Swap in the reports of another index at once, after replaying the changes recorded since begin_rebuild."""
+        if (other.precision, other.bucket_days) != (self.precision, self.bucket_days):
+            raise ValueError("Both indexes must use the same precision and bucket_days")
+        for report_id, candidate in self._journal or ():
+            if candidate is None:
+                other.remove(report_id)
+            else:
+                other.upsert(candidate)
+        self._buckets, self._locations = other._buckets, other._locations
+        self._journal = None
+        self.loaded_at = time.monotonic()
+
+    def replace_all(self, candidates: Iterable[LostPetCandidate]) -> None:
+        """Rebuild the whole index and swap it in at once."""
+        fresh = PetMatchIndex(self.precision, self.bucket_days)
+        fresh.extend(candidates)
+        self.replace_with(fresh)
+
+    def upsert(self, candidate: LostPetCandidate) -> None:
+        self.remove(candidate.report_id)
+        candidate = self._prepare(candidate)
+        key = self._bucket_key(candidate)
+        self._buckets.setdefault(key, {})[candidate.report_id] = candidate
+        self._locations[candidate.report_id] = key
+        if self._journal is not None:
+            self._journal.append((candidate.report_id, candidate))
+
+    def remove(self, report_id: uuid.UUID) -> None:
+        if self._journal is not None:
+            self._journal.append((report_id, None))
+        key = self._locations.pop(report_id, None)
+        if key is None:
+            return
+        bucket = self._buckets[key]
+        bucket.pop(report_id, None)
+        if not bucket:
+            del self._buckets[key]
+
+    def match(self, latitude: float, longitude: float, found_date: datetime, species: Optional[str],
+              breed: Optional[str], main_color: Optional[str], radius_km: float, max_age_days: int,
+              limit: int) -> List[PetMatch]:
+        """Return the best scoring lost pet reports around a found pet, highest score first."""
+        if radius_km <= 0 or max_age_days <= 0:
+            raise ValueError("radius_km and max_age_days must be greater than 0")
+        species, breed, main_color = _normalize(species), _normalize(breed), _normalize(main_color)
+        earliest = found_date - timedelta(days=max_age_days)
+        latest = found_date + timedelta(days=1)  # Tolerate reports filed shortly after the pet was found
+        time_buckets = range(earliest.toordinal() // self.bucket_days, latest.toordinal() // self.bucket_days + 1)
+        max_age_seconds = max_age_days * 86400.0
+
+        scored = []
+        for lon_index, lat_index in geohash.cell_indexes_within(latitude, longitude, radius_km, self.precision):
+            for time_bucket in time_buckets:
+                candidates = self._buckets.get((lon_index, lat_index, time_bucket))
+                if not candidates:
+                    continue
+                for candidate in candidates.values():
+                    if not earliest <= candidate.report_date <= latest:
+                        continue
+                    if species and candidate.species and species != candidate.species:
+                        continue
+                    distance_km = geohash.haversine_km(latitude, longitude, candidate.latitude, candidate.longitude)
+                    if distance_km > radius_km:
+                        continue
+                    age_seconds = max((found_date - candidate.report_date).total_seconds(), 0.0)
+                    score = (self.DISTANCE_WEIGHT * (1.0 - distance_km / radius_km)
+                             + self.TIME_WEIGHT * (1.0 - age_seconds / max_age_seconds))
+                    if species and species == candidate.species:
+                        score += self.SPECIES_WEIGHT
+                    if breed and breed == candidate.breed:
+                        score += self.BREED_WEIGHT
+                    if main_color and main_color == candidate.main_color:
+                        score += self.COLOR_WEIGHT
+                    scored.append((score, distance_km, candidate))
+
+        best = heapq.nlargest(limit, scored, key=lambda item: item[0])
+        return [
+            PetMatch(
+                report_id=candidate.report_id,
+                pet_id=candidate.pet_id,
+                score=round(score, 4),
+                distance_km=round(distance_km, 3),
+                report_date=candidate.report_date,
+                user_id=candidate.user_id
+            ) for score, distance_km, candidate in best
+        ]
+
+    @staticmethod
+    def _prepare(candidate: LostPetCandidate) -> LostPetCandidate:
+        return candidate._replace(
+            species=_normalize(candidate.species),
+            breed=_normalize(candidate.breed),
+            main_color=_normalize(candidate.main_color)
+        )
+
+
+# Process-wide index shared by every request handled by this worker
+pet_match_index = PetMatchIndex()
@@ -0,0 +1,155 @@
+# Opt-in SQL profiler: per-request statement log, N+1 detection and slow queries with their EXPLAIN plans
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.request_stats import current_request_stats
+
+logger = logging.getLogger("sql.profiler")
+
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false") == "true"
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", 200))
+# A statement run more often than this within one request is reported as a likely N+1
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 5))
+SQL_EXPLAIN_SLOW_QUERIES = os.getenv("SQL_EXPLAIN_SLOW_QUERIES", "true") == "true"
+# The same slow statement is explained at most once per interval, EXPLAIN is an extra round trip
+SQL_EXPLAIN_INTERVAL_SECONDS = float(os.getenv("SQL_EXPLAIN_INTERVAL_SECONDS", 300))
+# Sending this request header (any value) returns the request's profile summary in SQL_PROFILE_HEADER
+SQL_DEBUG_REQUEST_HEADER = b"x-debug-sql"
+SQL_PROFILE_HEADER = b"x-sql-profile"
+
+_WHITESPACE = re.compile(r"\s+")
+# Expanded IN lists and VALUES rows differ in length between calls of the same query
+_PARAMETER_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)+")
+_EXPLAINABLE = re.compile(r"(SELECT|WITH)\b", re.IGNORECASE)
+_last_explained: Dict[str, float] = {}
+
+
+def normalize(statement: str) -> str:
+    return _PARAMETER_LIST.sub("$n...", _WHITESPACE.sub(" ", statement).strip())
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> Any:
+    """Types of the bound parameters, never their values."""
+    if executemany:
+        return {"rows": len(parameters), "row": parameter_shape(parameters[0], False) if parameters else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class StatementStats:
+    __slots__ = ("count", "total_ms", "max_ms", "shape")
+
+    def __init__(self, shape: Any):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.shape = shape
+
+
+class QueryProfile:
+    """Every statement one request ran, grouped by normalized SQL."""
+
+    def __init__(self):
+        self.statements: Dict[str, StatementStats] = {}
+        self.queries = 0
+        self.total_ms = 0.0
+
+    def record(self, statement: str, shape: Any, elapsed_ms: float) -> None:
+        stats = self.statements.get(statement)
+        if stats is None:
+            stats = self.statements[statement] = StatementStats(shape)
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        self.queries += 1
+        self.total_ms += elapsed_ms
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> List[tuple]:
+        return sorted(((statement, stats) for statement, stats in self.statements.items() if stats.count > threshold),
+                      key=lambda item: -item[1].count)
+
+    def summary(self, top: int = 5, statement_chars: int = 160) -> Dict[str, Any]:
+        by_time = sorted(self.statements.items(), key=lambda item: -item[1].total_ms)[:top]
+        return {
+            "queries": self.queries,
+            "distinct": len(self.statements),
+            "db_ms": round(self.total_ms, 2),
+            "n_plus_one": [{"sql": statement[:statement_chars], "count": stats.count}
+                           for statement, stats in self.repeated()],
+            "top": [{"sql": statement[:statement_chars], "count": stats.count, "ms": round(stats.total_ms, 2),
+                     "params": stats.shape} for statement, stats in by_time],
+        }
+
+    def header_value(self) -> bytes:
+        return json.dumps(self.summary(), separators=(",", ":"), default=str).encode("latin-1", "replace")
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """EXPLAIN a slow SELECT on a separate cursor of the same connection, at most once per interval."""
+    normalized = normalize(statement)
+    now = time.monotonic()
+    if not SQL_EXPLAIN_SLOW_QUERIES or not _EXPLAINABLE.match(normalized):
+        return None
+    if now - _last_explained.get(normalized, -SQL_EXPLAIN_INTERVAL_SECONDS) < SQL_EXPLAIN_INTERVAL_SECONDS:
+        return None
+    _last_explained[normalized] = now
+    try:
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            return "\n".join(str(row[0]) for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"EXPLAIN failed: {type(e).__name__}: {e}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_profile_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = current_request_stats.get()
+    profile = stats.profile if stats is not None else None
+    if profile is not None:
+        profile.record(normalize(statement), parameter_shape(parameters, executemany), elapsed_ms)
+
+    if elapsed_ms >= SQL_SLOW_QUERY_MS:
+        plan = None if executemany else _explain(conn, statement, parameters)
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, normalize(statement)[:500], extra={
+            "duration_ms": round(elapsed_ms, 2),
+            "statement": normalize(statement),
+            "params": parameter_shape(parameters, executemany),
+            "plan": plan,
+        })
+
+
+def attach_profiler(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report(profile: QueryProfile, method: str, route: str) -> None:
+    """Log the likely N+1 statements of a finished request."""
+    for statement, stats in profile.repeated():
+        logger.warning("Possible N+1: %s %s ran the same statement %d times", method, route, stats.count, extra={
+            "method": method,
+            "route": route,
+            "count": stats.count,
+            "total_ms": round(stats.total_ms, 2),
+            "statement": statement,
+        })
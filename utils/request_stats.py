@@ -0,0 +1,63 @@
+# Per-request database timing collected from SQLAlchemy engine events
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class RequestStats:
+    """Database work done while handling one request."""
+    __slots__ = ("db_ms", "db_queries", "rows", "pool_wait_ms", "endpoint_finished", "profile")
+
+    def __init__(self):
+        self.db_ms = 0.0
+        self.db_queries = 0
+        self.rows = 0
+        self.pool_wait_ms = 0.0
+        # perf_counter() when the route's endpoint function returned, see utils.middleware.instrument_routes
+        self.endpoint_finished: Optional[float] = None
+        # utils.query_profiler.QueryProfile when SQL_PROFILER_ENABLED
+        self.profile = None
+
+
+# Set by the request middleware; statements run outside a request (startup, background workers) are not counted
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is None or started is None:
+        return
+    stats.db_ms += (time.perf_counter() - started) * 1000
+    stats.db_queries += 1
+    if cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+def track_engine(engine: Engine) -> None:
+    """Accumulate statement time, count and affected/returned rows into the current request's stats."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class PoolWaitTimingPool(AsyncAdaptedQueuePool):
+    """The default async engine pool, also adding the time spent waiting for a connection to the request's stats."""
+
+    def _do_get(self):
+        stats = current_request_stats.get()
+        if stats is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats.pool_wait_ms += (time.perf_counter() - started) * 1000
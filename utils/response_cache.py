@@ -0,0 +1,291 @@
+# Two-tier cache of serialized responses for hot, slowly changing list endpoints
+import asyncio
+import enum
+import hashlib
+import json
+import logging
+import random
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time as time_of_day
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from services.cache_store import CacheStore
+from utils.etag import ETAG_HEADER, compute_etag, conditional_json, etag_matches, not_modified
+from utils.metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Namespaces, each invalidated as a whole by the service layer writes that can change its responses
+SERVICE_PROVIDERS = "service_providers"
+LOST_PET_REPORTS = "lost_pet_reports"
+FOUND_PET_REPORTS = "found_pet_reports"
+PETS = "pets"
+MEDICAL_HISTORIES = "medical_histories"
+
+cache_requests = registry.register(Counter(
+    "response_cache_requests_total",
+    "Response cache lookups by result: hit_local, hit_shared, coalesced (waited for a concurrent load), miss, or "
+    "not_modified (answered 304 from a cached entity tag).",
+    ("namespace", "result")))
+cache_invalidations = registry.register(Counter(
+    "response_cache_invalidations_total", "Namespace invalidations triggered by writes.", ("namespace",)))
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+
+    def encode(self) -> bytes:
+        return json.dumps(self.headers, separators=(",", ":")).encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResponse":
+        headers, body = data.split(b"\n", 1)
+        return cls(body=body, headers=json.loads(headers))
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: type) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def serialize_list(model: type, items: Sequence[Any], headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+    """Validate and encode a list the way the route's response_model would, ready to be cached."""
+    adapter = _list_adapter(model)
+    body = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    return CachedResponse(body=body, headers={**(headers or {}), ETAG_HEADER: compute_etag(body)})
+
+
+def serialize_one(model: type, item: Any, etag: Optional[str] = None) -> CachedResponse:
+    """Validate and encode one object the way the route's response_model would; the ETag defaults to a content hash."""
+    body = model.model_validate(item, from_attributes=True).model_dump_json().encode()
+    return CachedResponse(body=body, headers={ETAG_HEADER: etag or compute_etag(body)})
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+def cache_key(namespace: str, params: Mapping[str, Any]) -> str:
+    """
+    Key of a response from its parsed query parameters: unset parameters are dropped and the rest sorted, so
+    parameter order, defaults spelled out and equivalent spellings (size=010, 9:00 vs 09:00:00) share one entry.
+    """
+    normalized = sorted((name, _normalize(value)) for name, value in params.items() if value is not None)
+    digest = hashlib.blake2b(json.dumps(normalized, separators=(",", ":")).encode(), digest_size=16).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class _Entry(NamedTuple):
+    response: CachedResponse
+    namespace: str
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Response cache with an in-process LRU tier in front of an optional shared tier (CacheStore).
+
+    A lookup that misses both tiers loads the response once per process: concurrent requests for the same key wait
+    for that load instead of all querying the database (stampede protection), and TTLs get a little jitter so
+    entries filled together do not all expire together.
+
+    Invalidation is per namespace. Locally the namespace's entries are dropped and its generation bumped, so a load
+    started before the write is not stored. In the shared tier the generation is a counter that is part of every key,
+    so bumping it orphans all the namespace's entries at once. Other processes' local entries are not reached and
+    stay valid for at most local_ttl_seconds when a shared tier is configured. The same bound applies to the entity
+    tags kept for conditional GETs, which never leave the process; without a shared tier nothing bounds how long
+    another process's write goes unnoticed, so the tags are not kept at all.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 30, local_ttl_seconds: float = 5,
+                 shared: Optional[CacheStore] = None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds if shared is not None else ttl_seconds
+        self.shared = shared
+        self.enabled = enabled and max_entries > 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._loading: Dict[Tuple[str, int], asyncio.Future] = {}
+        # (namespace, entity id) -> (ETag of its last served representation, expiry); only with a shared tier
+        self._remember_tags = self.enabled and shared is not None
+        self._tags: "OrderedDict[Tuple[str, Any], Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _expires_at(ttl: float) -> float:
+        return time.monotonic() + ttl * random.uniform(0.9, 1.0)
+
+    def _get_local(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.response
+
+    def _put_local(self, key: str, namespace: str, response: CachedResponse, ttl: float) -> None:
+        self._entries[key] = _Entry(response, namespace, self._expires_at(min(ttl, self.local_ttl_seconds)))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _shared_key(self, namespace: str, key: str) -> str:
+        generation = await self.shared.get(f"response_cache:{namespace}:generation")
+        return f"response_cache:{int(generation or 0)}:{key}"
+
+    async def _get_shared(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        try:
+            data = await self.shared.get(await self._shared_key(namespace, key))
+            return CachedResponse.decode(data) if data is not None else None
+        except Exception as e:
+            logger.warning(f"Shared response cache unavailable, reading from the database: {str(e)}")
+            return None
+
+    async def _put_shared(self, namespace: str, key: str, response: CachedResponse, ttl: float) -> None:
+        try:
+            await self.shared.set(await self._shared_key(namespace, key), response.encode(), ttl)
+        except Exception as e:
+            logger.warning(f"Could not write to the shared response cache: {str(e)}")
+
+    async def get_or_load(self, namespace: str, params: Mapping[str, Any],
+                          load: Callable[[], Awaitable[CachedResponse]],
+                          ttl: Optional[float] = None) -> Tuple[CachedResponse, str]:
+        """Return the cached response for the parameters, calling load() on a miss, and whether it was a HIT or MISS."""
+        if not self.enabled:
+            return await load(), "BYPASS"
+        ttl = ttl if ttl is not None else self.ttl_seconds
+        key = cache_key(namespace, params)
+
+        response = self._get_local(key)
+        if response is not None:
+            cache_requests.inc(namespace, "hit_local")
+            return response, "HIT"
+
+        generation = self._generations.get(namespace, 0)
+        loading = self._loading.get((key, generation))
+        if loading is not None:
+            try:
+                response = await asyncio.shield(loading)
+                cache_requests.inc(namespace, "coalesced")
+                return response, "HIT"
+            except asyncio.CancelledError:
+                if not loading.cancelled():
+                    raise
+                # The request that was loading went away; load it ourselves
+
+        loading = asyncio.get_running_loop().create_future()
+        # Errors are re-raised to every waiter; mark them retrieved when nobody was waiting
+        loading.add_done_callback(lambda future: future.cancelled() or future.exception())
+        self._loading[(key, generation)] = loading
+        try:
+            response = await self._get_shared(namespace, key) if self.shared is not None else None
+            if response is not None:
+                cache_requests.inc(namespace, "hit_shared")
+                status = "HIT"
+            else:
+                cache_requests.inc(namespace, "miss")
+                status = "MISS"
+                response = await load()
+                if self.shared is not None and self._generations.get(namespace, 0) == generation:
+                    await self._put_shared(namespace, key, response, ttl)
+            # A write that happened while loading may not be reflected in the response: serve it, but do not keep it
+            if self._generations.get(namespace, 0) == generation:
+                self._put_local(key, namespace, response, ttl)
+            loading.set_result(response)
+            return response, status
+        except asyncio.CancelledError:
+            loading.cancel()
+            raise
+        except Exception as e:
+            loading.set_exception(e)
+            raise
+        finally:
+            self._loading.pop((key, generation), None)
+
+    async def respond(self, request: Request, namespace: str, params: Mapping[str, Any],
+                      load: Callable[[], Awaitable[CachedResponse]], ttl: Optional[float] = None) -> Response:
+        """Serve a cached list response, or 304 when If-None-Match already names its ETag."""
+        response, status = await self.get_or_load(namespace, params, load, ttl)
+        return conditional_json(request, response.body, {**response.headers, CACHE_STATUS_HEADER: status})
+
+    def _get_tag(self, namespace: str, entity_id: Any) -> Optional[str]:
+        entry = self._tags.get((namespace, entity_id))
+        if entry is None:
+            return None
+        etag, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._tags[(namespace, entity_id)]
+            return None
+        return etag
+
+    def _put_tag(self, namespace: str, entity_id: Any, etag: str) -> None:
+        self._tags[(namespace, entity_id)] = (etag, self._expires_at(min(self.ttl_seconds, self.local_ttl_seconds)))
+        self._tags.move_to_end((namespace, entity_id))
+        while len(self._tags) > self.max_entries:
+            self._tags.popitem(last=False)
+
+    async def respond_entity(self, request: Request, namespace: str, entity_id: Any,
+                             load: Callable[[], Awaitable[CachedResponse]]) -> Response:
+        """
+        Serve one entity with an ETag. With a shared tier, the tag of the last representation served is remembered
+        for up to local_ttl_seconds, or until a write to the entity in this process invalidates it, so a client
+        revalidating an unchanged entity gets a 304 without touching the database.
+        """
+        if self._remember_tags:
+            etag = self._get_tag(namespace, entity_id)
+            if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+                cache_requests.inc(namespace, "not_modified")
+                return not_modified(etag)
+
+        generation = self._generations.get(namespace, 0)
+        response = await load()
+        if self._remember_tags and self._generations.get(namespace, 0) == generation:
+            self._put_tag(namespace, entity_id, response.headers[ETAG_HEADER])
+        return conditional_json(request, response.body, response.headers)
+
+    async def invalidate(self, namespace: str, entity_id: Any = None) -> None:
+        """
+        Forget every cached list of the namespace, and the entity tag of entity_id when given; call after the write
+        has been committed.
+        """
+        if not self.enabled:
+            return
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for key in [key for key, entry in self._entries.items() if entry.namespace == namespace]:
+            del self._entries[key]
+        if entity_id is not None:
+            self._tags.pop((namespace, entity_id), None)
+        cache_invalidations.inc(namespace)
+        if self.shared is not None:
+            try:
+                await self.shared.incr(f"response_cache:{namespace}:generation")
+            except Exception as e:
+                logger.warning(f"Could not invalidate {namespace} in the shared response cache: {str(e)}")
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        if self.shared is not None:
+            await self.shared.close()
@@ -0,0 +1,168 @@
+# Structured, sampled logging written in batches by a background thread
+import json
+import logging
+import os
+import random
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # json or text
+# Fraction of successful requests logged, per route template, e.g. "/pets/=0.1,/users/login/=1"
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+LOG_SAMPLE_RATE_DEFAULT = float(os.getenv("LOG_SAMPLE_RATE_DEFAULT", 1.0))
+# Requests slower than this, and every error response, are logged regardless of sampling
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", 1000))
+# Records waiting for the writer thread; the oldest are dropped past this instead of blocking requests
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", 100000))
+LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", 0.2))
+
+# Attributes every LogRecord has; anything else was passed through `extra` and becomes a JSON field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message and the fields given in `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BufferedLogHandler(logging.Handler):
+    """
+    Appends records to an in-memory buffer that LogWriter drains on its own thread. The request path pays for
+    creating the record and a deque append: no lock, no thread wake-up, no formatting. When the buffer is full the
+    oldest records are dropped rather than blocking the caller. Arguments must not be mutated after logging,
+    which holds for the scalars logged here.
+    """
+
+    def __init__(self, buffer: deque):
+        super().__init__()
+        self.buffer = buffer
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self.filter(record):
+            self.buffer.append(record)
+            return True
+        return False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.buffer.append(record)
+
+
+class LogWriter(threading.Thread):
+    """Formats and writes buffered records in batches every flush_interval seconds."""
+
+    def __init__(self, buffer: deque, handler: logging.Handler, flush_interval: float = LOG_FLUSH_INTERVAL_SECONDS):
+        super().__init__(name="log-writer", daemon=True)
+        self.buffer = buffer
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self) -> None:
+        written = False
+        while self.buffer:
+            record = self.buffer.popleft()
+            if record.levelno >= self.handler.level:
+                self.handler.handle(record)
+                written = True
+        if written:
+            self.handler.flush()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+class RouteSampler:
+    """Decides per route template whether a successful request is logged."""
+
+    def __init__(self, rates: Dict[str, float], default_rate: float = 1.0, slow_ms: float = LOG_SLOW_REQUEST_MS):
+        self.rates = rates
+        self.default_rate = default_rate
+        self.slow_ms = slow_ms
+
+    @classmethod
+    def from_env(cls) -> "RouteSampler":
+        rates = {}
+        for entry in LOG_SAMPLE_RATES.split(","):
+            route, _, rate = entry.strip().rpartition("=")
+            if route:
+                rates[route] = float(rate)
+        return cls(rates, LOG_SAMPLE_RATE_DEFAULT)
+
+    def should_log(self, route: str, status_code: int, latency_ms: float) -> bool:
+        if status_code >= 500 or latency_ms >= self.slow_ms:
+            return True
+        rate = self.rates.get(route, self.default_rate)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+_writer: Optional[LogWriter] = None
+
+
+def configure_logging(output_handler: Optional[logging.Handler] = None) -> None:
+    """Route every log record through an in-memory buffer to a single output handler on a writer thread."""
+    global _writer
+    if _writer is not None:
+        return
+    handler = output_handler or logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    # Records carry their own fields, so skip the caller frame, thread and process lookups made for every record
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    buffer: deque = deque(maxlen=LOG_BUFFER_SIZE)
+    _replace_root_handlers(BufferedLogHandler(buffer))
+    logging.getLogger().setLevel(LOG_LEVEL)
+
+    _writer = LogWriter(buffer, handler)
+    _writer.start()
+
+
+def flush_logging() -> None:
+    """Write out every buffered record now, on the calling thread."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def stop_logging() -> None:
+    """Write out the buffered records, stop the writer thread and let later records go straight to the output."""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _replace_root_handlers(_writer.handler)
+        _writer = None
+
+
+def _replace_root_handlers(*handlers: logging.Handler) -> None:
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    for handler in handlers:
+        root.addHandler(handler)
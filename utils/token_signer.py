@@ -0,0 +1,94 @@
+# Pluggable JWT signing backends used by utils.jwt_helper
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError, JWTError
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+class TokenSigner(ABC):
+    """Signs claims into a compact JWT and verifies tokens back into claims, raising JWTError on any failure."""
+
+    @abstractmethod
+    def sign(self, claims: Dict[str, Any]) -> str:
+        pass
+
+    @abstractmethod
+    def verify(self, token: str) -> Dict[str, Any]:
+        pass
+
+
+class JoseTokenSigner(TokenSigner):
+    """python-jose backend, supports every algorithm jose does."""
+
+    def __init__(self, secret_key: str, algorithm: str):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HmacTokenSigner(TokenSigner):
+    """
+    Fast path for HS256/HS384/HS512 on top of hmac and json from the standard library.
+    Tokens are interchangeable with the jose backend; only the header algorithm is accepted and exp is enforced.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str):
+        if algorithm not in _HMAC_DIGESTS:
+            raise ValueError(f"HMAC token signer does not support {algorithm}")
+        self.algorithm = algorithm
+        self._key = secret_key.encode()
+        self._digest = _HMAC_DIGESTS[algorithm]
+        self._header = _b64encode(json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def _signature(self, signing_input: bytes) -> bytes:
+        return hmac.new(self._key, signing_input, self._digest).digest()
+
+    def sign(self, claims: Dict[str, Any]) -> str:
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = self._header + b"." + payload
+        return (signing_input + b"." + _b64encode(self._signature(signing_input))).decode()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        try:
+            signing_input, _, signature = token.encode().rpartition(b".")
+            header, _, payload = signing_input.partition(b".")
+            if not header or not payload or not signature:
+                raise JWTError("Not enough segments")
+            if json.loads(_b64decode(header)).get("alg") != self.algorithm:
+                raise JWTError("The specified alg value is not allowed")
+            if not hmac.compare_digest(self._signature(signing_input), _b64decode(signature)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, binascii.Error, UnicodeError, AttributeError):
+            raise JWTError("Invalid token.")
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTError("Expiration Time claim (exp) must be an integer.")
+            if exp <= time.time():
+                raise ExpiredSignatureError("Signature has expired.")
+        return claims
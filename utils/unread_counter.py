@@ -0,0 +1,50 @@
+# Per-user unread notification counts kept in a cache store and adjusted on every write instead of re-counted
+import logging
+import uuid
+from typing import Awaitable, Callable, Mapping
+
+from services.cache_store import CacheStore
+
+logger = logging.getLogger(__name__)
+
+
+class UnreadCounter:
+    """
+    A user's count is loaded with one COUNT on first read and cached for ttl_seconds. Until then, saved
+    notifications add to it and mark-read subtracts what the UPDATE actually changed. Adjustments only touch
+    counts that are cached, so a count that expired or was never read is simply counted again on the next read.
+    The TTL bounds any drift, e.g. a write racing the initial COUNT, or per-worker counts without a shared store.
+    """
+
+    def __init__(self, store: CacheStore, ttl_seconds: float = 300):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(user_id: uuid.UUID) -> str:
+        return f"notifications:unread:{user_id}"
+
+    async def get(self, user_id: uuid.UUID, load: Callable[[], Awaitable[int]]) -> int:
+        try:
+            cached = await self.store.get(self._key(user_id))
+        except Exception as e:
+            logger.warning(f"Unread counter unavailable, counting in the database: {str(e)}")
+            return await load()
+        if cached is not None:
+            return max(int(cached), 0)
+        count = await load()
+        try:
+            await self.store.set(self._key(user_id), str(count).encode(), self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Could not cache unread count: {str(e)}")
+        return count
+
+    async def add(self, amounts: Mapping[uuid.UUID, int]) -> None:
+        """Apply committed changes, e.g. {user_id: 3} for three saved notifications or {user_id: -2} for two read."""
+        for user_id, amount in amounts.items():
+            if amount == 0:
+                continue
+            try:
+                await self.store.incr_if_exists(self._key(user_id), amount)
+            except Exception as e:
+                logger.warning(f"Could not update unread count of user {user_id}: {str(e)}")
@@ -0,0 +1,51 @@
+# Weekly availability of service providers as a set of fifteen-minute slots
+import math
+from datetime import time
+from typing import Iterable, List
+
+from enums.day_of_week_enum import DayOfWeekEnum
+
+SLOT_MINUTES = 15
+MINUTES_PER_DAY = 24 * 60
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES  # 96
+WEEK_SLOTS = 7 * SLOTS_PER_DAY  # 672, slot 0 is Sunday 00:00-00:15
+
+
+def _minutes(at: time) -> int:
+    return at.hour * 60 + at.minute
+
+
+def slot_at(day_of_week: DayOfWeekEnum, at: time) -> int:
+    """Return the weekly slot containing the given day and time."""
+    return (day_of_week.rank - 1) * SLOTS_PER_DAY + _minutes(at) // SLOT_MINUTES
+
+
+def shift_slots(day_of_week: DayOfWeekEnum, start_time: time, end_time: time) -> List[int]:
+    """
+    Return every weekly slot covered by a shift starting on the given day.
+    An end time at or before the start time is an overnight shift that finishes on the next day
+    (Saturday night wraps into Sunday); equal times mean open around the clock.
+    """
+    day_start = (day_of_week.rank - 1) * MINUTES_PER_DAY
+    start = day_start + _minutes(start_time)
+    end = day_start + _minutes(end_time)
+    if end <= start:
+        end += MINUTES_PER_DAY
+    first_slot = start // SLOT_MINUTES
+    last_slot = math.ceil(end / SLOT_MINUTES)
+    return [slot % WEEK_SLOTS for slot in range(first_slot, last_slot)]
+
+
+def open_slots(working_hours: Iterable) -> List[int]:
+    """Build the sorted slot set of a provider from its working hours (anything with day_of_week/start_time/end_time)."""
+    slots = set()
+    for shift in working_hours:
+        slots.update(shift_slots(shift.day_of_week, shift.start_time, shift.end_time))
+    return sorted(slots)
+
+
+def slots_within(day_of_week: DayOfWeekEnum, at: time, hours: float) -> List[int]:
+    """Return the slots from the given day and time up to `hours` later, wrapping around the end of the week."""
+    first_slot = slot_at(day_of_week, at)
+    slot_count = min(max(math.ceil(hours * 60 / SLOT_MINUTES), 1), WEEK_SLOTS)
+    return [(first_slot + offset) % WEEK_SLOTS for offset in range(slot_count)]